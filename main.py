@@ -1,23 +1,89 @@
 import os
 import sys
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_gunicorn(port, asgi):
+    """Çok süreçli gunicorn sunucusu; ayarlar ortam değişkenlerinden okunur
+
+    SEANS_WORKERS   süreç sayısı (varsayılan: 2 x çekirdek + 1)
+    SEANS_THREADS   süreç başına iş parçacığı (varsayılan: 4, sadece WSGI)
+    SEANS_KEEPALIVE keep-alive bekleme süresi, saniye (varsayılan: 5)
+    SEANS_TIMEOUT   istek zaman aşımı, saniye (varsayılan: 30)
+    """
+    from django.db import connections
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        'bind': f'0.0.0.0:{port}',
+        'workers': int(os.environ.get('SEANS_WORKERS', (os.cpu_count() or 1) * 2 + 1)),
+        'threads': int(os.environ.get('SEANS_THREADS', 4)),
+        'keepalive': int(os.environ.get('SEANS_KEEPALIVE', 5)),
+        'timeout': int(os.environ.get('SEANS_TIMEOUT', 30)),
+        'worker_class': 'uvicorn_worker.UvicornWorker' if asgi else 'gthread',
+        # Bellek sızıntılarına karşı süreçler belirli istek sayısından sonra yenilenir
+        'max_requests': 2000,
+        'max_requests_jitter': 200,
+        'accesslog': '-',
+    }
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Uygulama her süreçte ayrı yüklenir
+            if asgi:
+                from seans.asgi import application
+            else:
+                from seans.wsgi import application
+            return application
+
+    # Hazırlık adımında açılan bağlantılar fork ile süreçlere taşınmasın
+    connections.close_all()
+    print(f"Üretim sunucusu başlatılıyor (gunicorn, {options['workers']} süreç, "
+          f"{'ASGI' if asgi else 'WSGI'}): 0.0.0.0:{port}")
+    Server().run()
+
+
 if __name__ == "__main__":
+    os.chdir(BASE_DIR)
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'seans.settings')
-    
+
+    # ASGI modu: python main.py --asgi (ya da SEANS_SERVER=asgi)
+    # Üretim modu: python main.py --production (ya da SEANS_SERVER=production)
+    server = os.environ.get('SEANS_SERVER', '')
+    asgi = '--asgi' in sys.argv or server == 'asgi'
+    production = '--production' in sys.argv or server == 'production'
+    if asgi:
+        # Dashboard ve liste ekranları async sürümleriyle sunulur
+        os.environ.setdefault('SEANS_ASYNC_VIEWS', '1')
+    if production:
+        os.environ.setdefault('SEANS_PRODUCTION', '1')
+        # Birden fazla süreç aynı SQLite dosyasına ve aynı önbellek sürümüne erişir
+        os.environ.setdefault('SEANS_DB_PROFILE', 'production')
+        os.environ.setdefault('SEANS_CACHE_DIR', os.path.join(BASE_DIR, '.cache'))
+
     from django.core.management import execute_from_command_line
-    
+
     # Replit PORT değişkenini kullan
     port = int(os.environ.get("PORT", 8000))
-    
-    # İlk çalıştırmada migrate ve collectstatic
-    if not os.path.exists('db.sqlite3'):
-        print("Veritabanı oluşturuluyor...")
-        execute_from_command_line(['manage.py', 'migrate', '--noinput'])
-        
-    if not os.path.exists('staticfiles'):
-        print("Static dosyalar toplanıyor...")
-        execute_from_command_line(['manage.py', 'collectstatic', '--noinput'])
-    
-    print(f"Sunucu başlatılıyor: 0.0.0.0:{port}")
-    execute_from_command_line(['manage.py', 'runserver', f'0.0.0.0:{port}'])
 
+    # Bekleyen migration ve değişen static dosyalar varsa kilit altında hazırla
+    execute_from_command_line(['manage.py', 'prepare_server'])
+
+    if production:
+        run_gunicorn(port, asgi)
+    elif asgi:
+        import uvicorn
+        from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler
+        from seans.asgi import application
+
+        # Tek süreçte olay döngüsü; yavaş dashboard istekleri birbirini bekletmez
+        print(f"ASGI sunucusu başlatılıyor (uvicorn): 0.0.0.0:{port}")
+        uvicorn.run(ASGIStaticFilesHandler(application), host='0.0.0.0', port=port)
+    else:
+        print(f"Sunucu başlatılıyor: 0.0.0.0:{port}")
+        execute_from_command_line(['manage.py', 'runserver', f'0.0.0.0:{port}'])
@@ -2,7 +2,12 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from django import forms
-from .models import Psychologist, Session, SessionTypeCommission, PaymentMethodCommission, Assistant
+from django.urls import reverse
+from django.utils.html import format_html
+from .earnings import set_session_status
+from .recurrence import materialize_series
+from .statements import generate_statements, previous_month
+from .models import Psychologist, Session, SessionSeries, WorkingHours, SessionTypeCommission, PaymentMethodCommission, Assistant, MonthlyEarnings, PayoutStatement, SNAPSHOT_FIELDS
 
 class PsychologistInline(admin.StackedInline):
     model = Psychologist
@@ -64,15 +69,33 @@ class AssistantCreationForm(forms.ModelForm):
             raise forms.ValidationError("Şifreler eşleşmiyor.")
         return password2
 
+class WorkingHoursInline(admin.TabularInline):
+    model = WorkingHours
+    extra = 0
+    verbose_name_plural = 'Çalışma Saatleri'
+
 class PsychologistAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone', 'hourly_rate', 'commission_rate', 'extra_commission_rate', 'is_active', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('is_active', 'created_at')
     search_fields = ('user__username', 'user__first_name', 'user__last_name', 'user__email', 'phone')
     list_editable = ('hourly_rate', 'commission_rate', 'extra_commission_rate', 'is_active')
     readonly_fields = ('created_at',)
+    inlines = (WorkingHoursInline,)
+    actions = ('generate_last_month_statements',)
     
     form = PsychologistCreationForm
     
+    @admin.action(description='Seçilen psikologların geçen ayki ödeme dökümlerini üret')
+    def generate_last_month_statements(self, request, queryset):
+        year, month = previous_month()
+        generated, skipped = generate_statements(year, month, list(queryset.values_list('pk', flat=True)))
+        self.message_user(
+            request,
+            f'{month:02d}.{year}: {generated} döküm üretildi, {skipped} döküm değişmediği için atlandı. '
+            'Seansı olmayan psikologlar için döküm üretilmez.',
+        )
+    
     def save_model(self, request, obj, form, change):
         if not change:  # Yeni kayıt oluşturuluyor
             # User oluştur
@@ -110,6 +133,7 @@ class PsychologistAdmin(admin.ModelAdmin):
 
 class AssistantAdmin(admin.ModelAdmin):
     list_display = ('user', 'phone', 'is_active', 'created_at')
+    list_select_related = ('user',)
     list_filter = ('is_active', 'created_at')
     search_fields = ('user__username', 'user__first_name', 'user__last_name', 'user__email', 'phone')
     list_editable = ('is_active',)
@@ -151,13 +175,21 @@ class AssistantAdmin(admin.ModelAdmin):
                 }),
             )
 
+class PsychologistListFilter(admin.RelatedFieldListFilter):
+    """Psikolog filtresi seçeneklerini kullanıcılarla birlikte tek sorguda yükle"""
+    def field_choices(self, field, request, model_admin):
+        psychologists = Psychologist.objects.select_related('user').order_by('user__first_name', 'user__last_name')
+        return [(psychologist.pk, str(psychologist)) for psychologist in psychologists]
+
 class SessionAdmin(admin.ModelAdmin):
     list_display = ('client_name', 'expert', 'date', 'duration', 'price', 'session_type', 'payment_method', 'status', 'extra_commission_rate', 'commission_breakdown_display')
-    list_filter = ('status', 'session_type', 'payment_method', 'expert', 'date')
+    list_filter = ('status', 'session_type', 'payment_method', ('expert', PsychologistListFilter), 'date')
+    list_select_related = ('expert__user',)
     search_fields = ('client_name', 'expert__user__username', 'expert__user__first_name', 'expert__user__last_name')
     list_editable = ('status', 'session_type', 'payment_method', 'extra_commission_rate')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at') + SNAPSHOT_FIELDS
     date_hierarchy = 'date'
+    actions = ('mark_done', 'mark_planned', 'mark_canceled')
     
     fieldsets = (
         ('Seans Bilgileri', {
@@ -166,6 +198,10 @@ class SessionAdmin(admin.ModelAdmin):
         ('Seans Detayları', {
             'fields': ('session_type', 'payment_method', 'extra_commission_rate', 'notes')
         }),
+        ('Kayıtlı Kesinti', {
+            'fields': SNAPSHOT_FIELDS,
+            'classes': ('collapse',)
+        }),
         ('Sistem Bilgileri', {
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
@@ -182,6 +218,23 @@ class SessionAdmin(admin.ModelAdmin):
     commission_breakdown_display.short_description = 'Kesinti Detayları'
     commission_breakdown_display.allow_tags = True
     
+    def update_status(self, request, queryset, status):
+        """Seçilen seansların durumunu tek UPDATE ile değiştir"""
+        count = set_session_status(queryset, status)
+        self.message_user(request, f'{count} seansın durumu "{dict(Session.STATUS_CHOICES)[status]}" olarak güncellendi.')
+    
+    @admin.action(description='Seçilen seansları "Yapıldı" olarak işaretle')
+    def mark_done(self, request, queryset):
+        self.update_status(request, queryset, 'done')
+    
+    @admin.action(description='Seçilen seansları "Planlandı" olarak işaretle')
+    def mark_planned(self, request, queryset):
+        self.update_status(request, queryset, 'planned')
+    
+    @admin.action(description='Seçilen seansları "İptal" olarak işaretle')
+    def mark_canceled(self, request, queryset):
+        self.update_status(request, queryset, 'canceled')
+    
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.is_superuser:
@@ -193,6 +246,60 @@ class SessionAdmin(admin.ModelAdmin):
         except Psychologist.DoesNotExist:
             return qs.none()
 
+class SessionSeriesAdmin(admin.ModelAdmin):
+    list_display = ('client_name', 'expert', 'start', 'interval_weeks', 'end_date', 'occurrence_count', 'generated_count', 'generated_until', 'is_active')
+    list_filter = ('is_active', 'interval_weeks', ('expert', PsychologistListFilter))
+    list_select_related = ('expert__user',)
+    search_fields = ('client_name', 'expert__user__username', 'expert__user__first_name', 'expert__user__last_name')
+    # Üretim durumu recurrence.py tarafından tutulur
+    readonly_fields = ('generated_count', 'generated_until', 'created_at')
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            materialize_series(obj)
+
+class MonthlyEarningsAdmin(admin.ModelAdmin):
+    list_display = ('psychologist', 'year', 'month', 'status', 'session_count', 'gross', 'commission', 'net', 'updated_at')
+    list_filter = ('status', 'year', 'month', 'psychologist')
+    list_select_related = ('psychologist__user',)
+    
+    # Özet tablo sinyallerle güncellenir; elle düzenlenmez
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+class PayoutStatementAdmin(admin.ModelAdmin):
+    list_display = ('psychologist', 'year', 'month', 'session_count', 'gross', 'commission', 'net', 'generated_at', 'statement_link')
+    list_filter = ('year', 'month', ('psychologist', PsychologistListFilter))
+    list_select_related = ('psychologist__user',)
+    exclude = ('html',)
+    actions = ('regenerate',)
+    
+    def statement_link(self, obj):
+        return format_html('<a href="{}" target="_blank">Görüntüle / Yazdır</a>', reverse('payout_statement', args=[obj.pk]))
+    statement_link.short_description = 'Döküm'
+    
+    @admin.action(description='Seçilen dökümleri güncel verilerle yeniden üret')
+    def regenerate(self, request, queryset):
+        months = {}
+        for psychologist_id, year, month in queryset.values_list('psychologist_id', 'year', 'month'):
+            months.setdefault((year, month), []).append(psychologist_id)
+        count = sum(
+            generate_statements(year, month, psychologist_ids, force=True)[0]
+            for (year, month), psychologist_ids in months.items()
+        )
+        self.message_user(request, f'{count} döküm yeniden üretildi.')
+    
+    # Dökümler statements.py ile üretilir; elle düzenlenmez
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
 # Re-register UserAdmin
 admin.site.unregister(User)
 admin.site.register(User, CustomUserAdmin)
@@ -202,3 +309,6 @@ admin.site.register(Assistant, AssistantAdmin)
 admin.site.register(SessionTypeCommission)
 admin.site.register(PaymentMethodCommission)
 admin.site.register(Session, SessionAdmin)
+admin.site.register(SessionSeries, SessionSeriesAdmin)
+admin.site.register(MonthlyEarnings, MonthlyEarningsAdmin)
+admin.site.register(PayoutStatement, PayoutStatementAdmin)
@@ -0,0 +1,350 @@
+"""Seanslar, psikolog kazançları, aylık özetler, eğilimler ve boş seans aralıkları için salt okunur JSON API
+
+Her uç nokta liste ekranlarıyla aynı GET filtrelerini kullanır ve ?fields=
+ile sadece istenen alanları döndürür. Yanıtlar MAX(Session.updated_at) ve
+veri sürümünden türetilen ETag/Last-Modified başlıklarını taşır; koşullu
+isteklerde veri değişmemişse 304 döner.
+"""
+import hashlib
+from datetime import datetime, time, timedelta
+from functools import wraps
+
+from django.db.models import F, Max, Q, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import condition, require_GET
+
+from .availability import free_slots as find_free_slots
+from .caching import get_data_changed_at, get_data_version
+from .earnings import with_earnings_stats
+from .filters import MAX_YEAR, MIN_YEAR, apply_session_filters, parse_id, parse_month, parse_year
+from .models import MonthlyEarnings, Psychologist, Session
+from .pagination import keyset_paginate
+from .roles import get_role
+from .trends import TrendRangeError, cached_session_trends, parse_trend_params
+
+# API alan adı -> ORM alanı
+SESSION_FIELDS = {
+    'id': 'id',
+    'date': 'date',
+    'client_name': 'client_name',
+    'psychologist_id': 'expert_id',
+    'duration': 'duration',
+    'price': 'price',
+    'session_type': 'session_type',
+    'payment_method': 'payment_method',
+    'status': 'status',
+    'notes': 'notes',
+    'extra_commission_rate': 'extra_commission_rate',
+    'commission': 'snapshot_commission',
+    'net': 'snapshot_net',
+    'updated_at': 'updated_at',
+}
+
+EARNINGS_FIELDS = {
+    'psychologist_id': 'pk',
+    'total_sessions': 'stat_total_sessions',
+    'total_earnings': 'stat_total_earnings',
+    'total_commission': 'stat_commission',
+    'total_net': 'stat_net',
+    'monthly_sessions': 'stat_monthly_sessions',
+    'monthly_earnings': 'stat_monthly_earnings',
+    'monthly_commission': 'stat_monthly_commission',
+    'monthly_net': 'stat_monthly_net',
+}
+
+# Özet satırındaki alias'lar model alanlarıyla çakışmasın diye sum_ önekli
+SUMMARY_FIELDS = {
+    'year': 'year',
+    'month': 'month',
+    'session_count': 'sum_session_count',
+    'done_count': 'sum_done_count',
+    'revenue': 'sum_revenue',
+    'commission': 'sum_commission',
+    'net': 'sum_net',
+}
+
+TREND_FIELDS = ['period', 'session_count', 'done_count', 'canceled_count', 'revenue', 'commission', 'net']
+
+# Asistanlar arayüzde olduğu gibi API'de de tutar ve kesinti bilgisi göremez
+ASSISTANT_HIDDEN_FIELDS = {
+    'price', 'extra_commission_rate', 'commission', 'net',
+    'total_earnings', 'total_commission', 'total_net',
+    'monthly_earnings', 'monthly_commission', 'monthly_net',
+    'revenue',
+}
+
+
+# Boş aralık aramasında izin verilen en uzun tarih aralığı ve sonuç sayısı
+MAX_SLOT_RANGE = timedelta(days=31)
+MAX_SLOT_LIMIT = 500
+# ?duration ve ?step için üst sınır (dakika)
+MAX_SLOT_MINUTES = 24 * 60
+
+
+# Liste ekranları geçersiz filtreleri yok sayar; API bunları 400 ile bildirir
+FILTER_PARSERS = {
+    'month': (parse_month, 'month 1 ile 12 arasında bir sayı olmalıdır.'),
+    'year': (parse_year, f'year {MIN_YEAR} ile {MAX_YEAR} arasında bir sayı olmalıdır.'),
+    'psychologist': (parse_id, 'psychologist geçerli bir psikolog numarası olmalıdır.'),
+}
+
+
+class FieldError(ValueError):
+    pass
+
+
+def api_view(view_func):
+    """Giriş ve rol kontrolü; HTML yönlendirmesi yerine JSON hata döndürür"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            return JsonResponse({'detail': 'Giriş yapmanız gerekiyor.'}, status=401)
+        request.api_role = get_role(request).name
+        if request.api_role is None:
+            return JsonResponse({'detail': 'Bu kaynağa erişim yetkiniz yok.'}, status=403)
+        try:
+            return view_func(request, *args, **kwargs)
+        except FieldError as exc:
+            return JsonResponse({'detail': str(exc)}, status=400)
+    return wrapper
+
+
+def selected_fields(request, available):
+    """?fields=a,b parametresini doğrula; verilmezse role açık tüm alanlar"""
+    allowed = [
+        name for name in available
+        if not (request.api_role == 'assistant' and name in ASSISTANT_HIDDEN_FIELDS)
+    ]
+    requested = [name.strip() for name in request.GET.get('fields', '').split(',') if name.strip()]
+    if not requested:
+        return allowed
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise FieldError(f"Geçersiz alan(lar): {', '.join(unknown)}. Kullanılabilir: {', '.join(allowed)}")
+    return requested
+
+
+def selected_filter(request, name):
+    """month, year ya da psychologist parametresini doğrula; verilmemişse None"""
+    value = request.GET.get(name)
+    if not value:
+        return None
+    parse, message = FILTER_PARSERS[name]
+    parsed = parse(value)
+    if parsed is None:
+        raise FieldError(message)
+    return parsed
+
+
+def selected_psychologists(request):
+    """Tekrar edilebilen ?psychologist parametresini doğrula; verilmemişse None"""
+    values = request.GET.getlist('psychologist')
+    if not values:
+        return None
+    parse, message = FILTER_PARSERS['psychologist']
+    ids = [parse(value) for value in values]
+    if None in ids:
+        raise FieldError(message)
+    return ids
+
+
+def selected_period(request):
+    now = timezone.localtime()
+    year = selected_filter(request, 'year')
+    month = selected_filter(request, 'month')
+    return year or now.year, month or now.month
+
+
+def selected_datetime(request, name, default):
+    """Tarih (YYYY-MM-DD) ya da tarih-saat parametresini yerel saatle aware datetime'a çevir"""
+    value = request.GET.get(name)
+    if not value:
+        return default
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise FieldError(f'{name} geçerli bir tarih olmalıdır.')
+        parsed = datetime.combine(day, time.min)
+    # Aralık hesaplarında datetime sınırı aşılmasın
+    if not MIN_YEAR <= parsed.year <= MAX_YEAR:
+        raise FieldError(f'{name} {MIN_YEAR} ile {MAX_YEAR} yılları arasında olmalıdır.')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def selected_minutes(request, name, default):
+    try:
+        value = int(request.GET.get(name, default))
+    except ValueError:
+        raise FieldError(f'{name} dakika cinsinden sayı olmalıdır.')
+    if not 0 < value <= MAX_SLOT_MINUTES:
+        raise FieldError(f'{name} 1 ile {MAX_SLOT_MINUTES} dakika arasında olmalıdır.')
+    return timedelta(minutes=value)
+
+
+def last_modified(request, *args, **kwargs):
+    """MAX(updated_at) ile son veri değişikliği zamanının büyüğü (istek başına bir kez)"""
+    if not hasattr(request, '_api_last_modified'):
+        candidates = [
+            Session.objects.aggregate(last=Max('updated_at'))['last'],
+            get_data_changed_at(),
+        ]
+        request._api_last_modified = max((value for value in candidates if value), default=None)
+    return request._api_last_modified
+
+
+def etag(request, *args, **kwargs):
+    """Kullanıcı, istek adresi, veri sürümü ve son değişiklik zamanından türetilen ETag"""
+    changed = last_modified(request)
+    raw = f'{request.user.pk}|{request.get_full_path()}|{get_data_version()}|{changed and changed.isoformat()}'
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+def conditional(view_func):
+    return require_GET(api_view(condition(etag_func=etag, last_modified_func=last_modified)(view_func)))
+
+
+@conditional
+def sessions(request):
+    """Filtrelenmiş seanslar; (date, id) cursor'u ile sayfalanır"""
+    fields = selected_fields(request, SESSION_FIELDS)
+    queryset = Session.objects.all()
+    if request.api_role == 'psychologist':
+        queryset = queryset.filter(expert_id=request.role.psychologist_id)
+    for name in FILTER_PARSERS:
+        selected_filter(request, name)
+    queryset = apply_session_filters(queryset, request.GET, by_psychologist=request.api_role != 'psychologist')
+
+    # Cursor için date ve id her zaman okunur; seçilen alanlar f_ önekiyle eklenir
+    queryset = queryset.values('date', 'id', **{f'f_{name}': F(SESSION_FIELDS[name]) for name in fields})
+    page = keyset_paginate(queryset, request.GET)
+
+    results = [{name: row[f'f_{name}'] for name in fields} for row in page.items]
+    return JsonResponse({
+        'results': results,
+        'next': f'{request.path}?{page.next_query}' if page.has_next else None,
+        'previous': f'{request.path}?{page.previous_query}' if page.has_previous else None,
+    })
+
+
+@conditional
+def earnings(request):
+    """Psikolog bazında toplam ve seçilen ay kazançları (MonthlyEarnings özet tablosundan)"""
+    fields = selected_fields(request, ['psychologist_name', *EARNINGS_FIELDS])
+    year, month = selected_period(request)
+    psychologists = Psychologist.objects.filter(is_active=True)
+    if request.api_role == 'psychologist':
+        psychologists = Psychologist.objects.filter(pk=request.role.psychologist_id)
+
+    results = []
+    for psychologist in with_earnings_stats(psychologists, year, month):
+        row = {}
+        for name in fields:
+            if name == 'psychologist_name':
+                row[name] = str(psychologist)
+            else:
+                row[name] = getattr(psychologist, EARNINGS_FIELDS[name])
+        results.append(row)
+    return JsonResponse({'year': year, 'month': month, 'results': results})
+
+
+@conditional
+def monthly_summaries(request):
+    """Yıl/ay bazında seans sayısı ve tutar özetleri (?year, ?psychologist ile daraltılabilir)"""
+    fields = selected_fields(request, SUMMARY_FIELDS)
+    psychologist_id = selected_filter(request, 'psychologist')
+    year = selected_filter(request, 'year')
+    summaries = MonthlyEarnings.objects.all()
+    if request.api_role == 'psychologist':
+        summaries = summaries.filter(psychologist_id=request.role.psychologist_id)
+    elif psychologist_id:
+        summaries = summaries.filter(psychologist_id=psychologist_id)
+    if year:
+        summaries = summaries.filter(year=year)
+
+    done = Q(status='done')
+    rows = (
+        summaries.values('year', 'month')
+        .annotate(
+            sum_session_count=Sum('session_count'),
+            sum_done_count=Sum('session_count', filter=done),
+            sum_revenue=Sum('gross', filter=done),
+            sum_commission=Sum('commission'),
+            sum_net=Sum('net'),
+        )
+        .order_by('-year', '-month')
+    )
+    results = [{name: row[SUMMARY_FIELDS[name]] for name in fields} for row in rows]
+    return JsonResponse({'results': results})
+
+
+@conditional
+def trends(request):
+    """Gün/hafta/ay bazında seans sayısı ve tutarlar (?start, ?end, ?bucket, ?psychologist)
+
+    Tüm aralık tek gruplu sorguyla hesaplanır; varsayılan aralık son 12 aydır.
+    ?psychologist tekrar edilebilir; psikologlar sadece kendi verilerini görür.
+    """
+    fields = selected_fields(request, TREND_FIELDS)
+    try:
+        start, end, bucket = parse_trend_params(request.GET)
+    except TrendRangeError as exc:
+        raise FieldError(str(exc))
+    if request.api_role == 'psychologist':
+        psychologist_ids = [request.role.psychologist_id]
+    else:
+        psychologist_ids = selected_psychologists(request)
+
+    rows = cached_session_trends(start, end, bucket, psychologist_ids)
+    return JsonResponse({
+        'start': start,
+        'end': end,
+        'bucket': bucket,
+        'results': [{name: row[name] for name in fields} for row in rows],
+    })
+
+
+@require_GET
+@api_view
+def free_slots(request):
+    """Çalışma saatleri içindeki boş seans aralıkları; en erken aralık ilk sırada
+
+    ?start, ?end (varsayılan: şimdi ve 7 gün sonrası), ?duration ve ?step (dakika),
+    ?session_type, ?psychologist (tekrar edilebilir; verilmezse tüm aktif psikologlar)
+    ve ?limit parametrelerini alır. ?limit=1 tüm psikologlar için ilk boş aralığı verir.
+    """
+    start = selected_datetime(request, 'start', timezone.now())
+    end = selected_datetime(request, 'end', start + timedelta(days=7))
+    if not start < end <= start + MAX_SLOT_RANGE:
+        raise FieldError(f'end, start\'tan sonra ve en fazla {MAX_SLOT_RANGE.days} gün ilerisi olmalıdır.')
+    duration = selected_minutes(request, 'duration', 60)
+    step = selected_minutes(request, 'step', int(duration.total_seconds() // 60))
+    try:
+        limit = int(request.GET.get('limit', 50))
+    except ValueError:
+        raise FieldError('limit sayı olmalıdır.')
+    if limit < 1:
+        raise FieldError('limit sıfırdan büyük olmalıdır.')
+    limit = min(limit, MAX_SLOT_LIMIT)
+
+    if request.api_role == 'psychologist':
+        psychologist_ids = [request.role.psychologist_id]
+    else:
+        psychologist_ids = selected_psychologists(request)
+        if psychologist_ids is None:
+            psychologist_ids = Psychologist.objects.filter(is_active=True).values('pk')
+
+    slots = find_free_slots(
+        psychologist_ids, start, end, duration,
+        session_type=request.GET.get('session_type') or None, step=step, limit=limit,
+    )
+    return JsonResponse({
+        'results': [
+            {'psychologist_id': psychologist_id, 'start': slot_start, 'end': slot_end}
+            for slot_start, psychologist_id, slot_end in slots
+        ],
+    })
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SariSeansConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'sari_seans'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,227 @@
+"""ASGI altında kullanılan salt okunur async dashboard ve liste görünümleri
+
+settings.SEANS_ASYNC_VIEWS açıkken urls.py bu görünümleri views.py'deki senkron
+karşılıklarının yerine bağlar. Birbirinden bağımsız sorgular asyncio.gather ile
+toplanır, ancak Django'nun async ORM'i her çağrıyı
+sync_to_async(thread_sensitive=True) ile tek bir iş parçacığında çalıştırdığı
+için sorgular paralel değil sırayla yürür. Kazanç, sorgular beklenirken olay
+döngüsünün başka istekleri işleyebilmesidir. Şablonlar ve context
+processor'lar veritabanına erişebildiği için render sync_to_async ile yapılır.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Q
+from django.shortcuts import render
+from django.utils import timezone
+
+from .caching import acached_dashboard_stats
+from .earnings import with_earnings_stats
+from .filters import apply_session_filters, parse_month, parse_year
+from .models import Assistant, MonthlyEarnings, Psychologist, Session
+from .pagination import akeyset_paginate
+from .roles import role_required
+
+MONTHS = [
+    (1, 'Ocak'), (2, 'Şubat'), (3, 'Mart'), (4, 'Nisan'),
+    (5, 'Mayıs'), (6, 'Haziran'), (7, 'Temmuz'), (8, 'Ağustos'),
+    (9, 'Eylül'), (10, 'Ekim'), (11, 'Kasım'), (12, 'Aralık')
+]
+
+arender = sync_to_async(render)
+
+
+async def alist(queryset):
+    """Queryset'i async iterasyonla listeye çevir"""
+    return [obj async for obj in queryset]
+
+
+def period_context(request):
+    """Seçilen ay/yıl ile ay ve son 3 yıl seçeneklerini döndür"""
+    now = timezone.now()
+    # Geçersiz ya da aralık dışı değerlerde içinde bulunulan ay/yıl kullanılır
+    return {
+        'selected_month': parse_month(request.GET.get('month')) or now.month,
+        'selected_year': parse_year(request.GET.get('year')) or now.year,
+        'months': MONTHS,
+        'years': range(now.year - 2, now.year + 1),
+    }
+
+
+async def request_psychologist(request):
+    """Giriş yapan kullanıcının psikolog kaydı (ID'si role_required ile çözülen rolden gelir)"""
+    return await Psychologist.objects.aget(pk=request.role.psychologist_id)
+
+
+@role_required('admin')
+async def admin_dashboard(request):
+    """Admin dashboard - tüm psikologların özeti"""
+    period = period_context(request)
+    year, month = period['selected_year'], period['selected_month']
+
+    async def build_stats():
+        active = Psychologist.objects.filter(is_active=True)
+        totals, monthly_totals, psychologists, assistants = await asyncio.gather(
+            MonthlyEarnings.objects.atotals(),
+            MonthlyEarnings.objects.filter(year=year, month=month).atotals(),
+            alist(with_earnings_stats(active, year, month)),
+            alist(Assistant.objects.filter(is_active=True).select_related('user')),
+        )
+        psychologist_stats = [
+            {
+                'psychologist': psychologist,
+                'total_sessions': psychologist.stat_total_sessions,
+                'total_earnings': psychologist.stat_total_earnings,
+                'commission_amount': psychologist.stat_commission,
+                'net_earnings': psychologist.stat_net,
+                'monthly_sessions': psychologist.stat_monthly_sessions,
+                'monthly_earnings': psychologist.stat_monthly_earnings,
+                'monthly_commission': psychologist.stat_monthly_commission,
+                'monthly_net': psychologist.stat_monthly_net,
+            }
+            for psychologist in psychologists
+        ]
+        return {
+            'psychologists': psychologists,
+            'assistants': assistants,
+            'psychologist_stats': psychologist_stats,
+            'total_sessions': totals['count'],
+            'total_revenue': totals['revenue'],
+            'total_commission': totals['commission'],
+            'monthly_sessions_count': monthly_totals['count'],
+            'monthly_revenue': monthly_totals['revenue'],
+            'monthly_commission': monthly_totals['commission'],
+            'monthly_net': monthly_totals['net'],
+        }
+
+    context = await acached_dashboard_stats('admin', year, month, build_stats)
+    context.update(period)
+    return await arender(request, 'admin_dashboard.html', context)
+
+
+@role_required('psychologist')
+async def psychologist_dashboard(request):
+    """Psikolog dashboard - kendi seansları ve kazancı"""
+    psychologist = await request_psychologist(request)
+    period = period_context(request)
+    year, month = period['selected_year'], period['selected_month']
+
+    async def build_stats():
+        earnings = MonthlyEarnings.objects.filter(psychologist=psychologist)
+        sessions, totals, monthly_totals = await asyncio.gather(
+            alist(Session.objects.filter(expert=psychologist).select_related('expert').order_by('-date')[:10]),
+            earnings.atotals(),
+            earnings.filter(year=year, month=month).atotals(),
+        )
+        return {
+            'sessions': sessions,
+            'total_sessions': totals['count'],
+            'total_earnings': totals['revenue'],
+            'commission_amount': totals['commission'],
+            'net_earnings': totals['net'],
+            'monthly_sessions_count': monthly_totals['count'],
+            'monthly_earnings': monthly_totals['revenue'],
+            'monthly_commission': monthly_totals['commission'],
+            'monthly_net': monthly_totals['net'],
+        }
+
+    context = await acached_dashboard_stats(
+        'psychologist', year, month, build_stats, psychologist_id=psychologist.pk,
+    )
+    context.update(period)
+    return await arender(request, 'psychologist_dashboard.html', context)
+
+
+@role_required('assistant')
+async def assistant_dashboard(request):
+    """Asistan dashboard - seans yönetimi odaklı"""
+    period = period_context(request)
+    year, month = period['selected_year'], period['selected_month']
+
+    async def build_stats():
+        active = Psychologist.objects.filter(is_active=True)
+        totals, monthly_totals, psychologists = await asyncio.gather(
+            MonthlyEarnings.objects.atotals(),
+            MonthlyEarnings.objects.filter(year=year, month=month).atotals(),
+            alist(with_earnings_stats(active, year, month)),
+        )
+        return {
+            'psychologists': psychologists,
+            'psychologist_stats': [
+                {
+                    'psychologist': psychologist,
+                    'total_sessions': psychologist.stat_total_sessions,
+                    'monthly_sessions': psychologist.stat_monthly_sessions,
+                }
+                for psychologist in psychologists
+            ],
+            'total_sessions': totals['count'],
+            'monthly_sessions_count': monthly_totals['count'],
+        }
+
+    context = await acached_dashboard_stats('assistant', year, month, build_stats)
+    context.update(period)
+    return await arender(request, 'assistant_dashboard.html', context)
+
+
+@role_required('psychologist')
+async def my_sessions(request):
+    """Psikolog kendi seanslarını görüntüleme"""
+    psychologist = await request_psychologist(request)
+    sessions = Session.objects.filter(expert=psychologist).select_related('expert').order_by('-date')
+    sessions = apply_session_filters(sessions, request.GET, by_psychologist=False)
+
+    status_counts, page = await asyncio.gather(
+        sessions.aaggregate(
+            total=Count('id'),
+            done=Count('id', filter=Q(status='done')),
+            planned=Count('id', filter=Q(status='planned')),
+            canceled=Count('id', filter=Q(status='canceled')),
+        ),
+        akeyset_paginate(sessions, request.GET),
+    )
+    context = {
+        'sessions': page.items,
+        'page': page,
+        'status_counts': status_counts,
+        **period_context(request),
+    }
+    return await arender(request, 'my_sessions.html', context)
+
+
+@role_required('admin')
+async def manage_sessions(request):
+    """Admin seans yönetimi"""
+    sessions = Session.objects.select_related('expert__user').order_by('-date')
+    sessions = apply_session_filters(sessions, request.GET)
+
+    psychologists, page = await asyncio.gather(
+        alist(Psychologist.objects.filter(is_active=True).select_related('user')),
+        akeyset_paginate(sessions, request.GET),
+    )
+    context = {
+        'sessions': page.items,
+        'page': page,
+        'psychologists': psychologists,
+        **period_context(request),
+    }
+    return await arender(request, 'manage_sessions.html', context)
+
+
+@role_required('assistant')
+async def assistant_manage_sessions(request):
+    """Asistan seans yönetimi - kesinti bilgileri olmadan"""
+    sessions = Session.objects.select_related('expert__user').order_by('-date')
+    sessions = apply_session_filters(sessions, request.GET)
+
+    psychologists, page = await asyncio.gather(
+        alist(Psychologist.objects.filter(is_active=True).select_related('user')),
+        akeyset_paginate(sessions, request.GET),
+    )
+    context = {
+        'sessions': page.items,
+        'page': page,
+        'psychologists': psychologists,
+        **period_context(request),
+    }
+    return await arender(request, 'assistant_manage_sessions.html', context)
@@ -0,0 +1,95 @@
+"""Psikologların çalışma saatlerine göre boş seans aralıklarının hesaplanması
+
+Her arama iki sorgu yapar: seçilen psikologların çalışma saatleri ve aralıkla
+kesişen (iptal edilmemiş) seanslar. Seanslar psikolog ve başlangıca göre
+sıralı geldiği için dolu aralıklar çalışma bloklarından tek geçişte çıkarılır;
+psikologların boş aralıkları heapq.merge ile zamana göre birleştirilir.
+"""
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Session, WorkingHours
+
+
+def working_blocks(hours, start, end):
+    """(gün, başlangıç, bitiş) çalışma saatlerini [start, end) içindeki somut aralıklara çevir"""
+    by_weekday = defaultdict(list)
+    for weekday, start_time, end_time in sorted(hours):
+        by_weekday[weekday].append((start_time, end_time))
+    tz = timezone.get_current_timezone()
+    day = timezone.localdate(start)
+    last_day = timezone.localdate(end)
+    while day <= last_day:
+        for start_time, end_time in by_weekday[day.weekday()]:
+            block_start = max(start, datetime.combine(day, start_time, tzinfo=tz))
+            block_end = min(end, datetime.combine(day, end_time, tzinfo=tz))
+            if block_start < block_end:
+                yield block_start, block_end
+        day += timedelta(days=1)
+
+
+def free_intervals(blocks, busy):
+    """Sıralı çalışma bloklarından sıralı dolu aralıkları çıkar"""
+    i = 0
+    for block_start, block_end in blocks:
+        while i < len(busy) and busy[i][1] <= block_start:
+            i += 1
+        cursor = block_start
+        j = i
+        while j < len(busy) and busy[j][0] < block_end:
+            if busy[j][0] > cursor:
+                yield cursor, busy[j][0]
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if cursor < block_end:
+            yield cursor, block_end
+
+
+def psychologist_slots(psychologist_id, blocks, busy, duration, step):
+    """Boş aralıklara sığan (psikolog, başlangıç, bitiş) seans aralıklarını zaman sırasıyla üret"""
+    for free_start, free_end in free_intervals(blocks, busy):
+        slot_start = free_start
+        while slot_start + duration <= free_end:
+            yield slot_start, psychologist_id, slot_start + duration
+            slot_start += step
+
+
+def free_slots(psychologist_ids, start, end, duration, session_type=None, step=None, limit=None):
+    """[start, end) içinde en az `duration` uzunluğundaki boş seans aralıklarını başlangıca göre döndür
+
+    duration ve step timedelta'dır; step verilmezse aralıklar duration kadar
+    kaydırılır. session_type verilirse sadece o türe açık çalışma saatleri
+    kullanılır. Sonuç (başlangıç, psikolog_id, bitiş) üçlülerinin listesidir.
+    """
+    step = step or duration
+    hours = WorkingHours.objects.filter(psychologist_id__in=psychologist_ids, psychologist__is_active=True)
+    if session_type:
+        hours = hours.filter(Q(session_type='') | Q(session_type=session_type))
+    hours_by_psychologist = defaultdict(list)
+    for psychologist_id, *block in hours.values_list('psychologist_id', 'weekday', 'start_time', 'end_time'):
+        hours_by_psychologist[psychologist_id].append(block)
+    if not hours_by_psychologist:
+        return []
+
+    busy = defaultdict(list)
+    sessions = (
+        Session.objects.filter(expert_id__in=hours_by_psychologist, ends_at__gt=start, date__lt=end)
+        .exclude(status='canceled')
+        .order_by('expert_id', 'date')
+        .values_list('expert_id', 'date', 'ends_at')
+    )
+    for expert_id, session_start, session_end in sessions:
+        busy[expert_id].append((session_start, session_end))
+
+    slots = heapq.merge(*(
+        psychologist_slots(
+            psychologist_id, working_blocks(blocks, start, end), busy[psychologist_id], duration, step,
+        )
+        for psychologist_id, blocks in hours_by_psychologist.items()
+    ))
+    return list(islice(slots, limit))
@@ -0,0 +1,121 @@
+"""Dashboard istatistikleri için veri sürümüne bağlı önbellek
+
+Anahtar; rol, psikolog, seçilen ay/yıl ve veri sürümünden oluşur. Seans,
+psikolog ve oran tablolarındaki her yazma işlemi sürümü yeniler (signals.py),
+böylece eski anahtarlar kendiliğinden kullanılmaz hale gelir ve süresi
+dolunca önbellekten düşer.
+"""
+import uuid
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+DATA_VERSION_KEY = 'sari_seans:data_version'
+DATA_CHANGED_AT_KEY = 'sari_seans:data_changed_at'
+
+# DataVersionMiddleware'in istek boyunca tuttuğu {'version': ...} sözlüğü
+_request_version = ContextVar('sari_seans_request_version', default=None)
+
+
+def new_version():
+    # Sayaç yerine rastgele değer: anahtar önbellekten düşse ya da temizlense
+    # bile yeniden üretilen sürüm eski bir anahtarla eşleşmez
+    return uuid.uuid4().hex
+
+
+def get_data_version():
+    """Güncel veri sürümünü döndür (yoksa rastgele bir sürümle başlat)"""
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, new_version(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def bump_data_version():
+    """Veri sürümünü yenile; önceki sürümle saklanan tüm istatistikler geçersiz olur
+
+    incr() yerine set() kullanılır; dosya tabanlı önbellekte eşzamanlı iki
+    yenileme aynı sürümü üretemez.
+    """
+    # Silme işlemleri updated_at'e yansımadığı için API'nin Last-Modified değerinde kullanılır
+    cache.set(DATA_CHANGED_AT_KEY, timezone.now(), timeout=None)
+    version = new_version()
+    cache.set(DATA_VERSION_KEY, version, timeout=None)
+    memo = _request_version.get()
+    if memo is not None:
+        memo['version'] = version
+    return version
+
+
+def request_data_version():
+    """Veri sürümünü istek başına bir kez oku; istek dışında get_data_version() ile aynıdır
+
+    Sık çağrılan oran önbelleği kontrolü (models.get_commission_rates) için
+    kullanılır; dosya tabanlı önbellekte her okuma bir dosya açma demektir.
+    """
+    memo = _request_version.get()
+    if memo is None:
+        return get_data_version()
+    if 'version' not in memo:
+        memo['version'] = get_data_version()
+    return memo['version']
+
+
+class DataVersionMiddleware:
+    """request_data_version() için istek süresince geçerli bir sürüm belleği açar"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_version.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_version.reset(token)
+
+
+def get_data_changed_at():
+    """Veri sürümünün son artırıldığı zaman (bilinmiyorsa None)"""
+    return cache.get(DATA_CHANGED_AT_KEY)
+
+
+def _dashboard_key(role, year, month, psychologist_id, version):
+    return f'sari_seans:dashboard:{role}:{psychologist_id or 0}:{year}-{month}:v{version}'
+
+
+def dashboard_cache_key(role, year, month, psychologist_id=None):
+    """Rol, psikolog, ay/yıl ve veri sürümünden önbellek anahtarı oluştur"""
+    return _dashboard_key(role, year, month, psychologist_id, get_data_version())
+
+
+def cached_dashboard_stats(role, year, month, build, psychologist_id=None):
+    """build() ile hesaplanan istatistikleri önbellekten döndür ya da hesaplayıp sakla"""
+    key = dashboard_cache_key(role, year, month, psychologist_id)
+    stats = cache.get(key)
+    if stats is None:
+        stats = build()
+        cache.set(key, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return stats
+
+
+async def aget_data_version():
+    """get_data_version()'ın async karşılığı"""
+    version = await cache.aget(DATA_VERSION_KEY)
+    if version is None:
+        await cache.aadd(DATA_VERSION_KEY, new_version(), timeout=None)
+        version = await cache.aget(DATA_VERSION_KEY)
+    return version
+
+
+async def acached_dashboard_stats(role, year, month, build, psychologist_id=None):
+    """cached_dashboard_stats()'ın async karşılığı; build bir coroutine fonksiyonudur"""
+    key = _dashboard_key(role, year, month, psychologist_id, await aget_data_version())
+    stats = await cache.aget(key)
+    if stats is None:
+        stats = await build()
+        await cache.aset(key, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return stats
@@ -0,0 +1,93 @@
+"""Psikolog bazında çakışan (üst üste binen) seansların bulunması
+
+Seansın bitiş zamanı Session.ends_at kolonunda saklanır. Kayıt sırasında
+kontrol (expert, ends_at, date) indeksinde tek aralık sorgusuyla yapılır;
+toplu rapor ise seansları sıralayıp tek geçişte tarar.
+"""
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Session
+
+
+def session_interval(date, duration):
+    """Formdan gelen tarih ve süreyi (başlangıç, bitiş) ikilisine çevir"""
+    if isinstance(date, str):
+        date = parse_datetime(date)
+    if date is None:
+        return None
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return date, date + timedelta(minutes=int(duration or 0))
+
+
+def overlapping_sessions(expert_id, start, end, exclude_pk=None):
+    """Psikoloğun [start, end) aralığıyla çakışan, iptal edilmemiş seansları"""
+    sessions = Session.objects.filter(expert_id=expert_id, ends_at__gt=start, date__lt=end).exclude(status='canceled')
+    if exclude_pk is not None:
+        sessions = sessions.exclude(pk=exclude_pk)
+    # ends_at sıralaması SQLite'ın (expert, -date) yerine aralık indeksini seçmesini sağlar
+    return sessions.order_by('ends_at')
+
+
+def interval_conflicts(expert_id, intervals, exclude_pks=()):
+    """[(başlangıç, bitiş), ...] aralıklarından çakışanları {başlangıç: çakışan seans} olarak döndür
+
+    Tüm aralıklar psikoloğun seanslarıyla tek sorguda karşılaştırılır.
+    """
+    if not intervals:
+        return {}
+    busy = list(
+        overlapping_sessions(expert_id, min(start for start, _ in intervals), max(end for _, end in intervals))
+        .exclude(pk__in=exclude_pks)
+        .only('date', 'ends_at', 'client_name')
+    )
+    conflicts = {}
+    for start, end in intervals:
+        for other in busy:
+            if other.date < end and start < other.ends_at:
+                conflicts[start] = other
+                break
+    return conflicts
+
+
+def conflict_message(expert_id, date, duration, exclude_pk=None):
+    """Çakışma varsa kullanıcıya gösterilecek hata mesajını, yoksa None döndür"""
+    interval = session_interval(date, duration)
+    if interval is None:
+        return None
+    conflict = overlapping_sessions(expert_id, *interval, exclude_pk=exclude_pk).first()
+    if conflict is None:
+        return None
+    start = timezone.localtime(conflict.date)
+    end = timezone.localtime(conflict.ends_at)
+    return (
+        f'Psikoloğun bu saatte başka bir seansı var: {conflict.client_name} '
+        f'({start:%d.%m.%Y %H:%M}-{end:%H:%M}).'
+    )
+
+
+def find_conflicts(sessions):
+    """Çakışan seans çiftlerini (önceki, sonraki) olarak üret
+
+    Seanslar psikolog ve başlangıca göre sıralanır; her psikolog için henüz
+    bitmemiş seanslar tutulur ve yeni seans hepsiyle eşlenir. Böylece A[0,100]
+    içinde kalan B[10,90] ile C[20,30] çakışması da bulunur. Listeden düşen
+    her seans bir kez, kalan her seans bir çift ürettiği için maliyet seans ve
+    çift sayısıyla doğrusaldır.
+    """
+    rows = (
+        sessions.exclude(status='canceled')
+        .select_related('expert__user')
+        .order_by('expert_id', 'date', 'id')
+    )
+    active = []
+    for session in rows.iterator(chunk_size=2000):
+        if active and active[0].expert_id != session.expert_id:
+            active = []
+        active = [other for other in active if session.date < other.ends_at]
+        for other in active:
+            yield other, session
+        active.append(session)
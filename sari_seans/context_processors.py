@@ -1,16 +1,12 @@
+from .roles import get_role
+
+
 def user_roles(request):
-    """Template context'e kullanıcı rollerini ekle"""
-    def is_assistant(user):
-        return hasattr(user, 'assistant')
-    
-    def is_psychologist(user):
-        return hasattr(user, 'psychologist')
-    
-    def is_admin(user):
-        return user.is_superuser
-    
+    """Template context'e RoleMiddleware'in çözdüğü kullanıcı rollerini ekle"""
+    role = get_role(request)
     return {
-        'is_assistant': is_assistant,
-        'is_psychologist': is_psychologist,
-        'is_admin': is_admin,
-    } 
\ No newline at end of file
+        'role': role,
+        'is_assistant': role.is_assistant,
+        'is_psychologist': role.is_psychologist,
+        'is_admin': role.is_admin,
+    }
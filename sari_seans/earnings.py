@@ -0,0 +1,171 @@
+"""MonthlyEarnings özet tablosunun hesaplanması ve güncellenmesi"""
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, Q, Sum, Value
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .models import SNAPSHOT_FIELDS, MonthlyEarnings, Session
+
+
+def month_range(year, month):
+    """Ayın başlangıç ve bir sonraki ayın başlangıç zamanını (yerel saat) döndür"""
+    tz = timezone.get_current_timezone()
+    start = datetime(year, month, 1, tzinfo=tz)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=tz)
+    return start, end
+
+
+def grouped_earnings(sessions):
+    """Seansları psikolog, yıl, ay ve durum bazında gruplayarak topla"""
+    return (
+        sessions
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values('expert_id', 'year', 'month', 'status')
+        .annotate(
+            session_count=Count('id'),
+            gross=Sum('price'),
+            commission=Sum('snapshot_commission'),
+            net=Sum('snapshot_net'),
+        )
+        .order_by()
+    )
+
+
+def _build_rows(sessions):
+    return [
+        MonthlyEarnings(
+            psychologist_id=row['expert_id'],
+            year=row['year'],
+            month=row['month'],
+            status=row['status'],
+            session_count=row['session_count'],
+            gross=row['gross'] or 0,
+            commission=row['commission'] or 0,
+            net=row['net'] or 0,
+        )
+        for row in grouped_earnings(sessions)
+    ]
+
+
+def rebuild_monthly_earnings(psychologist_ids=None):
+    """Özet tabloyu seanslardan baştan oluştur; oluşturulan satır sayısını döndür"""
+    sessions = Session.objects.all()
+    existing = MonthlyEarnings.objects.all()
+    if psychologist_ids is not None:
+        sessions = sessions.filter(expert_id__in=psychologist_ids)
+        existing = existing.filter(psychologist_id__in=psychologist_ids)
+
+    with transaction.atomic():
+        existing.delete()
+        rows = MonthlyEarnings.objects.bulk_create(_build_rows(sessions), batch_size=500)
+    # Toplu yollar sinyal göndermez; dashboard önbelleğini burada geçersiz kıl
+    transaction.on_commit(bump_data_version)
+    return len(rows)
+
+
+def refresh_month(psychologist_id, year, month):
+    """Tek bir psikoloğun tek bir ayına ait özet satırlarını yeniden hesapla"""
+    refresh_months([(psychologist_id, year, month)])
+
+
+# SQLite iç içe OR ifadelerinin derinliğini 1000 ile sınırlar
+REFRESH_BATCH_SIZE = 200
+
+
+def refresh_months(keys):
+    """Birden fazla (psikolog, yıl, ay) özetini gruplar halinde yeniden hesapla
+
+    Her grup için tek silme ve tek gruplu sorgu çalışır; anahtarlar
+    REFRESH_BATCH_SIZE'lık parçalara bölünür ki koşul ağacı veritabanı
+    sınırını aşmasın.
+    """
+    keys = sorted(set(keys))
+    if not keys:
+        return
+
+    with transaction.atomic():
+        for offset in range(0, len(keys), REFRESH_BATCH_SIZE):
+            existing = Q()
+            selected = Q()
+            for psychologist_id, year, month in keys[offset:offset + REFRESH_BATCH_SIZE]:
+                start, end = month_range(year, month)
+                existing |= Q(psychologist_id=psychologist_id, year=year, month=month)
+                selected |= Q(expert_id=psychologist_id, date__gte=start, date__lt=end)
+            MonthlyEarnings.objects.filter(existing).delete()
+            MonthlyEarnings.objects.bulk_create(
+                _build_rows(Session.objects.filter(selected)), batch_size=500,
+            )
+
+
+def set_session_status(sessions, status):
+    """Seçili seansların durumunu toplu değiştir; durumu değişen seans sayısını döndür
+
+    Durum tek UPDATE ile yazılır; 'done' olan seanslara kesinti snapshot'ı
+    alınır, diğerlerinin snapshot'ı temizlenir. Seans başına save() ve sinyal
+    yerine özet tablo etkilenen aylar için bir kez yenilenir.
+    """
+    if status not in dict(Session.STATUS_CHOICES):
+        raise ValueError(f'Geçersiz durum: {status}')
+
+    with transaction.atomic():
+        rows = list(
+            sessions.exclude(status=status)
+            .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+            .values_list('pk', 'expert_id', 'year', 'month')
+            .order_by()
+        )
+        if not rows:
+            return 0
+
+        changed = Session.objects.filter(pk__in=[row[0] for row in rows])
+        values = {'status': status, 'updated_at': timezone.now()}
+        if status != 'done':
+            values.update(dict.fromkeys(SNAPSHOT_FIELDS))
+        changed.update(**values)
+        if status == 'done':
+            changed.snapshot_commission()
+        refresh_months(row[1:] for row in rows)
+    transaction.on_commit(bump_data_version)
+    return len(rows)
+
+
+def session_month(session_id):
+    """Seansın veritabanındaki (psikolog, yıl, ay) anahtarını döndür"""
+    return (
+        Session.objects.filter(pk=session_id)
+        .annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values_list('expert_id', 'year', 'month')
+        .first()
+    )
+
+
+def with_earnings_stats(psychologists, year, month):
+    """Psikologlara toplam ve seçilen ay istatistiklerini tek gruplu sorguda ekle
+
+    Her psikolog için stat_total_sessions, stat_total_earnings, stat_commission,
+    stat_net ve aynı alanların stat_monthly_* karşılıkları eklenir. Seans sayıları
+    tüm durumları, tutarlar sadece 'done' seansları kapsar.
+    """
+    done = Q(monthly_earnings__status='done')
+    selected_month = Q(monthly_earnings__year=year, monthly_earnings__month=month)
+
+    def total(field, condition=None, output_field=DecimalField(max_digits=16, decimal_places=4)):
+        return Coalesce(
+            Sum(f'monthly_earnings__{field}', filter=condition),
+            Value(0, output_field=output_field),
+            output_field=output_field,
+        )
+
+    return psychologists.select_related('user').annotate(
+        stat_total_sessions=total('session_count', output_field=IntegerField()),
+        stat_total_earnings=total('gross', done),
+        stat_commission=total('commission'),
+        stat_net=total('net'),
+        stat_monthly_sessions=total('session_count', selected_month, output_field=IntegerField()),
+        stat_monthly_earnings=total('gross', done & selected_month),
+        stat_monthly_commission=total('commission', selected_month),
+        stat_monthly_net=total('net', selected_month),
+    )
@@ -0,0 +1,103 @@
+"""Filtrelenmiş seansların kesinti kolonlarıyla birlikte CSV olarak dışa aktarımı"""
+import csv
+from decimal import Decimal
+
+from django.utils import timezone
+
+from .models import Session, get_commission_rates
+
+EXPORT_HEADER = [
+    'ID', 'Tarih', 'Danışan', 'Psikolog', 'Süre (dk)', 'Seans Türü', 'Ödeme Yöntemi', 'Durum',
+    'Ücret', 'Psikolog Kesintisi', 'Seans Ek Kesintisi', 'Seans Türü Kesintisi',
+    'Ödeme Yöntemi Kesintisi', 'Toplam Kesinti Oranı (%)', 'Toplam Kesinti', 'Net Tutar',
+]
+
+EXPORT_FIELDS = (
+    'id', 'date', 'client_name', 'expert__user__first_name', 'expert__user__last_name',
+    'expert__user__username', 'duration', 'session_type', 'payment_method', 'status',
+    'price', 'expert__commission_rate', 'extra_commission_rate',
+    'snapshot_expert_rate', 'snapshot_session_type_rate', 'snapshot_payment_method_rate',
+    'snapshot_commission', 'snapshot_net',
+)
+
+ZERO = Decimal('0')
+CENT = Decimal('0.01')
+
+# Excel/LibreOffice bu karakterlerle başlayan hücreleri formül olarak çalıştırır
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def escape_cell(value):
+    """Kullanıcının girdiği metni formül olarak yorumlanmasın diye ' ile başlat"""
+    if value and value.startswith(FORMULA_PREFIXES):
+        return f"'{value}"
+    return value
+
+
+def session_export_rows(sessions, chunk_size=2000):
+    """Başlık satırı ve ardından her seans için bir satır üret
+
+    Seanslar iterator() ile parça parça okunur. Tamamlanmış seanslarda
+    kaydedilmiş oran ve tutarlar, diğerlerinde tek seferlik oran haritası
+    kullanıldığı için satır başına ek sorgu yapılmaz.
+    """
+    rates = get_commission_rates()
+    session_type_rates = rates['session_type']
+    payment_method_rates = rates['payment_method']
+    session_types = dict(Session.SESSION_TYPE_CHOICES)
+    payment_methods = dict(Session.PAYMENT_METHOD_CHOICES)
+    statuses = dict(Session.STATUS_CHOICES)
+
+    yield EXPORT_HEADER
+    rows = sessions.order_by('-date', '-id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    for (pk, date, client_name, first_name, last_name, username, duration, session_type,
+         payment_method, status, price, psychologist_rate, extra_rate, snapshot_psychologist_rate,
+         snapshot_session_type_rate, snapshot_payment_method_rate, commission, net) in rows:
+        if snapshot_psychologist_rate is not None:
+            psychologist_rate = snapshot_psychologist_rate
+            session_type_rate = snapshot_session_type_rate
+            payment_method_rate = snapshot_payment_method_rate
+        else:
+            session_type_rate = session_type_rates.get(session_type, ZERO)
+            payment_method_rate = payment_method_rates.get(payment_method, ZERO)
+        total_rate = psychologist_rate + extra_rate + session_type_rate + payment_method_rate
+
+        parts = [ZERO, ZERO, ZERO, ZERO]
+        if status == 'done' and price > 0:
+            parts = [
+                price * rate / 100
+                for rate in (psychologist_rate, extra_rate, session_type_rate, payment_method_rate)
+            ]
+        if commission is None:
+            commission = sum(parts, ZERO)
+            net = price - commission if status == 'done' else ZERO
+
+        yield [
+            pk,
+            timezone.localtime(date).strftime('%d.%m.%Y %H:%M'),
+            escape_cell(client_name),
+            escape_cell(f'{first_name} {last_name}'.strip() or username),
+            duration,
+            session_types.get(session_type, session_type),
+            payment_methods.get(payment_method, payment_method),
+            statuses.get(status, status),
+            price,
+            *(part.quantize(CENT) for part in parts),
+            total_rate,
+            commission.quantize(CENT),
+            net.quantize(CENT),
+        ]
+
+
+class Echo:
+    """csv.writer için yazılanı aynen döndüren sahte dosya nesnesi"""
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    """Satırları CSV metin parçalarına çevir (Excel için UTF-8 BOM ile başlar)"""
+    writer = csv.writer(Echo())
+    yield '\ufeff'
+    for row in rows:
+        yield writer.writerow(row)
@@ -0,0 +1,60 @@
+"""Seans listelerinde ortak kullanılan GET filtreleri"""
+from .earnings import month_range
+
+# month_range() ve saat dilimi dönüşümü bu aralıkta taşma yapmaz
+MIN_YEAR = 1900
+MAX_YEAR = 9998
+# SQLite INTEGER sınırı; daha büyük değerler sorguda OverflowError verir
+MAX_ID = 2**63 - 1
+
+
+def parse_int(value, low, high):
+    """Tam sayı ve [low, high] aralığındaysa değeri, değilse None döndür"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return None
+    return value if low <= value <= high else None
+
+
+def parse_month(value):
+    return parse_int(value, 1, 12)
+
+
+def parse_year(value):
+    return parse_int(value, MIN_YEAR, MAX_YEAR)
+
+
+def parse_id(value):
+    return parse_int(value, 1, MAX_ID)
+
+
+def apply_session_filters(sessions, params, by_psychologist=True):
+    """status, psychologist, month ve year parametrelerini seans queryset'ine uygula
+
+    Ay ve yıl birlikte verildiğinde indekslerin kullanılabilmesi için
+    date__month/date__year yerine tarih aralığı filtresi kullanılır.
+    Geçersiz psikolog, ay ve yıl değerleri yok sayılır.
+    """
+    status_filter = params.get('status')
+    psychologist_filter = parse_id(params.get('psychologist')) if by_psychologist else None
+    month_filter = parse_month(params.get('month'))
+    year_filter = parse_year(params.get('year'))
+    
+    if status_filter:
+        sessions = sessions.filter(status=status_filter)
+    
+    if psychologist_filter:
+        sessions = sessions.filter(expert_id=psychologist_filter)
+    
+    if month_filter and year_filter:
+        start, end = month_range(year_filter, month_filter)
+        sessions = sessions.filter(date__gte=start, date__lt=end)
+    elif month_filter:
+        # Yıl seçilmeden ay filtresi aralığa çevrilemez
+        sessions = sessions.filter(date__month=month_filter)
+    elif year_filter:
+        # date__year zaten BETWEEN aralığına çevrilir
+        sessions = sessions.filter(date__year=year_filter)
+    
+    return sessions
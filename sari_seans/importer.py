@@ -0,0 +1,170 @@
+"""CSV dosyasından toplu seans aktarımı"""
+import csv
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .earnings import refresh_month
+from .models import Psychologist, Session
+
+IMPORT_COLUMNS = [
+    'username', 'client_name', 'date', 'duration', 'price', 'session_type',
+    'payment_method', 'status', 'extra_commission_rate', 'notes',
+]
+REQUIRED_COLUMNS = {'username', 'client_name', 'date'}
+# Dakika cinsinden en uzun seans süresi (24 saat)
+MAX_DURATION = 24 * 60
+DATE_FORMATS = ['%Y-%m-%d %H:%M', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M:%S', '%d.%m.%Y %H:%M']
+
+SESSION_TYPES = {choice for choice, _ in Session.SESSION_TYPE_CHOICES}
+PAYMENT_METHODS = {choice for choice, _ in Session.PAYMENT_METHOD_CHOICES}
+STATUSES = {choice for choice, _ in Session.STATUS_CHOICES}
+
+
+class RowError(ValueError):
+    pass
+
+
+class SessionImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []  # (satır numarası, hata mesajı)
+
+    @property
+    def error_count(self):
+        return len(self.errors)
+
+
+def parse_duration(value):
+    """Süreyi dakika olarak doğrula; boşsa varsayılan 60"""
+    if not value:
+        return 60
+    try:
+        duration = int(value)
+    except ValueError:
+        raise RowError('Geçersiz süre formatı!')
+    if duration <= 0:
+        raise RowError('Süre pozitif olmalı!')
+    # Çok büyük değerler bulk_create'te taşar ya da bitiş zamanı hesaplanamaz
+    if duration > MAX_DURATION:
+        raise RowError(f'Süre en fazla {MAX_DURATION} dakika olabilir!')
+    return duration
+
+
+def parse_decimal(value, label, field_name):
+    """Ücret/oran değerini Session alanının basamak sınırlarına göre doğrula; boşsa 0"""
+    if not value:
+        return Decimal('0')
+    try:
+        number = Decimal(value.replace(',', '.'))
+    except InvalidOperation:
+        raise RowError(f'Geçersiz {label} formatı!')
+    if not number.is_finite():
+        raise RowError(f'Geçersiz {label} formatı!')
+    if number < 0:
+        raise RowError(f'{label.capitalize()} negatif olamaz!')
+    # bulk_create doğrulama yapmaz; sığmayan değer ya tüm aktarımı durdurur ya da sonradan okunamaz
+    try:
+        Session._meta.get_field(field_name).run_validators(number)
+    except ValidationError as exc:
+        raise RowError(f"Geçersiz {label}: {' '.join(exc.messages)}")
+    return number
+
+
+def parse_date(value):
+    for date_format in DATE_FORMATS:
+        try:
+            return timezone.make_aware(datetime.strptime(value, date_format))
+        except ValueError:
+            continue
+    raise RowError(f'Geçersiz tarih: {value}')
+
+
+def parse_choice(value, choices, default, label):
+    if not value:
+        return default
+    if value not in choices:
+        raise RowError(f'Geçersiz {label}: {value}')
+    return value
+
+
+def build_session(row, psychologist_ids):
+    """CSV satırını doğrulayıp kaydedilmemiş bir Session nesnesine çevir"""
+    username = (row.get('username') or '').strip()
+    expert_id = psychologist_ids.get(username)
+    if expert_id is None:
+        raise RowError(f'Psikolog bulunamadı: {username}')
+    client_name = (row.get('client_name') or '').strip()
+    if not client_name:
+        raise RowError('Danışan adı boş olamaz!')
+
+    return Session(
+        expert_id=expert_id,
+        client_name=client_name[:100],
+        date=parse_date((row.get('date') or '').strip()),
+        duration=parse_duration((row.get('duration') or '').strip()),
+        price=parse_decimal((row.get('price') or '').strip(), 'ücret', 'price'),
+        session_type=parse_choice((row.get('session_type') or '').strip(), SESSION_TYPES, 'face_to_face', 'seans türü'),
+        payment_method=parse_choice((row.get('payment_method') or '').strip(), PAYMENT_METHODS, 'cash', 'ödeme yöntemi'),
+        status=parse_choice((row.get('status') or '').strip(), STATUSES, 'planned', 'durum'),
+        extra_commission_rate=parse_decimal((row.get('extra_commission_rate') or '').strip(), 'ek kesinti oranı', 'extra_commission_rate'),
+        notes=(row.get('notes') or '').strip(),
+    )
+
+
+def import_sessions(text_stream, batch_size=1000, dry_run=False):
+    """CSV akışını satır satır oku, geçerli satırları toplu halde ekle
+
+    Psikologlar kullanıcı adına göre tek sorguyla eşlenir. Tüm ekleme tek
+    transaction içinde yapılır; hatalı satırlar atlanır ve raporlanır.
+    dry_run=True ise sadece doğrulama yapılır.
+    """
+    result = SessionImportResult()
+    reader = csv.DictReader(text_stream)
+    missing = REQUIRED_COLUMNS - set(reader.fieldnames or [])
+    if missing:
+        result.errors.append((1, f"Eksik kolon(lar): {', '.join(sorted(missing))}"))
+        return result
+
+    psychologist_ids = {}
+    expert_rates = {}
+    for username, pk, rate in Psychologist.objects.values_list('user__username', 'id', 'commission_rate'):
+        psychologist_ids[username] = pk
+        expert_rates[pk] = rate
+    batch = []
+    months = set()
+
+    def flush():
+        for session in batch:
+            if session.status == 'done':
+                session.take_commission_snapshot(expert_rates[session.expert_id])
+        if batch and not dry_run:
+            Session.objects.bulk_create(batch)
+        for session in batch:
+            local_date = timezone.localtime(session.date)
+            months.add((session.expert_id, local_date.year, local_date.month))
+        result.created += len(batch)
+        batch.clear()
+
+    with transaction.atomic():
+        # Başlık 1. satır olduğundan veri satırları 2'den başlar
+        for line_number, row in enumerate(reader, start=2):
+            try:
+                batch.append(build_session(row, psychologist_ids))
+            except RowError as exc:
+                result.errors.append((line_number, str(exc)))
+                continue
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+        if not dry_run:
+            # bulk_create sinyal göndermez; etkilenen ayların özetlerini yenile
+            for key in months:
+                refresh_month(*key)
+            transaction.on_commit(bump_data_version)
+    return result
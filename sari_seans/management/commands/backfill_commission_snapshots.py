@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from sari_seans.earnings import rebuild_monthly_earnings
+from sari_seans.models import Session
+
+
+class Command(BaseCommand):
+    help = (
+        "Kayıtlı kesintisi olmayan 'done' seanslara güncel oranları ve tutarları yazar, "
+        'ardından MonthlyEarnings özet tablosunu yeniler.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--psychologist', type=int, action='append', dest='psychologist_ids',
+            help='Sadece verilen psikolog ID(leri)',
+        )
+        parser.add_argument(
+            '--all', action='store_true', dest='overwrite',
+            help='Kayıtlı değerleri de güncel oranlarla yeniden hesapla',
+        )
+
+    def handle(self, *args, **options):
+        sessions = Session.objects.filter(status='done')
+        if not options['overwrite']:
+            sessions = sessions.filter(snapshot_commission__isnull=True)
+        if options['psychologist_ids']:
+            sessions = sessions.filter(expert_id__in=options['psychologist_ids'])
+
+        count = sessions.snapshot_commission()
+        # UPDATE sinyal göndermez; özet tablo ayrıca yenilenir
+        rows = rebuild_monthly_earnings(options['psychologist_ids']) if count else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} seansın kesintisi kaydedildi, {rows} özet satırı yenilendi.'
+        ))
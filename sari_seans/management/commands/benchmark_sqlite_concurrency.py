@@ -0,0 +1,157 @@
+import json
+import multiprocessing
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+
+from sari_seans.models import MonthlyEarnings, Psychologist, Session
+from sari_seans.pagination import keyset_paginate
+
+# Karşılaştırılan profiller: varsayılan ayarlar ve settings'teki üretim profili
+PROFILES = {
+    'default': {
+        'pragmas': {'journal_mode': 'DELETE'},
+        'database': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, 'OPTIONS': {}},
+    },
+    'production': {
+        'pragmas': settings.SQLITE_PRODUCTION_PRAGMAS,
+        'database': {'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True, 'OPTIONS': {'transaction_mode': 'IMMEDIATE'}},
+    },
+}
+
+
+def read_operation(rnd, psychologist_ids):
+    """Liste sayfası ve dashboard toplamlarına benzer okuma"""
+    psychologist_id = rnd.choice(psychologist_ids)
+    sessions = Session.objects.filter(expert_id=psychologist_id).select_related('expert__user')
+    keyset_paginate(sessions, {})
+    MonthlyEarnings.objects.filter(psychologist_id=psychologist_id).totals()
+
+
+def write_operation(rnd, id_range):
+    """Asistanın seans durumunu güncellemesine benzer yazma (özet tablo dahil)"""
+    with transaction.atomic():
+        session = Session.objects.filter(pk__gte=rnd.randint(*id_range)).order_by('pk').first()
+        if session is None:
+            return
+        session.status = 'planned' if session.status == 'done' else 'done'
+        session.save()
+
+
+def run_worker(args):
+    """Süre dolana kadar karışık okuma/yazma yap; işlem sayıları ve gecikmeleri döndür"""
+    worker_id, duration, write_ratio, psychologist_ids, id_range = args
+    rnd = random.Random(worker_id)
+    stats = {'reads': 0, 'writes': 0, 'errors': 0, 'latencies': []}
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        is_write = rnd.random() < write_ratio
+        started = time.perf_counter()
+        try:
+            if is_write:
+                write_operation(rnd, id_range)
+            else:
+                read_operation(rnd, psychologist_ids)
+        except OperationalError:
+            stats['errors'] += 1
+        else:
+            stats['writes' if is_write else 'reads'] += 1
+            stats['latencies'].append((time.perf_counter() - started) * 1000)
+        finally:
+            # İstek sonundaki davranış: CONN_MAX_AGE=0 ise bağlantı kapanır, değilse tutulur
+            connection.close_if_unusable_or_obsolete()
+    connection.close()
+    return stats
+
+
+class Command(BaseCommand):
+    help = (
+        'SQLite veritabanının bir kopyası üzerinde, birden fazla süreçle eşzamanlı '
+        'okuma/yazma yaparak varsayılan ve üretim profilinin (WAL, busy_timeout, '
+        'kalıcı bağlantı) iş hacmini karşılaştırır. Önce seed_data ile veri oluşturulmalıdır.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help='Eşzamanlı süreç sayısı')
+        parser.add_argument('--duration', type=float, default=10, help='Profil başına süre (saniye)')
+        parser.add_argument('--write-ratio', type=float, default=0.2, help='Yazma işlemlerinin oranı (0-1)')
+        parser.add_argument('--profile', choices=[*PROFILES, 'both'], default='both', help='Ölçülecek profil')
+        parser.add_argument('--output', help='Sonuçların yazılacağı JSON dosyası')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Bu kıyaslama sadece SQLite için anlamlıdır.')
+        psychologist_ids = list(Psychologist.objects.values_list('id', flat=True))
+        first = Session.objects.order_by('pk').values_list('pk', flat=True).first()
+        last = Session.objects.order_by('-pk').values_list('pk', flat=True).first()
+        if not psychologist_ids or first is None:
+            raise CommandError('Veri bulunamadı; önce "manage.py seed_data" çalıştırın.')
+
+        # Kopyalamadan önce WAL içeriğini ana dosyaya aktar
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        connections.close_all()
+
+        profiles = list(PROFILES) if options['profile'] == 'both' else [options['profile']]
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in profiles:
+                results[name] = self.run_profile(name, Path(tmp), psychologist_ids, (first, last), options)
+                self.print_result(name, results[name])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(results, output, ensure_ascii=False, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor yazıldı: {options['output']}"))
+
+    def run_profile(self, name, tmp, psychologist_ids, id_range, options):
+        """Her profil veritabanının taze bir kopyasıyla çalışır"""
+        database = connections.settings['default']
+        original = {key: database.get(key) for key in ('NAME', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS', 'OPTIONS')}
+        copy = tmp / f'{name}.sqlite3'
+        shutil.copyfile(original['NAME'], copy)
+
+        profile = PROFILES[name]
+        database.update(profile['database'], NAME=copy)
+        try:
+            # Çocuk süreçler fork ile açılır; güncellenen bağlantı ayarlarını ve PRAGMA'ları devralır
+            context = multiprocessing.get_context('fork')
+            jobs = [
+                (worker_id, options['duration'], options['write_ratio'], psychologist_ids, id_range)
+                for worker_id in range(options['workers'])
+            ]
+            with override_settings(SQLITE_PRAGMAS=profile['pragmas']), context.Pool(options['workers']) as pool:
+                stats = pool.map(run_worker, jobs)
+        finally:
+            database.update(original)
+            connections.close_all()
+
+        latencies = sorted(latency for worker in stats for latency in worker['latencies'])
+        reads = sum(worker['reads'] for worker in stats)
+        writes = sum(worker['writes'] for worker in stats)
+        return {
+            'workers': options['workers'],
+            'duration_s': options['duration'],
+            'write_ratio': options['write_ratio'],
+            'reads': reads,
+            'writes': writes,
+            'errors': sum(worker['errors'] for worker in stats),
+            'ops_per_s': round((reads + writes) / options['duration'], 1),
+            'p50_ms': round(statistics.median(latencies), 2) if latencies else None,
+            'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1], 2) if latencies else None,
+        }
+
+    def print_result(self, name, result):
+        self.stdout.write(
+            f"{name:<11} {result['ops_per_s']:>8} işlem/sn  okuma {result['reads']:>6}  "
+            f"yazma {result['writes']:>5}  hata {result['errors']:>4}  "
+            f"p50 {result['p50_ms']} ms  p95 {result['p95_ms']} ms"
+        )
@@ -0,0 +1,129 @@
+import json
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from sari_seans import urls as app_urls
+from sari_seans.models import PayoutStatement, Psychologist, Session
+from sari_seans.seeding import SEED_ADMIN, SEED_ASSISTANT, SEED_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        'sari_seans/urls.py içindeki her isimli adresi admin, psikolog ve asistan olarak '
+        'GET ile çağırır; sorgu sayısı, süre ve en yüksek bellek kullanımını JSON raporuna yazar. '
+        'Önce seed_data ile veri oluşturulmalıdır.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default='benchmark_report.json', help='JSON rapor dosyası')
+        parser.add_argument('--repeat', type=int, default=3, help='Her istek için tekrar sayısı (medyan alınır)')
+        parser.add_argument('--label', default='', help='Rapora yazılacak etiket (örn. ölçek adı)')
+        parser.add_argument('--route', action='append', dest='routes', help='Sadece verilen adres adı(ları)')
+
+    def handle(self, *args, **options):
+        users = self.role_users()
+        kwargs = self.url_kwargs()
+        patterns = []
+        for pattern in app_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            if options['routes'] and pattern.name not in options['routes']:
+                continue
+            missing = set(pattern.pattern.converters) - set(kwargs)
+            if missing:
+                # Yeni eklenen ve değeri bilinmeyen parametreli adresler raporu durdurmasın
+                self.stderr.write(f"{pattern.name} atlandı: değeri bilinmeyen parametre(ler) {', '.join(sorted(missing))}")
+                continue
+            patterns.append(pattern)
+
+        results = []
+        for role, user in users.items():
+            client = Client(raise_request_exception=False)
+            client.force_login(user)
+            for pattern in patterns:
+                url = reverse(pattern.name, kwargs={key: kwargs[key] for key in pattern.pattern.converters})
+                result = self.measure(client, url, options['repeat'])
+                result.update({'route': pattern.name, 'role': role, 'url': url})
+                results.append(result)
+                self.stdout.write(
+                    f"{role:<13} {pattern.name:<28} {result['status']} "
+                    f"{result['queries']:>5} sorgu {result['time_ms']:>9.1f} ms "
+                    f"{result['peak_memory_kb']:>9.1f} KB"
+                )
+
+        report = {
+            'label': options['label'],
+            'created_at': timezone.now().isoformat(),
+            'sessions': Session.objects.count(),
+            'psychologists': Psychologist.objects.count(),
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            json.dump(report, output, ensure_ascii=False, indent=2)
+        self.stdout.write(self.style.SUCCESS(f"Rapor yazıldı: {options['output']}"))
+
+    def role_users(self):
+        try:
+            return {
+                'admin': User.objects.get(username=SEED_ADMIN),
+                'psychologist': Psychologist.objects.filter(user__username__startswith=SEED_PREFIX)
+                                .select_related('user').order_by('id')[0].user,
+                'assistant': User.objects.get(username=SEED_ASSISTANT),
+            }
+        except (User.DoesNotExist, IndexError):
+            raise CommandError('Sentetik kullanıcılar bulunamadı; önce "manage.py seed_data" çalıştırın.')
+
+    def url_kwargs(self):
+        session = Session.objects.order_by('-date').first()
+        psychologist = Psychologist.objects.order_by('id').first()
+        statement = PayoutStatement.objects.order_by('-year', '-month', 'id').first()
+        return {
+            'session_id': session.pk if session else 0,
+            'psychologist_id': psychologist.pk if psychologist else 0,
+            'statement_id': statement.pk if statement else 0,
+        }
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return response
+
+    def measure(self, client, url, repeat):
+        # İstek başında queries_log sıfırlandığı için sorgular execute_wrapper ile sayılır
+        queries = []
+
+        def count_query(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        timings = []
+        for _ in range(max(repeat, 1)):
+            queries.clear()
+            with connection.execute_wrapper(count_query):
+                started = time.perf_counter()
+                response = self.get(client, url)
+                timings.append((time.perf_counter() - started) * 1000)
+
+        # Bellek ölçümü süreyi etkilemesin diye ayrı bir istekte yapılır
+        tracemalloc.start()
+        try:
+            self.get(client, url)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            'queries': len(queries),
+            'time_ms': round(statistics.median(timings), 2),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
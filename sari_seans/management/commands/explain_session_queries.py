@@ -0,0 +1,84 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.utils import timezone
+
+from sari_seans.earnings import rebuild_monthly_earnings
+from sari_seans.filters import apply_session_filters
+from sari_seans.models import Session
+from sari_seans.seeding import ensure_psychologists, seed_sessions
+
+SESSION_INDEXES = ['session_expert_date_idx', 'session_status_date_idx', 'session_date_idx']
+
+
+class Command(BaseCommand):
+    help = (
+        'Seans liste ekranlarının sorgu planlarını (EXPLAIN) ve sürelerini gösterir. '
+        '--seed ile önce sentetik seans eklenebilir, --compare ile indeksler '
+        'geçici olarak kaldırılmış halde de ölçülür.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0, help='Önce eklenecek sentetik seans sayısı (örn. 1000000)')
+        parser.add_argument('--psychologists', type=int, default=50, help='Sentetik veri için psikolog sayısı')
+        parser.add_argument('--limit', type=int, default=50, help='Liste sorgularında okunacak satır sayısı')
+        parser.add_argument(
+            '--compare', action='store_true',
+            help='İndeksleri bir transaction içinde kaldırıp aynı sorguları tekrar ölç (sonra geri alınır)',
+        )
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            psychologists = ensure_psychologists(options['psychologists'])
+            self.stdout.write(f"{options['seed']} seans ekleniyor...")
+            seed_sessions(options['seed'], psychologists)
+            rebuild_monthly_earnings()
+
+        if options['compare']:
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    for name in SESSION_INDEXES:
+                        cursor.execute(f'DROP INDEX IF EXISTS {name}')
+                self.stdout.write(self.style.MIGRATE_HEADING('== İndeksler olmadan =='))
+                self.report(options['limit'])
+                transaction.set_rollback(True)
+            self.stdout.write(self.style.MIGRATE_HEADING('== İndekslerle =='))
+        self.report(options['limit'])
+
+    def access_paths(self):
+        now = timezone.localtime()
+        month, year = str(now.month), str(now.year)
+        expert_id = Session.objects.values_list('expert_id', flat=True).first()
+        sessions = Session.objects.order_by('-date')
+
+        def filtered(**params):
+            query = QueryDict(mutable=True)
+            query.update(params)
+            return apply_session_filters(sessions, query)
+
+        return [
+            ('Tüm seanslar', sessions),
+            ('Durum', filtered(status='done')),
+            ('Psikolog', filtered(psychologist=expert_id)),
+            ('Ay/yıl (date__month/date__year)', sessions.filter(date__month=now.month, date__year=now.year)),
+            ('Ay/yıl (tarih aralığı)', filtered(month=month, year=year)),
+            ('Psikolog + ay/yıl (tarih aralığı)', filtered(psychologist=expert_id, month=month, year=year)),
+            ('Durum + ay/yıl (tarih aralığı)', filtered(status='done', month=month, year=year)),
+        ]
+
+    def report(self, limit):
+        for name, queryset in self.access_paths():
+            page = queryset[:limit]
+            started = time.perf_counter()
+            list(page)
+            page_ms = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            queryset.count()
+            count_ms = (time.perf_counter() - started) * 1000
+
+            self.stdout.write(self.style.SUCCESS(name))
+            self.stdout.write(f'  ilk {limit} satır: {page_ms:.1f} ms, count(): {count_ms:.1f} ms')
+            for line in page.explain().splitlines():
+                self.stdout.write(f'  {line}')
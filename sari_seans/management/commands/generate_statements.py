@@ -0,0 +1,50 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from sari_seans.models import PayoutStatement
+from sari_seans.statements import generate_statements, previous_month
+
+
+class Command(BaseCommand):
+    help = (
+        'Seçilen ay için psikologların ödeme dökümlerini üretir. Verisi değişmemiş '
+        'dökümler atlanır; çok sayıda döküm süreç havuzunda işlenir.'
+    )
+
+    def add_arguments(self, parser):
+        year, month = previous_month()
+        parser.add_argument('--year', type=int, default=year, help='Yıl (varsayılan: geçen ayın yılı)')
+        parser.add_argument('--month', type=int, default=month, help='Ay (varsayılan: geçen ay)')
+        parser.add_argument(
+            '--psychologist', type=int, action='append', dest='psychologist_ids',
+            help='Sadece verilen psikolog ID(leri)',
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Süreç sayısı (1: süreç havuzu kullanma)')
+        parser.add_argument('--force', action='store_true', help='Verisi değişmemiş dökümleri de yeniden üret')
+        parser.add_argument('--output', help='Dökümlerin HTML dosyası olarak da yazılacağı klasör')
+
+    def handle(self, *args, **options):
+        year, month = options['year'], options['month']
+        started = time.perf_counter()
+        generated, skipped = generate_statements(
+            year, month, options['psychologist_ids'], workers=options['workers'], force=options['force'],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{month:02d}.{year}: {generated} döküm üretildi, {skipped} döküm değişmediği için atlandı ({elapsed:.1f} sn).'
+        ))
+
+        if options['output']:
+            statements = PayoutStatement.objects.filter(year=year, month=month)
+            if options['psychologist_ids']:
+                statements = statements.filter(psychologist_id__in=options['psychologist_ids'])
+            os.makedirs(options['output'], exist_ok=True)
+            count = 0
+            for psychologist_id, html in statements.values_list('psychologist_id', 'html').iterator():
+                path = os.path.join(options['output'], f'{year}-{month:02d}-{psychologist_id}.html')
+                with open(path, 'w', encoding='utf-8') as output:
+                    output.write(html)
+                count += 1
+            self.stdout.write(f"{count} döküm {options['output']} klasörüne yazıldı.")
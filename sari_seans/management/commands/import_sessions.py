@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from sari_seans.importer import IMPORT_COLUMNS, import_sessions
+
+
+class Command(BaseCommand):
+    help = (
+        'CSV dosyasından toplu seans aktarır. Kolonlar: ' + ', '.join(IMPORT_COLUMNS) +
+        ' (username = psikoloğun kullanıcı adı)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV dosyasının yolu')
+        parser.add_argument('--batch-size', type=int, default=1000, help='bulk_create parti büyüklüğü')
+        parser.add_argument('--dry-run', action='store_true', help='Sadece doğrula, kaydetme')
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], newline='', encoding='utf-8-sig') as stream:
+                result = import_sessions(stream, batch_size=options['batch_size'], dry_run=options['dry_run'])
+        except OSError as exc:
+            raise CommandError(f'Dosya okunamadı: {exc}')
+
+        for line_number, message in result.errors:
+            self.stderr.write(f'Satır {line_number}: {message}')
+        verb = 'doğrulandı' if options['dry_run'] else 'eklendi'
+        self.stdout.write(self.style.SUCCESS(f'{result.created} seans {verb}, {result.error_count} satır hatalı.'))
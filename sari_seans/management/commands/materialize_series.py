@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sari_seans.recurrence import extend_series, window_end
+
+
+class Command(BaseCommand):
+    help = (
+        'Aktif tekrarlayan seans serilerinin seanslarını SESSION_SERIES_WINDOW_DAYS '
+        'gün ilerisine kadar üretir. Günlük zamanlanmış görev olarak çalıştırılmalıdır.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Varsayılan pencere yerine kaç gün ilerisine kadar üretileceği')
+
+    def handle(self, *args, **options):
+        until = timezone.now() + timedelta(days=options['days']) if options['days'] else window_end()
+        skipped = []
+        count = extend_series(until, skipped=skipped)
+        for series, date, other in skipped:
+            self.stdout.write(self.style.WARNING(
+                f'{series} {timezone.localtime(date):%d.%m.%Y %H:%M}: {other.client_name} seansıyla çakıştığı için atlandı.'
+            ))
+        self.stdout.write(self.style.SUCCESS(f'{count} seans oluşturuldu, {len(skipped)} tekrar atlandı.'))
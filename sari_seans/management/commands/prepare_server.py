@@ -0,0 +1,65 @@
+import fcntl
+import hashlib
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+STAMP_NAME = '.collectstatic-stamp'
+
+
+class Command(BaseCommand):
+    help = (
+        'Sunucu başlamadan önce sadece gerekiyorsa migrate ve collectstatic çalıştırır. '
+        'Aynı anda başlayan süreçler bir dosya kilidiyle sıraya girer.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-static', action='store_true', help='collectstatic kontrolünü atla')
+        parser.add_argument(
+            '--lock-file', default=str(Path(settings.BASE_DIR) / '.startup.lock'),
+            help='Başlangıç kilidi için kullanılacak dosya',
+        )
+
+    def handle(self, *args, **options):
+        with open(options['lock_file'], 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.migrate_if_needed()
+                if not options['no_static']:
+                    self.collectstatic_if_needed()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def migrate_if_needed(self):
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+        if not plan:
+            self.stdout.write('Bekleyen migration yok.')
+            return
+        self.stdout.write(f'{len(plan)} migration uygulanıyor...')
+        call_command('migrate', interactive=False, verbosity=0)
+
+    def collectstatic_if_needed(self):
+        stamp = Path(settings.STATIC_ROOT) / STAMP_NAME
+        fingerprint = self.static_fingerprint()
+        if stamp.exists() and stamp.read_text() == fingerprint:
+            self.stdout.write('Static dosyalar güncel.')
+            return
+        self.stdout.write('Static dosyalar toplanıyor...')
+        call_command('collectstatic', interactive=False, verbosity=0)
+        stamp.write_text(fingerprint)
+
+    def static_fingerprint(self):
+        """Kaynak static dosyaların (yol, boyut, değişiklik zamanı) ve depolama sınıfının özeti"""
+        digest = hashlib.sha256(settings.STORAGES['staticfiles']['BACKEND'].encode())
+        for finder in finders.get_finders():
+            for path, storage in sorted(finder.list(['CVS', '.*', '*~']), key=lambda item: item[0]):
+                stat = os.stat(storage.path(path))
+                digest.update(f'{path}|{stat.st_size}|{stat.st_mtime_ns}\n'.encode())
+        return digest.hexdigest()
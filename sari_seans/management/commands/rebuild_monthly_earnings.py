@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from sari_seans.earnings import rebuild_monthly_earnings
+
+
+class Command(BaseCommand):
+    help = 'Aylık kazanç özet tablosunu (MonthlyEarnings) seanslardan baştan oluşturur'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--psychologist', type=int, action='append', dest='psychologist_ids',
+            help='Sadece verilen psikolog(lar) için yeniden oluştur (tekrar edilebilir)',
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_monthly_earnings(options['psychologist_ids'])
+        self.stdout.write(self.style.SUCCESS(f'{count} özet satırı oluşturuldu.'))
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from sari_seans.earnings import rebuild_monthly_earnings
+from sari_seans.seeding import (
+    SCALES, delete_seed_data, ensure_admin, ensure_assistant, ensure_psychologists, seed_sessions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Kıyaslama için sentetik veri üretir: seed_admin, seed_assistant ve seed_psy* '
+        'kullanıcıları ile rastgele seanslar. Ölçekler: '
+        + ', '.join(f'{name} ({p} psikolog, {s} seans)' for name, (p, s) in SCALES.items())
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, help='Hazır ölçek')
+        parser.add_argument('--psychologists', type=int, help='Psikolog sayısı')
+        parser.add_argument('--sessions', type=int, help='Seans sayısı')
+        parser.add_argument('--batch-size', type=int, default=5000, help='bulk_create parti büyüklüğü')
+        parser.add_argument('--flush', action='store_true', help='Önce mevcut sentetik veriyi sil')
+
+    def handle(self, *args, **options):
+        psychologist_count, session_count = SCALES.get(options['scale'], (None, None))
+        psychologist_count = options['psychologists'] or psychologist_count
+        session_count = options['sessions'] if options['sessions'] is not None else session_count
+        if psychologist_count is None or session_count is None:
+            raise CommandError('--scale ya da --psychologists ve --sessions verilmeli.')
+
+        started = time.perf_counter()
+        if options['flush']:
+            delete_seed_data()
+            self.stdout.write('Mevcut sentetik veri silindi.')
+
+        ensure_admin()
+        ensure_assistant()
+        psychologists = ensure_psychologists(psychologist_count)
+        seed_sessions(session_count, psychologists, batch_size=options['batch_size'])
+        rows = rebuild_monthly_earnings()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{psychologist_count} psikolog, {session_count} seans eklendi; '
+            f'{rows} özet satırı oluşturuldu ({elapsed:.1f} sn).'
+        ))
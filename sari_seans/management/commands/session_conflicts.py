@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from sari_seans.conflicts import find_conflicts
+from sari_seans.earnings import month_range
+from sari_seans.models import Session
+
+
+class Command(BaseCommand):
+    help = 'Seçilen ayda aynı psikoloğa ait, zamanı üst üste binen (iptal edilmemiş) seansları listeler.'
+
+    def add_arguments(self, parser):
+        now = timezone.localtime()
+        parser.add_argument('--year', type=int, default=now.year, help='Yıl (varsayılan: bu yıl)')
+        parser.add_argument('--month', type=int, default=now.month, help='Ay (varsayılan: bu ay)')
+        parser.add_argument(
+            '--psychologist', type=int, action='append', dest='psychologist_ids',
+            help='Sadece verilen psikolog ID(leri)',
+        )
+
+    def handle(self, *args, **options):
+        start, end = month_range(options['year'], options['month'])
+        sessions = Session.objects.filter(date__gte=start, date__lt=end)
+        if options['psychologist_ids']:
+            sessions = sessions.filter(expert_id__in=options['psychologist_ids'])
+
+        count = 0
+        for first, second in find_conflicts(sessions):
+            count += 1
+            self.stdout.write(
+                f'{first.expert}: {self.describe(first)}  <->  {self.describe(second)}'
+            )
+        style = self.style.WARNING if count else self.style.SUCCESS
+        self.stdout.write(style(f"{options['month']:02d}.{options['year']}: {count} çakışma bulundu."))
+
+    def describe(self, session):
+        start = timezone.localtime(session.date)
+        end = timezone.localtime(session.ends_at)
+        return f'#{session.pk} {session.client_name} {start:%d.%m.%Y %H:%M}-{end:%H:%M}'
@@ -0,0 +1,70 @@
+import glob
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+SORT_KEYS = {'total': 'total_ms', 'count': 'count', 'max': 'max_ms'}
+
+
+def is_full_scan(plan_line):
+    """Tablonun ya da indeksin tamamını okuyan SQLite plan satırı mı (SEARCH aralık okur)"""
+    detail = plan_line.strip()
+    # "SCAN t USING INDEX i" de tüm satırları gezer; date__month filtresi böyle görünür
+    return detail.startswith('SCAN ') and detail != 'SCAN CONSTANT ROW'
+
+
+class Command(BaseCommand):
+    help = 'Yavaş sorgu kaydını (SEANS_SLOW_QUERY_MS) okuyup en çok süre harcayan sorguları özetler.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help='Kayıt dosyası (varsayılan: SLOW_QUERY_LOG; döndürülmüş .1, .2 dosyaları da okunur)')
+        parser.add_argument('--limit', type=int, default=10, help='Gösterilecek sorgu sayısı')
+        parser.add_argument('--sort', choices=SORT_KEYS, default='total', help='Sıralama: toplam süre, sayı ya da en uzun süre')
+        parser.add_argument('--view', help='Sadece verilen görünümden gelen sorgular')
+
+    def handle(self, *args, **options):
+        path = str(options['log'] or settings.SLOW_QUERY_LOG)
+        paths = [path, *sorted(glob.glob(f'{glob.escape(path)}.[0-9]*'))]
+        paths = [name for name in paths if os.path.exists(name)]
+        if not paths:
+            raise CommandError(f'Kayıt dosyası bulunamadı: {path}')
+
+        queries = {}
+        for name in paths:
+            with open(name, encoding='utf-8') as log:
+                for line in log:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if options['view'] and entry.get('view') != options['view']:
+                        continue
+                    # Parametreler %s yer tutucularıyla ayrı geldiği için SQL metni sorguyu tanımlar
+                    stats = queries.setdefault(entry['sql'], {
+                        'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'views': set(), 'plan': None,
+                    })
+                    stats['count'] += 1
+                    stats['total_ms'] += entry['duration_ms']
+                    stats['max_ms'] = max(stats['max_ms'], entry['duration_ms'])
+                    stats['views'].add(entry.get('view') or '-')
+                    stats['plan'] = entry.get('plan') or stats['plan']
+
+        if not queries:
+            self.stdout.write(self.style.SUCCESS('Kayıtta yavaş sorgu yok.'))
+            return
+
+        key = SORT_KEYS[options['sort']]
+        ranked = sorted(queries.items(), key=lambda item: item[1][key], reverse=True)
+        for rank, (sql, stats) in enumerate(ranked[:options['limit']], 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{rank}  toplam {stats['total_ms']:.1f} ms | {stats['count']} kez | "
+                f"en uzun {stats['max_ms']:.1f} ms | ort. {stats['total_ms'] / stats['count']:.1f} ms"
+            ))
+            self.stdout.write(f"  görünümler: {', '.join(sorted(stats['views']))}")
+            self.stdout.write(f'  {sql}')
+            for plan_line in stats['plan'] or []:
+                style = self.style.WARNING if is_full_scan(plan_line) else str
+                self.stdout.write(style(f'  plan: {plan_line}'))
+        self.stdout.write(f'{len(queries)} farklı sorgu, {sum(s["count"] for s in queries.values())} kayıt.')
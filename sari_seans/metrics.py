@@ -0,0 +1,221 @@
+"""sari_seans görünümleri için istek başına performans ölçümleri
+
+MetricsMiddleware her istekte görünüm adı, rol, SQL sorgu sayısı ve süresi,
+şablon işleme süresi ve yanıt boyutunu ölçer; değerler süreç içi
+histogramlarda toplanır ve /metrics/ adresinden Prometheus metin biçiminde
+okunur. Histogramlar süreç başınadır: gunicorn ile çalışırken her istek bir
+sürecin değerlerini gösterir. METRICS_SLOW_REQUEST_MS ayarlanırsa bu süreyi
+aşan her istek METRICS_SLOW_REQUEST_LOG dosyasına tek satır JSON olarak yazılır.
+"""
+import json
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from .roles import get_role
+
+_current = ContextVar('sari_seans_request_stats', default=None)
+_lock = threading.Lock()
+
+
+class RequestStats:
+    """Tek isteğin SQL ve şablon ölçümleri"""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_time = 0.0
+        self.template_time = 0.0
+
+
+class Histogram:
+    """(view, role) etiketli Prometheus histogramı"""
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels, value):
+        counts, total, count = self.series.get(labels, ([0] * len(self.buckets), 0, 0))
+        # Kova sayıları gözlem anında kümülatif tutulur
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[i] += 1
+        self.series[labels] = (counts, total + value, count + 1)
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for (view, role), (counts, total, count) in sorted(self.series.items()):
+            labels = f'view="{escape_label(view)}",role="{escape_label(role)}"'
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f'{self.name}_bucket{{{labels},le="{bound:g}"}} {bucket_count}'
+            yield f'{self.name}_bucket{{{labels},le="+Inf"}} {count}'
+            yield f'{self.name}_sum{{{labels}}} {total:g}'
+            yield f'{self.name}_count{{{labels}}} {count}'
+
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+HISTOGRAMS = {
+    'duration': Histogram('sari_seans_request_duration_seconds', 'İstek süresi (saniye)', SECONDS_BUCKETS),
+    'queries': Histogram('sari_seans_sql_queries', 'İstek başına SQL sorgu sayısı', (1, 2, 5, 10, 20, 50, 100, 200)),
+    'sql_time': Histogram('sari_seans_sql_duration_seconds', 'İstek başına toplam SQL süresi (saniye)', SECONDS_BUCKETS),
+    'template_time': Histogram(
+        'sari_seans_template_render_seconds', 'İstek başına şablon işleme süresi (saniye)', SECONDS_BUCKETS,
+    ),
+    'response_bytes': Histogram(
+        'sari_seans_response_bytes', 'Yanıt gövdesinin boyutu (bayt)',
+        (1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+    ),
+}
+
+
+def escape_label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def reset_metrics():
+    """Toplanan tüm ölçümleri sıfırla"""
+    with _lock:
+        for histogram in HISTOGRAMS.values():
+            histogram.series.clear()
+
+
+def render_metrics():
+    with _lock:
+        return '\n'.join(line for histogram in HISTOGRAMS.values() for line in histogram.render()) + '\n'
+
+
+def record_query(execute, sql, params, many, context):
+    """Veritabanı bağlantısına eklenen sarmalayıcı; sorguları o anki isteğe sayar"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.sql_time += time.perf_counter() - start
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return super().render(context, request)
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            stats.template_time += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """Şablonların işlenme süresini isteğin ölçümlerine ekleyen Django şablon motoru
+
+    Sadece render()/render_to_string ile çağrılan şablon ölçülür; include
+    edilen şablonlar ve şablon içinde tetiklenen sorgular bu süreye dahildir.
+    """
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def response_size(response):
+    if response.has_header('Content-Length'):
+        return int(response['Content-Length'])
+    return 0 if response.streaming else len(response.content)
+
+
+def write_slow_request(entry):
+    path = getattr(settings, 'METRICS_SLOW_REQUEST_LOG', None)
+    if not path:
+        return
+    line = json.dumps(entry, ensure_ascii=False)
+    with _lock, open(path, 'a', encoding='utf-8') as log:
+        log.write(line + '\n')
+
+
+class MetricsMiddleware:
+    """sari_seans görünümlerine gelen istekleri ölçer
+
+    Oturum ve kullanıcı sorguları da sayılsın diye listenin başına yakın
+    eklenir; rol ve görünüm adı yanıt döndükten sonra okunur.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        duration = time.perf_counter() - start
+
+        match = getattr(request, 'resolver_match', None)
+        if match is None or not match.func.__module__.startswith('sari_seans.'):
+            return response
+        role = get_role(request).name or 'anonymous'
+        labels = (match.view_name, role)
+        size = response_size(response)
+        with _lock:
+            HISTOGRAMS['duration'].observe(labels, duration)
+            HISTOGRAMS['queries'].observe(labels, stats.queries)
+            HISTOGRAMS['sql_time'].observe(labels, stats.sql_time)
+            HISTOGRAMS['template_time'].observe(labels, stats.template_time)
+            HISTOGRAMS['response_bytes'].observe(labels, size)
+
+        threshold = getattr(settings, 'METRICS_SLOW_REQUEST_MS', None)
+        if threshold is not None and duration * 1000 >= threshold:
+            write_slow_request({
+                'time': timezone.now().isoformat(),
+                'method': request.method,
+                'path': request.get_full_path(),
+                'view': match.view_name,
+                'role': role,
+                'status': response.status_code,
+                'duration_ms': round(duration * 1000, 2),
+                'queries': stats.queries,
+                'sql_ms': round(stats.sql_time * 1000, 2),
+                'template_ms': round(stats.template_time * 1000, 2),
+                'response_bytes': size,
+            })
+        return response
+
+
+@require_GET
+def metrics(request):
+    """Prometheus metin biçiminde ölçümler; admin oturumu ya da METRICS_TOKEN ile erişilir"""
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorized = get_role(request).is_admin or (
+        token and constant_time_compare(request.headers.get('Authorization', ''), f'Bearer {token}')
+    )
+    if not authorized:
+        return HttpResponseForbidden('Bu kaynağa erişim yetkiniz yok.\n', content_type='text/plain; charset=utf-8')
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
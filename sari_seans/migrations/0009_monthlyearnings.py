@@ -0,0 +1,76 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:18
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def populate_monthly_earnings(apps, schema_editor):
+    Session = apps.get_model('sari_seans', 'Session')
+    MonthlyEarnings = apps.get_model('sari_seans', 'MonthlyEarnings')
+    SessionTypeCommission = apps.get_model('sari_seans', 'SessionTypeCommission')
+    PaymentMethodCommission = apps.get_model('sari_seans', 'PaymentMethodCommission')
+
+    session_type_rates = dict(SessionTypeCommission.objects.values_list('session_type', 'rate'))
+    payment_method_rates = dict(PaymentMethodCommission.objects.values_list('payment_method', 'rate'))
+
+    buckets = {}
+    for session in Session.objects.select_related('expert').iterator():
+        local_date = timezone.localtime(session.date)
+        key = (session.expert_id, local_date.year, local_date.month, session.status)
+        bucket = buckets.setdefault(key, [0, Decimal('0'), Decimal('0'), Decimal('0')])
+        bucket[0] += 1
+        bucket[1] += session.price
+        if session.status == 'done':
+            commission = Decimal('0')
+            if session.price > 0:
+                rate = (
+                    session.expert.commission_rate
+                    + session.extra_commission_rate
+                    + session_type_rates.get(session.session_type, 0)
+                    + payment_method_rates.get(session.payment_method, 0)
+                )
+                commission = session.price * rate / 100
+            bucket[2] += commission
+            bucket[3] += session.price - commission
+
+    MonthlyEarnings.objects.bulk_create([
+        MonthlyEarnings(
+            psychologist_id=psychologist_id, year=year, month=month, status=status,
+            session_count=count, gross=gross, commission=commission, net=net,
+        )
+        for (psychologist_id, year, month, status), (count, gross, commission, net) in buckets.items()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0008_delete_commissionrate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyEarnings',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Yıl')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Ay')),
+                ('status', models.CharField(choices=[('planned', 'Planlandı'), ('done', 'Yapıldı'), ('canceled', 'İptal')], max_length=10, verbose_name='Durum')),
+                ('session_count', models.PositiveIntegerField(default=0, verbose_name='Seans Sayısı')),
+                ('gross', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Brüt Tutar')),
+                ('commission', models.DecimalField(decimal_places=4, default=0, max_digits=16, verbose_name='Kesinti')),
+                ('net', models.DecimalField(decimal_places=4, default=0, max_digits=16, verbose_name='Net Tutar')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+                ('psychologist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_earnings', to='sari_seans.psychologist', verbose_name='Psikolog')),
+            ],
+            options={
+                'verbose_name': 'Aylık Kazanç',
+                'verbose_name_plural': 'Aylık Kazançlar',
+                'ordering': ['-year', '-month'],
+                'constraints': [models.UniqueConstraint(fields=('psychologist', 'year', 'month', 'status'), name='unique_monthly_earnings')],
+            },
+        ),
+        migrations.RunPython(populate_monthly_earnings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,87 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:35
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def snapshot_done_sessions(apps, schema_editor):
+    """Mevcut 'done' seanslara bugünkü oranları ve tutarları yaz"""
+    Session = apps.get_model('sari_seans', 'Session')
+    Psychologist = apps.get_model('sari_seans', 'Psychologist')
+    SessionTypeCommission = apps.get_model('sari_seans', 'SessionTypeCommission')
+    PaymentMethodCommission = apps.get_model('sari_seans', 'PaymentMethodCommission')
+
+    rate_field = models.DecimalField(max_digits=7, decimal_places=2)
+    money_field = models.DecimalField(max_digits=16, decimal_places=4)
+    zero = Value(Decimal('0'), output_field=rate_field)
+    done = Session.objects.filter(status='done')
+
+    done.update(
+        snapshot_expert_rate=Subquery(
+            Psychologist.objects.filter(pk=OuterRef('expert_id')).values('commission_rate')[:1],
+            output_field=rate_field,
+        ),
+        snapshot_session_type_rate=Coalesce(Subquery(
+            SessionTypeCommission.objects.filter(session_type=OuterRef('session_type')).values('rate')[:1],
+            output_field=rate_field,
+        ), zero),
+        snapshot_payment_method_rate=Coalesce(Subquery(
+            PaymentMethodCommission.objects.filter(payment_method=OuterRef('payment_method')).values('rate')[:1],
+            output_field=rate_field,
+        ), zero),
+        snapshot_at=timezone.now(),
+    )
+    total_rate = (
+        F('snapshot_expert_rate') + F('extra_commission_rate')
+        + F('snapshot_session_type_rate') + F('snapshot_payment_method_rate')
+    )
+    commission = Case(
+        When(price__gt=0, then=F('price') * total_rate * Value(Decimal('0.01'), output_field=rate_field)),
+        default=Value(Decimal('0'), output_field=money_field),
+        output_field=money_field,
+    )
+    done.update(snapshot_commission=commission, snapshot_net=F('price') - commission)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0010_session_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Kesinti Hesaplanma Tarihi'),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_commission',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=16, null=True, verbose_name='Kesinti Tutarı'),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_expert_rate',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Uygulanan Psikolog Kesinti Oranı (%)'),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_net',
+            field=models.DecimalField(blank=True, decimal_places=4, max_digits=16, null=True, verbose_name='Net Tutar'),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_payment_method_rate',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Uygulanan Ödeme Yöntemi Kesinti Oranı (%)'),
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='snapshot_session_type_rate',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, verbose_name='Uygulanan Seans Türü Kesinti Oranı (%)'),
+        ),
+        migrations.RunPython(snapshot_done_sessions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0011_session_commission_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['updated_at'], name='session_updated_idx'),
+        ),
+    ]
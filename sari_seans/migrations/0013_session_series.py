@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0012_session_updated_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SessionSeries',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('client_name', models.CharField(max_length=100, verbose_name='Danışan Adı')),
+                ('start', models.DateTimeField(verbose_name='İlk Seans')),
+                ('interval_weeks', models.PositiveSmallIntegerField(choices=[(1, 'Her hafta'), (2, 'İki haftada bir'), (3, 'Üç haftada bir'), (4, 'Dört haftada bir')], default=1, verbose_name='Tekrar Aralığı (Hafta)')),
+                ('end_date', models.DateField(blank=True, null=True, verbose_name='Bitiş Tarihi')),
+                ('occurrence_count', models.PositiveIntegerField(blank=True, help_text='Boş bırakılırsa bitiş tarihine (ya da süresiz) kadar devam eder', null=True, verbose_name='Tekrar Sayısı')),
+                ('duration', models.IntegerField(default=60, verbose_name='Süre (Dakika)')),
+                ('price', models.DecimalField(decimal_places=2, default=0, max_digits=10, verbose_name='Seans Ücreti')),
+                ('session_type', models.CharField(choices=[('online', 'Online Seans'), ('face_to_face', 'Yüz Yüze Seans')], default='face_to_face', max_length=20, verbose_name='Seans Türü')),
+                ('payment_method', models.CharField(choices=[('cash', 'Nakit'), ('credit_card', 'Kredi Kartı'), ('debit_card', 'Banka Kartı'), ('bank_transfer', 'Banka Transferi')], default='cash', max_length=20, verbose_name='Ödeme Yöntemi')),
+                ('extra_commission_rate', models.DecimalField(decimal_places=2, default=0, max_digits=5, verbose_name='Ek Kesinti Oranı (%)')),
+                ('notes', models.TextField(blank=True, verbose_name='Notlar')),
+                ('generated_count', models.PositiveIntegerField(default=0, verbose_name='Üretilen Seans Sayısı')),
+                ('generated_until', models.DateTimeField(blank=True, null=True, verbose_name='Son Üretilen Seans')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Aktif')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Oluşturulma Tarihi')),
+                ('expert', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='series', to='sari_seans.psychologist', verbose_name='Psikolog')),
+            ],
+            options={
+                'verbose_name': 'Tekrarlayan Seans',
+                'verbose_name_plural': 'Tekrarlayan Seanslar',
+            },
+        ),
+        migrations.AddField(
+            model_name='session',
+            name='series',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='sessions', to='sari_seans.sessionseries', verbose_name='Tekrarlayan Seans'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:54
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def fill_ends_at(apps, schema_editor):
+    """Mevcut seansların bitiş zamanını başlangıç ve süreden hesapla"""
+    Session = apps.get_model('sari_seans', 'Session')
+    batch = []
+    for session in Session.objects.only('date', 'duration').iterator(chunk_size=2000):
+        session.ends_at = session.date + timedelta(minutes=session.duration or 0)
+        batch.append(session)
+        if len(batch) >= 2000:
+            Session.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    Session.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0013_session_series'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='session',
+            name='ends_at',
+            field=models.DateTimeField(editable=False, null=True, verbose_name='Bitiş Zamanı'),
+        ),
+        migrations.RunPython(fill_ends_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='session',
+            index=models.Index(fields=['expert', 'ends_at', 'date'], name='session_interval_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 09:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0014_session_ends_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.PositiveSmallIntegerField(choices=[(0, 'Pazartesi'), (1, 'Salı'), (2, 'Çarşamba'), (3, 'Perşembe'), (4, 'Cuma'), (5, 'Cumartesi'), (6, 'Pazar')], verbose_name='Gün')),
+                ('start_time', models.TimeField(verbose_name='Başlangıç')),
+                ('end_time', models.TimeField(verbose_name='Bitiş')),
+                ('session_type', models.CharField(blank=True, choices=[('online', 'Online Seans'), ('face_to_face', 'Yüz Yüze Seans')], help_text='Boş bırakılırsa her iki seans türü için geçerlidir', max_length=20, verbose_name='Seans Türü')),
+                ('psychologist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='working_hours', to='sari_seans.psychologist', verbose_name='Psikolog')),
+            ],
+            options={
+                'verbose_name': 'Çalışma Saati',
+                'verbose_name_plural': 'Çalışma Saatleri',
+                'ordering': ['psychologist', 'weekday', 'start_time'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('start_time__lt', models.F('end_time'))), name='working_hours_start_before_end')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sari_seans', '0015_working_hours'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutStatement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Yıl')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Ay')),
+                ('data_hash', models.CharField(max_length=64, verbose_name='Veri Özeti')),
+                ('session_count', models.PositiveIntegerField(default=0, verbose_name='Yapılan Seans')),
+                ('gross', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Brüt Tutar')),
+                ('commission', models.DecimalField(decimal_places=4, default=0, max_digits=16, verbose_name='Kesinti')),
+                ('net', models.DecimalField(decimal_places=4, default=0, max_digits=16, verbose_name='Net Tutar')),
+                ('html', models.TextField(verbose_name='Döküm (HTML)')),
+                ('generated_at', models.DateTimeField(auto_now=True, verbose_name='Üretilme Tarihi')),
+                ('psychologist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payout_statements', to='sari_seans.psychologist', verbose_name='Psikolog')),
+            ],
+            options={
+                'verbose_name': 'Ödeme Dökümü',
+                'verbose_name_plural': 'Ödeme Dökümleri',
+                'ordering': ['-year', '-month', 'psychologist'],
+                'constraints': [models.UniqueConstraint(fields=('psychologist', 'year', 'month'), name='payout_statement_unique')],
+            },
+        ),
+    ]
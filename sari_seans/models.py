@@ -1,7 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal
+from .caching import request_data_version
 
 class Psychologist(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -54,6 +58,98 @@ class PaymentMethodCommission(models.Model):
         verbose_name = "Ödeme Yöntemi Ek Kesinti"
         verbose_name_plural = "Ödeme Yöntemi Ek Kesintiler"
 
+# Oran tabloları birkaç satırdan ibaret; her seans için tekrar sorgulamamak
+# adına süreç içinde saklanır. Kayıt, paylaşılan önbellekteki veri sürümüyle
+# birlikte tutulur: oran değişikliği sürümü yenilediği için (signals.py) diğer
+# worker süreçleri de eski oranları bir sonraki okumada bırakır. Sürüm istek
+# başına bir kez okunur (caching.DataVersionMiddleware).
+_commission_rate_cache = {}
+
+def get_commission_rates():
+    """Seans türü ve ödeme yöntemi ek kesinti oranlarını önbellekten döndür"""
+    version = request_data_version()
+    cached = _commission_rate_cache.get('rates')
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    rates = {
+        'session_type': dict(SessionTypeCommission.objects.values_list('session_type', 'rate')),
+        'payment_method': dict(PaymentMethodCommission.objects.values_list('payment_method', 'rate')),
+    }
+    _commission_rate_cache['rates'] = (version, rates)
+    return rates
+
+def clear_commission_rate_cache():
+    """Oran önbelleğini temizle (oran kaydedildiğinde/silindiğinde çağrılır)"""
+    _commission_rate_cache.clear()
+
+MONEY_FIELD = DecimalField(max_digits=14, decimal_places=2)
+RATE_FIELD = DecimalField(max_digits=7, decimal_places=2)
+
+ZERO = Decimal('0')
+
+# Seans 'done' olduğunda oranlar ve tutarlar bu alanlara yazılır
+SNAPSHOT_FIELDS = (
+    'snapshot_expert_rate', 'snapshot_session_type_rate', 'snapshot_payment_method_rate',
+    'snapshot_commission', 'snapshot_net', 'snapshot_at',
+)
+# Değiştiğinde oranların yeniden alınmasını gerektiren alanlar
+SNAPSHOT_INPUTS = ('expert_id', 'session_type', 'payment_method')
+
+class SessionQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        # save() çalışmadığı için bitiş zamanı burada hesaplanır
+        objs = list(objs)
+        for obj in objs:
+            obj.set_ends_at()
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def snapshot_commission(self):
+        """Seçili 'done' seanslara güncel oranları ve tutarları UPDATE ile yaz; satır sayısını döndür"""
+        done = self.filter(status='done')
+        expert_rate = Psychologist.objects.filter(pk=OuterRef('expert_id')).values('commission_rate')[:1]
+        session_type_rate = SessionTypeCommission.objects.filter(
+            session_type=OuterRef('session_type')
+        ).values('rate')[:1]
+        payment_method_rate = PaymentMethodCommission.objects.filter(
+            payment_method=OuterRef('payment_method')
+        ).values('rate')[:1]
+        zero = Value(ZERO, output_field=RATE_FIELD)
+
+        total_rate = (
+            F('snapshot_expert_rate') + F('extra_commission_rate')
+            + F('snapshot_session_type_rate') + F('snapshot_payment_method_rate')
+        )
+        # 0.01 ile çarpım, SQLite'ta tam sayı bölmesine düşmemek için
+        commission = Case(
+            When(price__gt=0, then=F('price') * total_rate * Value(Decimal('0.01'), output_field=RATE_FIELD)),
+            default=Value(ZERO, output_field=MONEY_FIELD),
+            output_field=MONEY_FIELD,
+        )
+
+        # UPDATE içinde aynı satırın yeni değerleri okunamadığı için iki adımda yazılır
+        with transaction.atomic():
+            count = done.update(
+                snapshot_expert_rate=Subquery(expert_rate, output_field=RATE_FIELD),
+                snapshot_session_type_rate=Coalesce(Subquery(session_type_rate, output_field=RATE_FIELD), zero),
+                snapshot_payment_method_rate=Coalesce(Subquery(payment_method_rate, output_field=RATE_FIELD), zero),
+                snapshot_at=timezone.now(),
+            )
+            done.update(snapshot_commission=commission, snapshot_net=F('price') - commission)
+        return count
+
+    def commission_totals(self):
+        """Seans sayısı, gelir, kesinti ve net tutarı tek sorguda döndür"""
+        totals = self.aggregate(
+            count=Count('id'),
+            revenue=Sum('price', filter=Q(status='done')),
+            commission=Sum('snapshot_commission'),
+            net=Sum('snapshot_net'),
+        )
+        for key in ('revenue', 'commission', 'net'):
+            if totals[key] is None:
+                totals[key] = ZERO
+        return totals
+
 class Session(models.Model):
     SESSION_TYPE_CHOICES = [
         ('online', 'Online Seans'),
@@ -71,6 +167,8 @@ class Session(models.Model):
     client_name = models.CharField("Danışan Adı", max_length=100)
     date = models.DateTimeField("Tarih ve Saat")
     duration = models.IntegerField("Süre (Dakika)", default=60)
+    # date + duration; çakışma kontrolü için saklanır ve save()/bulk_create ile güncellenir
+    ends_at = models.DateTimeField("Bitiş Zamanı", null=True, editable=False)
     price = models.DecimalField("Seans Ücreti", max_digits=10, decimal_places=2, default=0)
     session_type = models.CharField("Seans Türü", max_length=20, choices=SESSION_TYPE_CHOICES, default='face_to_face')
     payment_method = models.CharField("Ödeme Yöntemi", max_length=20, choices=PAYMENT_METHOD_CHOICES, default='cash')
@@ -83,46 +181,109 @@ class Session(models.Model):
         ('canceled', 'İptal'),
     ]
     status = models.CharField("Durum", max_length=10, choices=STATUS_CHOICES, default='planned')
+    series = models.ForeignKey('SessionSeries', on_delete=models.SET_NULL, null=True, blank=True, related_name='sessions', verbose_name="Tekrarlayan Seans")
+
+    # Seans 'done' olduğunda geçerli olan oranlar ve hesaplanan tutarlar
+    snapshot_expert_rate = models.DecimalField("Uygulanan Psikolog Kesinti Oranı (%)", max_digits=5, decimal_places=2, null=True, blank=True)
+    snapshot_session_type_rate = models.DecimalField("Uygulanan Seans Türü Kesinti Oranı (%)", max_digits=5, decimal_places=2, null=True, blank=True)
+    snapshot_payment_method_rate = models.DecimalField("Uygulanan Ödeme Yöntemi Kesinti Oranı (%)", max_digits=5, decimal_places=2, null=True, blank=True)
+    snapshot_commission = models.DecimalField("Kesinti Tutarı", max_digits=16, decimal_places=4, null=True, blank=True)
+    snapshot_net = models.DecimalField("Net Tutar", max_digits=16, decimal_places=4, null=True, blank=True)
+    snapshot_at = models.DateTimeField("Kesinti Hesaplanma Tarihi", null=True, blank=True)
     
     created_at = models.DateTimeField("Oluşturulma Tarihi", auto_now_add=True)
     updated_at = models.DateTimeField("Güncellenme Tarihi", auto_now=True)
 
+    objects = SessionQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.client_name} - {self.date.strftime('%d.%m.%Y %H:%M')}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Kaydederken oranların yeniden alınması gerekip gerekmediğini anlamak için
+        instance._snapshot_inputs = tuple(instance.__dict__.get(name) for name in SNAPSHOT_INPUTS)
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.set_ends_at()
+        if self.status == 'done':
+            loaded = getattr(self, '_snapshot_inputs', None)
+            current = tuple(getattr(self, name) for name in SNAPSHOT_INPUTS)
+            if self.snapshot_commission is None or (loaded is not None and loaded != current):
+                self.take_commission_snapshot()
+            else:
+                # Ücret ya da seans ek kesintisi değişmiş olabilir; kayıtlı oranlarla yeniden hesapla
+                self.update_snapshot_amounts()
+        elif self.snapshot_commission is not None:
+            self.clear_commission_snapshot()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *SNAPSHOT_FIELDS, 'ends_at'}
+        super().save(*args, **kwargs)
+        self._snapshot_inputs = tuple(getattr(self, name) for name in SNAPSHOT_INPUTS)
+
+    def set_ends_at(self):
+        """Bitiş zamanını başlangıç ve süreden hesapla (kaydetmez)"""
+        # Formlardan gelen tarih metin olabilir
+        self.date = self._meta.get_field('date').to_python(self.date)
+        if self.date is not None and timezone.is_naive(self.date):
+            self.date = timezone.make_aware(self.date)
+        self.ends_at = self.date + timedelta(minutes=int(self.duration or 0)) if self.date else None
+
+    def take_commission_snapshot(self, expert_rate=None):
+        """Güncel oranları ve bunlarla hesaplanan tutarları seansa yaz (kaydetmez)"""
+        rates = get_commission_rates()
+        # Kaydedilmemiş nesnelerde alanlar float ya da metin olabilir
+        self.snapshot_expert_rate = Decimal(str(self.expert.commission_rate if expert_rate is None else expert_rate))
+        self.snapshot_session_type_rate = rates['session_type'].get(self.session_type, ZERO)
+        self.snapshot_payment_method_rate = rates['payment_method'].get(self.payment_method, ZERO)
+        self.snapshot_at = timezone.now()
+        self.update_snapshot_amounts()
+
+    def update_snapshot_amounts(self):
+        """Kayıtlı oranlarla kesinti ve net tutarı yeniden hesapla"""
+        price = Decimal(str(self.price))
+        commission = ZERO
+        if price > 0:
+            commission = price * self.total_commission_rate / 100
+        self.snapshot_commission = commission
+        self.snapshot_net = price - commission
+
+    def clear_commission_snapshot(self):
+        """Seans 'done' durumundan çıktığında kayıtlı oran ve tutarları sil"""
+        for name in SNAPSHOT_FIELDS:
+            setattr(self, name, None)
+
+    def _rates(self):
+        """(psikolog, seans türü, ödeme yöntemi) oranları; varsa kayıtlı değerlerden"""
+        if self.snapshot_expert_rate is not None:
+            return self.snapshot_expert_rate, self.snapshot_session_type_rate, self.snapshot_payment_method_rate
+        rates = get_commission_rates()
+        return (
+            self.expert.commission_rate,
+            rates['session_type'].get(self.session_type),
+            rates['payment_method'].get(self.payment_method),
+        )
+    
     @property
     def commission_amount(self):
-        """Kesinti miktarını hesapla"""
-        if self.status == 'done' and self.price > 0:
-            # Psikolog bazında kesinti
-            psychologist_commission = (self.price * self.expert.commission_rate) / 100
-            
-            # Seans bazında ek kesinti oranı (admin tarafından ayarlanabilir)
-            session_extra_commission = (self.price * self.extra_commission_rate) / 100
-            
-            # Seans türüne göre ek kesinti (dinamik)
-            session_commission = 0
-            try:
-                stc = SessionTypeCommission.objects.get(session_type=self.session_type)
-                session_commission = (self.price * stc.rate) / 100
-            except SessionTypeCommission.DoesNotExist:
-                pass
-            
-            # Ödeme yöntemine göre ek kesinti (dinamik)
-            payment_commission = 0
-            try:
-                pmc = PaymentMethodCommission.objects.get(payment_method=self.payment_method)
-                payment_commission = (self.price * pmc.rate) / 100
-            except PaymentMethodCommission.DoesNotExist:
-                pass
-            
-            return psychologist_commission + session_extra_commission + session_commission + payment_commission
+        """Kesinti miktarı (done seanslar için kaydedilen tutar)"""
+        if self.status == 'done':
+            if self.snapshot_commission is not None:
+                return self.snapshot_commission
+            if self.price > 0:
+                return self.price * self.total_commission_rate / 100
         return 0
     
     @property
     def net_amount(self):
-        """Net kazanç hesapla"""
+        """Net kazanç"""
         if self.status == 'done':
+            if self.snapshot_net is not None:
+                return self.snapshot_net
             return self.price - self.commission_amount
         return 0
     
@@ -130,11 +291,12 @@ class Session(models.Model):
     def commission_breakdown(self):
         """Kesinti detaylarını döndür"""
         if self.status == 'done' and self.price > 0:
+            expert_rate, session_type_rate, payment_method_rate = self._rates()
             breakdown = []
             
             # Psikolog bazında kesinti
-            psychologist_commission = (self.price * self.expert.commission_rate) / 100
-            breakdown.append(f"Psikolog Kesintisi (%{self.expert.commission_rate}): ₺{psychologist_commission:.2f}")
+            psychologist_commission = (self.price * expert_rate) / 100
+            breakdown.append(f"Psikolog Kesintisi (%{expert_rate}): ₺{psychologist_commission:.2f}")
             
             # Seans bazında ek kesinti oranı
             if self.extra_commission_rate > 0:
@@ -142,22 +304,16 @@ class Session(models.Model):
                 breakdown.append(f"Seans Ek Kesintisi (%{self.extra_commission_rate}): ₺{session_extra_commission:.2f}")
             
             # Seans türüne göre ek kesinti
-            try:
-                stc = SessionTypeCommission.objects.get(session_type=self.session_type)
-                session_commission = (self.price * stc.rate) / 100
+            if session_type_rate is not None:
+                session_commission = (self.price * session_type_rate) / 100
                 if session_commission > 0:
-                    breakdown.append(f"Seans Türü Kesintisi (%{stc.rate}): ₺{session_commission:.2f}")
-            except SessionTypeCommission.DoesNotExist:
-                pass
+                    breakdown.append(f"Seans Türü Kesintisi (%{session_type_rate}): ₺{session_commission:.2f}")
             
             # Ödeme yöntemine göre ek kesinti
-            try:
-                pmc = PaymentMethodCommission.objects.get(payment_method=self.payment_method)
-                payment_commission = (self.price * pmc.rate) / 100
+            if payment_method_rate is not None:
+                payment_commission = (self.price * payment_method_rate) / 100
                 if payment_commission > 0:
-                    breakdown.append(f"Ödeme Yöntemi Kesintisi (%{pmc.rate}): ₺{payment_commission:.2f}")
-            except PaymentMethodCommission.DoesNotExist:
-                pass
+                    breakdown.append(f"Ödeme Yöntemi Kesintisi (%{payment_method_rate}): ₺{payment_commission:.2f}")
             
             return breakdown
         return []
@@ -165,28 +321,162 @@ class Session(models.Model):
     @property
     def total_commission_rate(self):
         """Toplam kesinti oranını hesapla (%)"""
-        total_rate = self.expert.commission_rate
-        
-        # Seans bazında ek kesinti oranı
-        total_rate += self.extra_commission_rate
-        
-        # Seans türüne göre ek kesinti
-        try:
-            stc = SessionTypeCommission.objects.get(session_type=self.session_type)
-            total_rate += stc.rate
-        except SessionTypeCommission.DoesNotExist:
-            pass
-        
-        # Ödeme yöntemine göre ek kesinti
-        try:
-            pmc = PaymentMethodCommission.objects.get(payment_method=self.payment_method)
-            total_rate += pmc.rate
-        except PaymentMethodCommission.DoesNotExist:
-            pass
-        
-        return total_rate
+        expert_rate, session_type_rate, payment_method_rate = self._rates()
+        return (
+            Decimal(str(expert_rate))
+            + Decimal(str(self.extra_commission_rate))
+            + (session_type_rate or ZERO)
+            + (payment_method_rate or ZERO)
+        )
     
     class Meta:
         verbose_name = "Seans"
         verbose_name_plural = "Seanslar"
         ordering = ['-date']
+        # Liste ekranlarının filtre + '-date' sıralama erişim yolları
+        indexes = [
+            models.Index(fields=['expert', '-date'], name='session_expert_date_idx'),
+            models.Index(fields=['status', '-date'], name='session_status_date_idx'),
+            models.Index(fields=['-date'], name='session_date_idx'),
+            # API'nin Last-Modified/ETag değeri için MAX(updated_at)
+            models.Index(fields=['updated_at'], name='session_updated_idx'),
+            # Çakışma kontrolü: expert = ? AND ends_at > başlangıç AND date < bitiş
+            models.Index(fields=['expert', 'ends_at', 'date'], name='session_interval_idx'),
+        ]
+
+
+class MonthlyEarningsQuerySet(models.QuerySet):
+    TOTALS = {
+        'count': Sum('session_count'),
+        'revenue': Sum('gross', filter=Q(status='done')),
+        'commission': Sum('commission'),
+        'net': Sum('net'),
+    }
+
+    @staticmethod
+    def _fill_totals(totals):
+        if totals['count'] is None:
+            totals['count'] = 0
+        for key in ('revenue', 'commission', 'net'):
+            if totals[key] is None:
+                totals[key] = Decimal('0')
+        return totals
+
+    def totals(self):
+        """Seans sayısı, gelir, kesinti ve net tutarı tek sorguda döndür"""
+        return self._fill_totals(self.aggregate(**self.TOTALS))
+
+    async def atotals(self):
+        """totals()'ın async karşılığı"""
+        return self._fill_totals(await self.aaggregate(**self.TOTALS))
+
+class MonthlyEarnings(models.Model):
+    """Psikolog, ay ve durum bazında seans özet tablosu (earnings.py ile güncellenir)"""
+    psychologist = models.ForeignKey(Psychologist, on_delete=models.CASCADE, related_name='monthly_earnings', verbose_name="Psikolog")
+    year = models.PositiveSmallIntegerField("Yıl")
+    month = models.PositiveSmallIntegerField("Ay")
+    status = models.CharField("Durum", max_length=10, choices=Session.STATUS_CHOICES)
+    session_count = models.PositiveIntegerField("Seans Sayısı", default=0)
+    gross = models.DecimalField("Brüt Tutar", max_digits=14, decimal_places=2, default=0)
+    commission = models.DecimalField("Kesinti", max_digits=16, decimal_places=4, default=0)
+    net = models.DecimalField("Net Tutar", max_digits=16, decimal_places=4, default=0)
+    updated_at = models.DateTimeField("Güncellenme Tarihi", auto_now=True)
+
+    objects = MonthlyEarningsQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.psychologist} - {self.month:02d}.{self.year} ({self.get_status_display()})"
+
+    class Meta:
+        verbose_name = "Aylık Kazanç"
+        verbose_name_plural = "Aylık Kazançlar"
+        ordering = ['-year', '-month']
+        constraints = [
+            models.UniqueConstraint(fields=['psychologist', 'year', 'month', 'status'], name='unique_monthly_earnings'),
+        ]
+
+class SessionSeries(models.Model):
+    """Sabit aralıklarla tekrarlanan seans kuralı; seanslar recurrence.py ile ileriye doğru üretilir"""
+    INTERVAL_CHOICES = [
+        (1, 'Her hafta'),
+        (2, 'İki haftada bir'),
+        (3, 'Üç haftada bir'),
+        (4, 'Dört haftada bir'),
+    ]
+
+    expert = models.ForeignKey(Psychologist, on_delete=models.CASCADE, related_name='series', verbose_name="Psikolog")
+    client_name = models.CharField("Danışan Adı", max_length=100)
+    start = models.DateTimeField("İlk Seans")
+    interval_weeks = models.PositiveSmallIntegerField("Tekrar Aralığı (Hafta)", choices=INTERVAL_CHOICES, default=1)
+    end_date = models.DateField("Bitiş Tarihi", null=True, blank=True)
+    occurrence_count = models.PositiveIntegerField("Tekrar Sayısı", null=True, blank=True, help_text="Boş bırakılırsa bitiş tarihine (ya da süresiz) kadar devam eder")
+
+    # Üretilen seanslara kopyalanan değerler
+    duration = models.IntegerField("Süre (Dakika)", default=60)
+    price = models.DecimalField("Seans Ücreti", max_digits=10, decimal_places=2, default=0)
+    session_type = models.CharField("Seans Türü", max_length=20, choices=Session.SESSION_TYPE_CHOICES, default='face_to_face')
+    payment_method = models.CharField("Ödeme Yöntemi", max_length=20, choices=Session.PAYMENT_METHOD_CHOICES, default='cash')
+    extra_commission_rate = models.DecimalField("Ek Kesinti Oranı (%)", max_digits=5, decimal_places=2, default=0)
+    notes = models.TextField("Notlar", blank=True)
+
+    generated_count = models.PositiveIntegerField("Üretilen Seans Sayısı", default=0)
+    generated_until = models.DateTimeField("Son Üretilen Seans", null=True, blank=True)
+    is_active = models.BooleanField("Aktif", default=True)
+    created_at = models.DateTimeField("Oluşturulma Tarihi", auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.client_name} - {self.expert} ({self.get_interval_weeks_display()})"
+
+    class Meta:
+        verbose_name = "Tekrarlayan Seans"
+        verbose_name_plural = "Tekrarlayan Seanslar"
+
+class WorkingHours(models.Model):
+    """Psikoloğun haftalık çalışma saatleri; boş seans aralıkları availability.py ile hesaplanır"""
+    WEEKDAY_CHOICES = [
+        (0, 'Pazartesi'), (1, 'Salı'), (2, 'Çarşamba'), (3, 'Perşembe'),
+        (4, 'Cuma'), (5, 'Cumartesi'), (6, 'Pazar'),
+    ]
+
+    psychologist = models.ForeignKey(Psychologist, on_delete=models.CASCADE, related_name='working_hours', verbose_name="Psikolog")
+    weekday = models.PositiveSmallIntegerField("Gün", choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField("Başlangıç")
+    end_time = models.TimeField("Bitiş")
+    session_type = models.CharField("Seans Türü", max_length=20, choices=Session.SESSION_TYPE_CHOICES, blank=True, help_text="Boş bırakılırsa her iki seans türü için geçerlidir")
+
+    def __str__(self):
+        return f"{self.psychologist} - {self.get_weekday_display()} {self.start_time:%H:%M}-{self.end_time:%H:%M}"
+
+    class Meta:
+        verbose_name = "Çalışma Saati"
+        verbose_name_plural = "Çalışma Saatleri"
+        ordering = ['psychologist', 'weekday', 'start_time']
+        constraints = [
+            models.CheckConstraint(condition=Q(start_time__lt=F('end_time')), name='working_hours_start_before_end'),
+        ]
+
+
+class PayoutStatement(models.Model):
+    """Psikoloğun aylık ödeme dökümü; statements.py ile üretilir"""
+    psychologist = models.ForeignKey(Psychologist, on_delete=models.CASCADE, related_name='payout_statements', verbose_name="Psikolog")
+    year = models.PositiveSmallIntegerField("Yıl")
+    month = models.PositiveSmallIntegerField("Ay")
+    # Döküm verisinin ve şablon sürümünün özeti; değişmemiş dökümler yeniden üretilmez
+    data_hash = models.CharField("Veri Özeti", max_length=64)
+    session_count = models.PositiveIntegerField("Yapılan Seans", default=0)
+    gross = models.DecimalField("Brüt Tutar", max_digits=14, decimal_places=2, default=0)
+    commission = models.DecimalField("Kesinti", max_digits=16, decimal_places=4, default=0)
+    net = models.DecimalField("Net Tutar", max_digits=16, decimal_places=4, default=0)
+    html = models.TextField("Döküm (HTML)")
+    generated_at = models.DateTimeField("Üretilme Tarihi", auto_now=True)
+
+    def __str__(self):
+        return f"{self.psychologist} - {self.month:02d}.{self.year}"
+
+    class Meta:
+        verbose_name = "Ödeme Dökümü"
+        verbose_name_plural = "Ödeme Dökümleri"
+        ordering = ['-year', '-month', 'psychologist']
+        constraints = [
+            models.UniqueConstraint(fields=['psychologist', 'year', 'month'], name='payout_statement_unique'),
+        ]
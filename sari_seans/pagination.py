@@ -0,0 +1,127 @@
+"""Seans listeleri için (date, id) anahtarlı keyset (cursor) sayfalama"""
+import base64
+import binascii
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(session):
+    """Seansın (date, id) ikilisini cursor'a çevir; values() satırları da kabul edilir"""
+    if isinstance(session, dict):
+        date, pk = session['date'], session['id']
+    else:
+        date, pk = session.date, session.pk
+    raw = f'{date.isoformat()}|{pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Cursor'ı (date, id) ikilisine çevir; geçersizse None döndür"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        date_str, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        date = parse_datetime(date_str)
+        pk = int(pk)
+    except (ValueError, UnicodeDecodeError, binascii.Error):
+        return None
+    if date is None:
+        return None
+    return date, pk
+
+
+def get_page_size(params):
+    """per_page parametresini ayarlardaki sınırlar içinde döndür"""
+    page_size = getattr(settings, 'SESSION_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    max_page_size = getattr(settings, 'SESSION_MAX_PAGE_SIZE', DEFAULT_MAX_PAGE_SIZE)
+    try:
+        page_size = int(params.get('per_page', page_size))
+    except ValueError:
+        pass
+    return max(1, min(page_size, max_page_size))
+
+
+class KeysetPage:
+    def __init__(self, items, params, has_next, has_previous):
+        self.items = items
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.params = params
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def _query(self, **cursor):
+        query = self.params.copy()
+        query.pop('after', None)
+        query.pop('before', None)
+        query.update(cursor)
+        return query.urlencode()
+
+    @property
+    def next_query(self):
+        """Sonraki (daha eski) sayfanın filtreleri koruyan query string'i"""
+        if not self.has_next:
+            return ''
+        return self._query(after=encode_cursor(self.items[-1]))
+
+    @property
+    def previous_query(self):
+        """Önceki (daha yeni) sayfanın filtreleri koruyan query string'i"""
+        if not self.has_previous:
+            return ''
+        return self._query(before=encode_cursor(self.items[0]))
+
+
+def _seek(queryset, params):
+    """Sayfa sorgusunu ve sonucu KeysetPage'e çevirmek için gereken durumu döndür"""
+    page_size = get_page_size(params)
+    after = decode_cursor(params.get('after', ''))
+    before = decode_cursor(params.get('before', '')) if after is None else None
+
+    if before is not None:
+        date, pk = before
+        # date__gte ilk koşul olarak indeks aralığını daraltır
+        query = (
+            queryset.filter(date__gte=date)
+            .filter(Q(date__gt=date) | Q(id__gt=pk))
+            .order_by('date', 'id')[:page_size + 1]
+        )
+        return query, (page_size, after, before)
+
+    if after is not None:
+        date, pk = after
+        queryset = queryset.filter(date__lte=date).filter(Q(date__lt=date) | Q(id__lt=pk))
+    return queryset.order_by('-date', '-id')[:page_size + 1], (page_size, after, before)
+
+
+def _page(rows, params, page_size, after, before):
+    if before is not None:
+        has_previous = len(rows) > page_size
+        items = rows[:page_size][::-1]
+        return KeysetPage(items, params, has_next=True, has_previous=has_previous)
+    return KeysetPage(rows[:page_size], params, has_next=len(rows) > page_size, has_previous=after is not None)
+
+
+def keyset_paginate(queryset, params):
+    """Queryset'i '-date', '-id' sırasıyla sayfala
+
+    after=<cursor> verilirse cursor'dan daha eski, before=<cursor> verilirse
+    daha yeni seanslar döner. Sorgu maliyeti tablo büyüklüğüne değil sayfa
+    boyutuna bağlıdır.
+    """
+    query, state = _seek(queryset, params)
+    return _page(list(query), params, *state)
+
+
+async def akeyset_paginate(queryset, params):
+    """keyset_paginate'in async ORM ile çalışan karşılığı"""
+    query, state = _seek(queryset, params)
+    return _page([row async for row in query], params, *state)
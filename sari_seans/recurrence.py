@@ -0,0 +1,213 @@
+"""Tekrarlayan seans serileri: seansların ileriye doğru üretilmesi ve toplu düzenlenmesi
+
+Seri oluşturulduğunda tüm tekrarlar yazılmaz; sadece SESSION_SERIES_WINDOW_DAYS
+gün içindeki seanslar bulk_create ile üretilir. Pencere materialize_series
+komutuyla (günlük zamanlanmış görev) ileri kaydırılır. Psikoloğun başka bir
+seansıyla çakışan tekrarlar üretilmez, atlanan tarihler raporlanır.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from .caching import bump_data_version
+from .conflicts import interval_conflicts
+from .earnings import refresh_months
+from .models import Session, SessionSeries
+
+DEFAULT_WINDOW_DAYS = 56
+
+INTERVALS = dict(SessionSeries.INTERVAL_CHOICES)
+
+
+class SeriesConflictError(ValueError):
+    pass
+
+# Seriden kopyalanan ve "bu ve sonraki seanslar"a uygulanabilen alanlar
+SERIES_FIELDS = ('client_name', 'duration', 'price', 'session_type', 'payment_method', 'extra_commission_rate', 'notes')
+
+
+def window_end(now=None):
+    """Seansların önceden üretileceği son zaman"""
+    days = getattr(settings, 'SESSION_SERIES_WINDOW_DAYS', DEFAULT_WINDOW_DAYS)
+    return (now or timezone.now()) + timedelta(days=days)
+
+
+def occurrence_date(series, index):
+    """Serinin index'inci tekrarının zamanı; saat yerel saate göre sabit kalır"""
+    start = timezone.localtime(series.start)
+    local = start.replace(tzinfo=None) + timedelta(weeks=series.interval_weeks * index)
+    return timezone.make_aware(local, start.tzinfo)
+
+
+def is_finished(series, index):
+    if series.occurrence_count is not None and index >= series.occurrence_count:
+        return True
+    return series.end_date is not None and timezone.localdate(occurrence_date(series, index)) > series.end_date
+
+
+def materialize_series(series, until=None):
+    """Serinin until zamanına kadar henüz üretilmemiş seanslarını oluştur; oluşturulanları döndür
+
+    Çakışan tekrarlar oluşturulmaz ama tekrar sayısından düşer; bunlar
+    series.skipped listesinde (tarih, çakışan seans) olarak bırakılır.
+    """
+    until = until or window_end()
+    if series.interval_weeks not in INTERVALS:
+        # Sıfır ya da negatif aralıkta tekrar tarihi hiç ilerlemez
+        raise ValueError(f'Geçersiz tekrar aralığı: {series.interval_weeks}')
+    index = series.generated_count
+    sessions = []
+    while not is_finished(series, index) and occurrence_date(series, index) <= until:
+        session = Session(
+            series=series,
+            expert_id=series.expert_id,
+            date=occurrence_date(series, index),
+            status='planned',
+            **{name: getattr(series, name) for name in SERIES_FIELDS},
+        )
+        session.set_ends_at()
+        sessions.append(session)
+        index += 1
+    conflicts = interval_conflicts(series.expert_id, [(session.date, session.ends_at) for session in sessions])
+    series.skipped = [(session.date, conflicts[session.date]) for session in sessions if session.date in conflicts]
+    sessions = [session for session in sessions if session.date not in conflicts]
+    finished = is_finished(series, index)
+    if not sessions and not finished and index == series.generated_count:
+        return []
+
+    with transaction.atomic():
+        # bulk_create save() ve sinyalleri çalıştırmaz; planlanan seansların snapshot'ı yoktur
+        Session.objects.bulk_create(sessions)
+        series.generated_count = index
+        if index > 0:
+            series.generated_until = occurrence_date(series, index - 1)
+        series.is_active = not finished
+        SessionSeries.objects.filter(pk=series.pk).update(
+            generated_count=series.generated_count,
+            generated_until=series.generated_until,
+            is_active=series.is_active,
+        )
+        refresh_months(session_month_key(session) for session in sessions)
+    transaction.on_commit(bump_data_version)
+    return sessions
+
+
+def session_month_key(session):
+    date = timezone.localtime(session.date)
+    return session.expert_id, date.year, date.month
+
+
+def start_series(session, interval_weeks, end_date=None, occurrence_count=None):
+    """Kaydedilmiş seansı serinin ilk tekrarı yap ve penceredeki sonraki tekrarları üret
+
+    Seans ile aynı transaction içinde çağrılmalıdır; seri oluşturulamazsa seans da geri alınır.
+    """
+    if interval_weeks not in INTERVALS:
+        raise ValueError(f'Geçersiz tekrar aralığı: {interval_weeks}')
+    if occurrence_count is not None and occurrence_count < 1:
+        raise ValueError('Tekrar sayısı en az 1 olmalı.')
+    # Formdan gelen tarih metin olabilir; veritabanındaki değer kullanılır
+    session.refresh_from_db(fields=['date'])
+    series = SessionSeries.objects.create(
+        expert_id=session.expert_id,
+        start=session.date,
+        interval_weeks=interval_weeks,
+        end_date=end_date,
+        occurrence_count=occurrence_count,
+        generated_count=1,
+        generated_until=session.date,
+        **{name: getattr(session, name) for name in SERIES_FIELDS},
+    )
+    Session.objects.filter(pk=session.pk).update(series=series)
+    session.series = series
+    materialize_series(series)
+    return series
+
+
+def extend_series(until=None, skipped=None):
+    """Aktif serilerin penceresini ileri kaydır; oluşturulan seans sayısını döndür
+
+    skipped listesi verilirse çakıştığı için atlanan tekrarlar (seri, tarih, çakışan seans) olarak eklenir.
+    """
+    until = until or window_end()
+    pending = SessionSeries.objects.filter(is_active=True).filter(
+        Q(generated_until__isnull=True) | Q(generated_until__lt=until)
+    )
+    count = 0
+    for series in pending:
+        count += len(materialize_series(series, until))
+        if skipped is not None:
+            skipped.extend((series, date, other) for date, other in series.skipped)
+    return count
+
+
+def _months(sessions):
+    return set(
+        sessions.annotate(year=ExtractYear('date'), month=ExtractMonth('date'))
+        .values_list('expert_id', 'year', 'month')
+        .distinct()
+        .order_by()
+    )
+
+
+def check_following(following, expert_id, shift, duration):
+    """Kaydırılmış/uzatılmış sonraki seanslar başka bir seansla çakışıyorsa SeriesConflictError fırlat"""
+    rows = list(following.values_list('pk', 'date'))
+    intervals = [(date + shift, date + shift + duration) for _, date in rows]
+    conflicts = interval_conflicts(expert_id, intervals, exclude_pks=[pk for pk, _ in rows])
+    if conflicts:
+        start = min(conflicts)
+        other = conflicts[start]
+        raise SeriesConflictError(
+            f'Sonraki seanslar güncellenmedi: {timezone.localtime(start):%d.%m.%Y %H:%M} tarihli seans '
+            f'{other.client_name} ({timezone.localtime(other.date):%d.%m.%Y %H:%M}) ile çakışıyor.'
+        )
+
+
+def update_following(session, previous_date, cancel=False):
+    """Seansın değişikliklerini serinin sonraki planlanmış seanslarına tek UPDATE ile uygula
+
+    Tarih değiştiyse sonraki seanslar aynı farkla kaydırılır. cancel=True ise
+    sonraki seanslar iptal edilir ve seri bu seanstan itibaren sonlandırılır.
+    Kaydırılan ya da uzatılan seanslardan biri psikoloğun başka bir seansıyla
+    çakışırsa hiçbir seans değiştirilmez ve SeriesConflictError fırlatılır.
+    Etkilenen seans sayısını döndürür.
+    """
+    if session.series_id is None:
+        return 0
+    # Formdan gelen tarih metin olabilir; kaydedilen değer kullanılır
+    session.refresh_from_db(fields=['date'])
+    following = Session.objects.filter(series_id=session.series_id, date__gt=previous_date, status='planned')
+    shift = session.date - previous_date
+    values = {name: getattr(session, name) for name in ('expert_id', *SERIES_FIELDS)}
+    values['updated_at'] = timezone.now()
+    if shift:
+        values['date'] = F('date') + shift
+    # Süre de değişmiş olabilir; bitiş zamanı yeni başlangıç ve süreden hesaplanır
+    values['ends_at'] = F('date') + (shift + timedelta(minutes=int(session.duration)))
+    if cancel:
+        values['status'] = 'canceled'
+    else:
+        check_following(following, session.expert_id, shift, timedelta(minutes=int(session.duration)))
+
+    with transaction.atomic():
+        months = _months(following)
+        count = following.update(**values)
+        months |= _months(Session.objects.filter(series_id=session.series_id, date__gt=session.date))
+
+        # Henüz üretilmemiş tekrarlar da yeni değerlerle üretilsin
+        series_values = {name: values[name] for name in ('expert_id', *SERIES_FIELDS)}
+        if shift:
+            series_values['start'] = F('start') + shift
+            series_values['generated_until'] = F('generated_until') + shift
+        if cancel:
+            series_values['is_active'] = False
+            series_values['end_date'] = timezone.localdate(session.date)
+        SessionSeries.objects.filter(pk=session.series_id).update(**series_values)
+        refresh_months(months)
+    transaction.on_commit(bump_data_version)
+    return count
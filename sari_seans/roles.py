@@ -0,0 +1,133 @@
+"""İstek başına bir kez çözülen kullanıcı rolü (admin, psikolog, asistan)
+
+RoleMiddleware her isteğe request.role ekler. Psikolog ve asistan kayıt
+ID'leri oturumda saklanır; Psychologist ya da Assistant kaydı değiştiğinde
+yenilenen rol sürümü (signals.py) eşleşmezse yeniden okunur. Böylece yetki
+kontrolleri ve şablonlar her sayfada veritabanına gitmez.
+"""
+import uuid
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.core.cache import cache
+from django.shortcuts import resolve_url
+
+from .models import Assistant, Psychologist
+
+ROLES_VERSION_KEY = 'sari_seans:roles_version'
+SESSION_KEY = '_sari_seans_role'
+
+
+class Role:
+    """Giriş yapan kullanıcının rolü; name None ise kullanıcının paneli yoktur"""
+
+    def __init__(self, is_superuser=False, psychologist_id=None, assistant_id=None):
+        self.psychologist_id = psychologist_id
+        self.assistant_id = assistant_id
+        self.is_admin = is_superuser
+        self.is_psychologist = psychologist_id is not None
+        self.is_assistant = assistant_id is not None
+
+    @property
+    def name(self):
+        """Panel seçiminde kullanılan öncelik sırasıyla rol adı"""
+        if self.is_admin:
+            return 'admin'
+        if self.is_psychologist:
+            return 'psychologist'
+        if self.is_assistant:
+            return 'assistant'
+        return None
+
+    def has(self, *names):
+        return any(getattr(self, f'is_{name}') for name in names)
+
+
+def get_roles_version():
+    """Güncel rol sürümünü döndür (yoksa rastgele bir sürümle başlat)"""
+    version = cache.get(ROLES_VERSION_KEY)
+    if version is None:
+        cache.add(ROLES_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(ROLES_VERSION_KEY)
+    return version
+
+
+def bump_roles_version():
+    """Oturumlarda saklanan rolleri geçersiz kıl
+
+    Sürüm sayaç değil rastgele bir değerdir: önbellek temizlenince ya da
+    yeniden başlatılınca eski bir sürüm tekrar üretilip iptal edilmiş bir
+    rolü geri getiremez. incr() yerine set() kullanıldığı için dosya tabanlı
+    önbellekte eşzamanlı artırmalar da birbirini ezmez.
+    """
+    cache.set(ROLES_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def resolve_role(request):
+    """request.user'ın rolünü oturumdan ya da (sürüm eşleşmezse) veritabanından çöz"""
+    user = request.user
+    if not user.is_authenticated:
+        return Role()
+    session = getattr(request, 'session', None)
+    version = get_roles_version()
+    stored = session.get(SESSION_KEY) if session is not None else None
+    if version is not None and stored and stored[:2] == [version, user.pk]:
+        psychologist_id, assistant_id = stored[2:]
+    else:
+        psychologist_id = Psychologist.objects.filter(user=user).values_list('pk', flat=True).first()
+        assistant_id = Assistant.objects.filter(user=user).values_list('pk', flat=True).first()
+        if session is not None:
+            session[SESSION_KEY] = [version, user.pk, psychologist_id, assistant_id]
+    # Süper kullanıcı bilgisi zaten her istekte okunan User kaydından gelir
+    return Role(user.is_superuser, psychologist_id, assistant_id)
+
+
+def get_role(request):
+    """Middleware'in eklediği rolü döndür; middleware'siz isteklerde (testler) çöz"""
+    if not hasattr(request, 'role'):
+        request.role = resolve_role(request)
+    return request.role
+
+
+class RoleMiddleware:
+    """AuthenticationMiddleware'den sonra request.role'ü ekler
+
+    Senkron middleware olduğu için ASGI altında da rol, async görünüme
+    geçmeden önce bir iş parçacığında çözülür.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.role = resolve_role(request)
+        return self.get_response(request)
+
+
+def role_required(*names):
+    """Giriş yapmış ve verilen rollerden birine sahip kullanıcıya izin ver; diğerlerini girişe yönlendir
+
+    login_required + user_passes_test ikilisinin yerine kullanılır ve async
+    görünümleri de destekler.
+    """
+    def decorator(view_func):
+        def redirect(request):
+            return redirect_to_login(request.get_full_path(), resolve_url(settings.LOGIN_URL))
+
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def wrapper(request, *args, **kwargs):
+                role = await sync_to_async(get_role)(request)
+                if not role.has(*names):
+                    return redirect(request)
+                return await view_func(request, *args, **kwargs)
+        else:
+            @wraps(view_func)
+            def wrapper(request, *args, **kwargs):
+                if not get_role(request).has(*names):
+                    return redirect(request)
+                return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
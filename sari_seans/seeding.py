@@ -0,0 +1,131 @@
+"""Kıyaslama (benchmark) ve deneme ortamları için sentetik veri üretimi"""
+import random
+from datetime import time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .earnings import rebuild_monthly_earnings
+from .models import Assistant, Psychologist, Session, WorkingHours
+
+SEED_PREFIX = 'seed_'
+SEED_ADMIN = f'{SEED_PREFIX}admin'
+SEED_ASSISTANT = f'{SEED_PREFIX}assistant'
+
+# Ölçek adı -> (psikolog sayısı, seans sayısı)
+SCALES = {
+    'small': (10, 10_000),
+    'medium': (100, 100_000),
+    'large': (1000, 1_000_000),
+}
+
+PRICES = [Decimal('500.00'), Decimal('750.00'), Decimal('1000.00'), Decimal('1250.50'), Decimal('0')]
+COMMISSION_RATES = [Decimal('40.00'), Decimal('45.00'), Decimal('50.00')]
+DURATIONS = [45, 50, 60, 90]
+# Hafta içi 09:00-18:00 (öğle arası hariç)
+WORKING_HOURS = [(time(9), time(12)), (time(13), time(18))]
+
+
+def ensure_admin():
+    """Kıyaslama için süper kullanıcıyı döndür (yoksa oluştur)"""
+    user, created = User.objects.get_or_create(
+        username=SEED_ADMIN, defaults={'is_superuser': True, 'is_staff': True},
+    )
+    return user
+
+
+def ensure_assistant():
+    """Kıyaslama için asistan kullanıcısını döndür (yoksa oluştur)"""
+    user, created = User.objects.get_or_create(username=SEED_ASSISTANT)
+    Assistant.objects.get_or_create(user=user)
+    return user
+
+
+def delete_seed_data():
+    """Sentetik kullanıcıları ve (CASCADE ile) onlara bağlı kayıtları sil
+
+    Milyonlarca seans için seans başına sinyal çalışmasın diye seanslar tek
+    DELETE sorgusuyla silinir. Sinyaller atlandığı için bu psikologların özet
+    satırları ardından yeniden hesaplanır; rebuild_monthly_earnings() veri
+    sürümünü de artırır.
+    """
+    seed_psychologists = Psychologist.objects.filter(user__username__startswith=SEED_PREFIX).values('pk')
+    subquery, params = seed_psychologists.query.sql_with_params()
+    quote = connection.ops.quote_name
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {quote(Session._meta.db_table)} "
+                f"WHERE {quote(Session._meta.get_field('expert').column)} IN ({subquery})",
+                params,
+            )
+        rebuild_monthly_earnings(list(seed_psychologists.values_list('pk', flat=True)))
+        return User.objects.filter(username__startswith=SEED_PREFIX).delete()
+
+
+def ensure_psychologists(count):
+    """En az `count` adet sentetik psikolog olmasını sağla ve listesini döndür"""
+    existing = list(
+        Psychologist.objects.filter(user__username__startswith=f'{SEED_PREFIX}psy')
+        .order_by('id')[:count]
+    )
+    missing = count - len(existing)
+    if missing > 0:
+        start = Psychologist.objects.filter(user__username__startswith=f'{SEED_PREFIX}psy').count()
+        with transaction.atomic():
+            users = User.objects.bulk_create([
+                User(username=f'{SEED_PREFIX}psy{start + i}', first_name='Psikolog', last_name=str(start + i))
+                for i in range(missing)
+            ])
+            # SQLite bulk_create sonrası pk döndürür; diğer veritabanlarında yeniden oku
+            users = User.objects.filter(username__in=[user.username for user in users])
+            rnd = random.Random(start)
+            created = Psychologist.objects.bulk_create([
+                Psychologist(user=user, commission_rate=rnd.choice(COMMISSION_RATES))
+                for user in users
+            ])
+            WorkingHours.objects.bulk_create([
+                WorkingHours(psychologist=psychologist, weekday=weekday, start_time=start_time, end_time=end_time)
+                for psychologist in created
+                for weekday in range(5)
+                for start_time, end_time in WORKING_HOURS
+            ])
+            existing += created
+    return existing
+
+
+def seed_sessions(count, psychologists, days=3 * 365, batch_size=5000, seed=0):
+    """Son `days` güne yayılmış `count` adet rastgele seans oluştur
+
+    Seanslar bulk_create ile eklendiği için sinyaller çalışmaz; çağıran taraf
+    gerekirse rebuild_monthly_earnings() ile özet tabloyu yenilemelidir.
+    """
+    rnd = random.Random(seed)
+    now = timezone.now().replace(minute=0, second=0, microsecond=0)
+    statuses = ['done'] * 6 + ['planned'] * 3 + ['canceled']
+    session_types = [choice for choice, _ in Session.SESSION_TYPE_CHOICES]
+    payment_methods = [choice for choice, _ in Session.PAYMENT_METHOD_CHOICES]
+
+    created = 0
+    while created < count:
+        batch = []
+        for i in range(min(batch_size, count - created)):
+            batch.append(Session(
+                expert=rnd.choice(psychologists),
+                client_name=f'Danışan {created + i}',
+                date=now - timedelta(days=rnd.randint(-30, days), hours=rnd.randint(0, 10)),
+                duration=rnd.choice(DURATIONS),
+                price=rnd.choice(PRICES),
+                session_type=rnd.choice(session_types),
+                payment_method=rnd.choice(payment_methods),
+                status=rnd.choice(statuses),
+            ))
+        for session in batch:
+            if session.status == 'done':
+                session.take_commission_snapshot()
+        with transaction.atomic():
+            Session.objects.bulk_create(batch)
+        created += len(batch)
+    return created
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .caching import bump_data_version
+from .earnings import refresh_month, session_month
+from .models import (
+    Assistant, PaymentMethodCommission, Psychologist, Session, SessionTypeCommission, clear_commission_rate_cache,
+)
+from .roles import bump_roles_version
+
+
+@receiver([post_save, post_delete], sender=SessionTypeCommission)
+@receiver([post_save, post_delete], sender=PaymentMethodCommission)
+def commission_rate_changed(sender, **kwargs):
+    """Ek kesinti oranı değiştiğinde oran önbelleğini temizle
+
+    Tamamlanmış seanslar oranları kendi kolonlarında sakladığı için özet
+    tablonun yeniden hesaplanmasına gerek yoktur.
+    """
+    clear_commission_rate_cache()
+
+
+@receiver(pre_save, sender=Session)
+@receiver(pre_delete, sender=Session)
+def remember_session_month(sender, instance, **kwargs):
+    """Değişiklikten önce seansın ait olduğu ayı sakla"""
+    instance._month_before = session_month(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=Session)
+@receiver(post_delete, sender=Session)
+def refresh_session_month(sender, instance, **kwargs):
+    """Seansın eski ve yeni ayına ait özet satırlarını güncelle"""
+    months = {getattr(instance, '_month_before', None)}
+    if kwargs['signal'] is post_save:
+        months.add(session_month(instance.pk))
+    for key in months - {None}:
+        refresh_month(*key)
+
+
+@receiver([post_save, post_delete], sender=Psychologist)
+@receiver([post_save, post_delete], sender=Assistant)
+def role_changed(sender, created=True, **kwargs):
+    """Psikolog/asistan kaydı eklenince ya da silinince oturumlarda saklanan rolleri geçersiz kıl"""
+    # Oran/telefon gibi alan güncellemeleri rolü değiştirmez
+    if created:
+        transaction.on_commit(bump_roles_version)
+
+
+@receiver([post_save, post_delete], sender=Session)
+@receiver([post_save, post_delete], sender=Psychologist)
+@receiver([post_save, post_delete], sender=Assistant)
+@receiver([post_save, post_delete], sender=SessionTypeCommission)
+@receiver([post_save, post_delete], sender=PaymentMethodCommission)
+def data_changed(sender, **kwargs):
+    """Dashboard önbelleğinin eski sürümle saklanan istatistiklerini geçersiz kıl
+
+    Sürüm transaction tamamlandıktan sonra artırılır; aksi halde araya giren bir
+    istek henüz commit edilmemiş eski veriyi yeni sürümle önbelleğe yazabilir.
+    """
+    transaction.on_commit(bump_data_version)
+
+
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Yeni SQLite bağlantısına settings.SQLITE_PRAGMAS ayarlarını uygula"""
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', None)
+    if connection.vendor != 'sqlite' or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
@@ -0,0 +1,128 @@
+"""Eşik süresini aşan SQL sorgularının sorgu planıyla birlikte kaydı
+
+SEANS_SLOW_QUERY_MS ayarlandığında SlowQueryMiddleware her istekte
+veritabanı bağlantılarına log_slow_queries sarmalayıcısını ekler. Eşiği aşan
+SELECT sorguları; SQL, parametreler, süre, çağıran görünüm ve EXPLAIN QUERY
+PLAN çıktısıyla SLOW_QUERY_LOG dosyasına tek satır JSON olarak yazılır. Dosya
+SLOW_QUERY_LOG_MAX_BYTES boyutuna ulaşınca döndürülür (.1, .2, ...). En çok
+süre harcayan sorgular slow_queries komutuyla özetlenir.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.utils import timezone
+
+logger = logging.getLogger('sari_seans.slow_queries')
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_request = ContextVar('sari_seans_slow_query_request', default=None)
+_explaining = ContextVar('sari_seans_explaining', default=False)
+_lock = threading.Lock()
+_handler = None
+
+# Aynı sorgunun planı her yavaş çalışmada yeniden çıkarılmasın
+_plans = {}
+MAX_CACHED_PLANS = 500
+
+
+def get_handler():
+    """SLOW_QUERY_LOG dosyasına yazan döner dosya handler'ı (ayar değişirse yeniden açılır)"""
+    global _handler
+    path = os.path.abspath(settings.SLOW_QUERY_LOG)
+    with _lock:
+        if _handler is None or _handler.baseFilename != path:
+            if _handler is not None:
+                logger.removeHandler(_handler)
+                _handler.close()
+            _handler = RotatingFileHandler(
+                path, maxBytes=settings.SLOW_QUERY_LOG_MAX_BYTES, backupCount=settings.SLOW_QUERY_LOG_BACKUPS,
+                encoding='utf-8', delay=True,
+            )
+            _handler.setFormatter(logging.Formatter('%(message)s'))
+            logger.addHandler(_handler)
+    return _handler
+
+
+def explain_plan(connection, sql, params):
+    """SELECT sorgusunun plan satırları; plan çıkarılamıyorsa None"""
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    key = (connection.alias, sql)
+    if key in _plans:
+        return _plans[key]
+    token = _explaining.set(True)
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            plan = [str(row[-1]) for row in cursor.fetchall()]
+    except DatabaseError:
+        plan = None
+    finally:
+        _explaining.reset(token)
+    if len(_plans) >= MAX_CACHED_PLANS:
+        _plans.clear()
+    _plans[key] = plan
+    return plan
+
+
+def log_slow_query(connection, sql, params, many, duration):
+    request = _request.get()
+    match = getattr(request, 'resolver_match', None)
+    entry = {
+        'time': timezone.now().isoformat(),
+        'duration_ms': round(duration * 1000, 2),
+        'view': match.view_name if match else None,
+        'path': request.get_full_path() if request is not None else None,
+        'sql': sql,
+        # executemany parametreleri satır sayısı kadar uzun olabilir
+        'params': None if many else params,
+        'plan': None if many else explain_plan(connection, sql, params),
+    }
+    get_handler()
+    logger.info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """connection.execute_wrapper ile eklenen, SLOW_QUERY_MS'yi aşan sorguları kaydeden sarmalayıcı"""
+    threshold = settings.SLOW_QUERY_MS
+    if threshold is None or _explaining.get():
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    result = execute(sql, params, many, context)
+    duration = time.perf_counter() - start
+    if duration * 1000 >= threshold:
+        log_slow_query(context['connection'], sql, params, many, duration)
+    return result
+
+
+@contextmanager
+def capture_slow_queries(request=None):
+    """Blok içinde tüm bağlantılarda çalışan yavaş sorguları kaydet"""
+    token = _request.set(request)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(log_slow_queries))
+            yield
+    finally:
+        _request.reset(token)
+
+
+class SlowQueryMiddleware:
+    """İstek boyunca yavaş sorguları kaydeder (SEANS_SLOW_QUERY_MS ile settings'e eklenir)"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with capture_slow_queries(request):
+            return self.get_response(request)
@@ -0,0 +1,18 @@
+"""Ödeme dökümlerini işleyen süreç havuzu fonksiyonları
+
+spawn ile başlayan süreçler bu modülü Django hazırlanmadan içe aktarır; bu
+yüzden burada modeller ve Django'nun uygulama kaydına ihtiyaç duyan
+modüller en üstte içe aktarılmaz.
+"""
+STATEMENT_TEMPLATE = 'payout_statement.html'
+
+
+def init_worker():
+    """Süreç havuzundaki her süreçte Django'yu bir kez hazırla"""
+    import django
+    django.setup()
+
+
+def render_statement(context):
+    from django.template.loader import render_to_string
+    return render_to_string(STATEMENT_TEMPLATE, context)
@@ -0,0 +1,172 @@
+"""Psikologların aylık ödeme dökümleri (yazdırılabilir / PDF'e hazır HTML)
+
+Ayın tüm dökümlerinin verisi iki sorguyla (seanslar ve psikologlar) okunur.
+Her dökümün verisinden bir özet (data_hash) hesaplanır; kayıtlı özeti aynı
+olan dökümler atlanır. Kalan dökümler çok sayıdaysa şablonlar bir süreç
+havuzunda işlenir, sonuçlar tek upsert sorgusuyla PayoutStatement'a yazılır.
+"""
+import hashlib
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from multiprocessing import get_context
+
+from django.utils import timezone
+
+from .earnings import month_range
+from .models import PayoutStatement, Psychologist, Session
+from .statement_worker import init_worker, render_statement
+
+# Şablon değiştiğinde artırılır; böylece verisi değişmemiş dökümler de yeniden üretilir
+TEMPLATE_VERSION = 1
+
+# Bundan az döküm süreç havuzu açmadan işlenir (süreç başlatma maliyeti daha yüksek)
+POOL_THRESHOLD = 20
+
+MONTH_NAMES = [
+    'Ocak', 'Şubat', 'Mart', 'Nisan', 'Mayıs', 'Haziran',
+    'Temmuz', 'Ağustos', 'Eylül', 'Ekim', 'Kasım', 'Aralık',
+]
+
+ZERO = Decimal('0')
+
+SESSION_FIELDS = (
+    'expert_id', 'date', 'client_name', 'duration', 'price', 'session_type', 'payment_method', 'status',
+    'extra_commission_rate', 'snapshot_expert_rate', 'snapshot_session_type_rate',
+    'snapshot_payment_method_rate', 'snapshot_commission', 'snapshot_net',
+)
+
+
+def previous_month(today=None):
+    """Ödemesi hazırlanacak ay: bir önceki ay (yıl, ay)"""
+    today = today or timezone.localdate()
+    if today.month == 1:
+        return today.year - 1, 12
+    return today.year, today.month - 1
+
+
+def percent(amount, rate):
+    return amount * (rate or ZERO) / 100
+
+
+def session_line(row):
+    """Yapılan seansın döküm satırı; oranlar seans tamamlandığında kaydedilen değerlerdir"""
+    price = row['price']
+    rates = {
+        'expert': row['snapshot_expert_rate'] or ZERO,
+        'extra': row['extra_commission_rate'] or ZERO,
+        'session_type': row['snapshot_session_type_rate'] or ZERO,
+        'payment_method': row['snapshot_payment_method_rate'] or ZERO,
+    }
+    return {
+        'date': timezone.localtime(row['date']),
+        'client_name': row['client_name'],
+        'duration': row['duration'],
+        'session_type': dict(Session.SESSION_TYPE_CHOICES).get(row['session_type'], row['session_type']),
+        'payment_method': dict(Session.PAYMENT_METHOD_CHOICES).get(row['payment_method'], row['payment_method']),
+        'price': price,
+        'rates': rates,
+        'total_rate': sum(rates.values()),
+        'amounts': {name: percent(price, rate) for name, rate in rates.items()},
+        'commission': row['snapshot_commission'] or ZERO,
+        'net': row['snapshot_net'] if row['snapshot_net'] is not None else price,
+    }
+
+
+def statement_contexts(year, month, psychologist_ids=None):
+    """Ayda seansı olan psikologların döküm verisini toplu oku; {psikolog_id: context}"""
+    start, end = month_range(year, month)
+    sessions = Session.objects.filter(date__gte=start, date__lt=end)
+    if psychologist_ids is not None:
+        sessions = sessions.filter(expert_id__in=psychologist_ids)
+    by_psychologist = defaultdict(list)
+    for row in sessions.order_by('expert_id', 'date', 'id').values(*SESSION_FIELDS):
+        by_psychologist[row['expert_id']].append(row)
+    if not by_psychologist:
+        return {}
+
+    psychologists = Psychologist.objects.filter(pk__in=by_psychologist).select_related('user')
+    contexts = {}
+    for psychologist in psychologists:
+        rows = by_psychologist[psychologist.pk]
+        lines = [session_line(row) for row in rows if row['status'] == 'done']
+        contexts[psychologist.pk] = {
+            'psychologist': {
+                'id': psychologist.pk,
+                'name': str(psychologist),
+                'email': psychologist.user.email,
+                'phone': psychologist.phone,
+            },
+            'year': year,
+            'month': month,
+            'month_name': MONTH_NAMES[month - 1],
+            'sessions': lines,
+            'planned_count': sum(1 for row in rows if row['status'] == 'planned'),
+            'canceled_count': sum(1 for row in rows if row['status'] == 'canceled'),
+            'totals': {
+                'session_count': len(lines),
+                'gross': sum((line['price'] for line in lines), ZERO),
+                'commission': sum((line['commission'] for line in lines), ZERO),
+                'net': sum((line['net'] for line in lines), ZERO),
+            },
+            'breakdown': {
+                name: sum((line['amounts'][name] for line in lines), ZERO)
+                for name in ('expert', 'extra', 'session_type', 'payment_method')
+            },
+        }
+    return contexts
+
+
+def data_hash(context):
+    raw = json.dumps(context, sort_keys=True, default=str)
+    return hashlib.sha256(f'{TEMPLATE_VERSION}|{raw}'.encode()).hexdigest()
+
+
+def render_statements(contexts, workers=None, pool_threshold=POOL_THRESHOLD):
+    """Dökümleri sırasıyla işle; çok sayıdaysa süreç havuzunda"""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(contexts) < pool_threshold:
+        return [render_statement(context) for context in contexts]
+    # fork yerine spawn: çok iş parçacıklı sunucu sürecinin kilitleri ve DB bağlantısı kopyalanmaz
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'), initializer=init_worker) as pool:
+        return list(pool.map(render_statement, contexts, chunksize=max(1, len(contexts) // (workers * 4))))
+
+
+def generate_statements(year, month, psychologist_ids=None, workers=None, force=False,
+                        pool_threshold=POOL_THRESHOLD):
+    """Ayın dökümlerini üret; (üretilen, atlanan) sayılarını döndür
+
+    force=True ise verisi değişmemiş dökümler de yeniden üretilir.
+    """
+    contexts = statement_contexts(year, month, psychologist_ids)
+    existing = dict(
+        PayoutStatement.objects.filter(year=year, month=month, psychologist_id__in=contexts)
+        .values_list('psychologist_id', 'data_hash')
+    )
+    pending = []
+    for psychologist_id, context in contexts.items():
+        digest = data_hash(context)
+        if force or existing.get(psychologist_id) != digest:
+            pending.append((psychologist_id, context, digest))
+    if not pending:
+        return 0, len(contexts)
+
+    htmls = render_statements([context for _, context, _ in pending], workers, pool_threshold)
+    now = timezone.now()
+    PayoutStatement.objects.bulk_create(
+        [
+            PayoutStatement(
+                psychologist_id=psychologist_id, year=year, month=month, data_hash=digest, html=html,
+                session_count=context['totals']['session_count'], gross=context['totals']['gross'],
+                commission=context['totals']['commission'], net=context['totals']['net'], generated_at=now,
+            )
+            for (psychologist_id, context, digest), html in zip(pending, htmls)
+        ],
+        batch_size=200,
+        update_conflicts=True,
+        unique_fields=['psychologist', 'year', 'month'],
+        update_fields=['data_hash', 'html', 'session_count', 'gross', 'commission', 'net', 'generated_at'],
+    )
+    return len(pending), len(contexts) - len(pending)
@@ -1,3 +1,1309 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import re
+import tempfile
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from functools import partial
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count, Q, Sum
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import async_views, views
+from .availability import free_slots
+from .caching import DATA_VERSION_KEY, bump_data_version, get_data_version
+from .conflicts import conflict_message, find_conflicts, overlapping_sessions
+from .earnings import grouped_earnings, month_range, rebuild_monthly_earnings, set_session_status
+from .export import EXPORT_HEADER
+from .importer import import_sessions
+from .metrics import reset_metrics
+from .models import (
+    Assistant, MonthlyEarnings, PaymentMethodCommission, PayoutStatement, Psychologist, Session, SessionSeries,
+    SessionTypeCommission, WorkingHours, clear_commission_rate_cache, get_commission_rates,
+)
+from .recurrence import extend_series, start_series, update_following
+from .seeding import delete_seed_data
+from .statements import generate_statements, render_statements, statement_contexts
+from .trends import cached_session_trends, session_trends
+
+
+def local(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class ListingQueryCountTests(TestCase):
+    """Liste sayfalarının sorgu sayısı satır sayısından bağımsız olmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        SessionTypeCommission.objects.create(session_type='online', rate=Decimal('5'))
+        PaymentMethodCommission.objects.create(payment_method='credit_card', rate=Decimal('2.5'))
+
+        cls.psychologists = [
+            Psychologist.objects.create(user=User.objects.create_user(f'psikolog{i}', first_name=f'Psikolog {i}'))
+            for i in range(3)
+        ]
+        now = timezone.now()
+        sessions = []
+        for i in range(30):
+            sessions.append(Session(
+                expert=cls.psychologists[i % 3],
+                client_name=f'Danışan {i}',
+                date=now - timedelta(days=i),
+                price=Decimal('500'),
+                session_type='online' if i % 2 else 'face_to_face',
+                payment_method='credit_card' if i % 3 else 'cash',
+                status='done' if i % 4 else 'planned',
+            ))
+        Session.objects.bulk_create(sessions)
+
+    def setUp(self):
+        # Süreç içi oran önbelleği testler arasında taşınmasın
+        clear_commission_rate_cache()
+
+    def assertPageQueries(self, user, url, num):
+        self.client.force_login(user)
+        # İlk istek rolü çözüp oturuma yazar; ölçülen, sonraki isteklerdir
+        self.client.get(url)
+        clear_commission_rate_cache()
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_manage_sessions(self):
+        self.assertPageQueries(self.admin, reverse('manage_sessions'), 6)
+
+    def test_assistant_manage_sessions(self):
+        self.assertPageQueries(self.assistant.user, reverse('assistant_manage_sessions'), 4)
+
+    def test_my_sessions(self):
+        self.assertPageQueries(self.psychologists[0].user, reverse('my_sessions'), 7)
+
+    def test_manage_psychologists(self):
+        self.assertPageQueries(self.admin, reverse('manage_psychologists'), 6)
+
+    def test_session_admin_changelist(self):
+        self.assertPageQueries(self.admin, reverse('admin:sari_seans_session_changelist'), 10)
+
+    def test_data_version_read_once_per_request(self):
+        self.client.force_login(self.admin)
+        url = reverse('manage_sessions')
+        self.client.get(url)
+        clear_commission_rate_cache()
+        get = cache.get
+        with mock.patch.object(cache, 'get', side_effect=get) as cache_get:
+            self.client.get(url)
+        reads = [call for call in cache_get.call_args_list if call.args[0] == DATA_VERSION_KEY]
+        self.assertEqual(len(reads), 1)
+
+    def test_invalid_filters_ignored(self):
+        self.client.force_login(self.admin)
+        url = reverse('manage_sessions')
+        unfiltered = [session.pk for session in self.client.get(url).context['sessions']]
+        for params in ({'month': '13'}, {'month': 'abc', 'year': 'x'}, {'year': '0'}, {'psychologist': 'x'}):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([session.pk for session in response.context['sessions']], unfiltered)
+        # Geçerli yıl korunur, geçersiz ay yok sayılır
+        response = self.client.get(url, {'month': '13', 'year': '2000'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['sessions']), [])
+
+
+class KeysetPaginationTests(TestCase):
+    """Cursor sayfaları ileri ve geri gezilebilmeli, filtreler korunmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologists = [Psychologist.objects.create(user=User.objects.create_user(f'psikolog{i}')) for i in range(2)]
+        base = local(2024, 3, 1, 10)
+        Session.objects.bulk_create([
+            # Her iki seans aynı saatte: sıralama id ile belirlenmeli
+            Session(
+                expert=cls.psychologists[i % 2], client_name=f'Danışan {i}', date=base + timedelta(hours=i // 4),
+                price=Decimal('500'), status='planned',
+            )
+            for i in range(24)
+        ])
+        cls.expected = list(
+            Session.objects.filter(expert=cls.psychologists[0]).order_by('-date', '-id').values_list('pk', flat=True)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def get_page(self, query):
+        response = self.client.get(f"{reverse('manage_sessions')}?{query}")
+        self.assertEqual(response.status_code, 200)
+        return response.context['page']
+
+    def test_walk_forward_and_back_with_filters(self):
+        query = f'psychologist={self.psychologists[0].pk}&status=planned&per_page=5'
+        pages = [self.get_page(query)]
+        self.assertFalse(pages[0].has_previous)
+        while pages[-1].has_next:
+            query = pages[-1].next_query
+            self.assertIn(f'psychologist={self.psychologists[0].pk}', query)
+            self.assertIn('status=planned', query)
+            pages.append(self.get_page(query))
+        forward = [[session.pk for session in page] for page in pages]
+        self.assertEqual([pk for page in forward for pk in page], self.expected)
+        self.assertEqual([len(page) for page in forward], [5, 5, 2])
+
+        backward = [forward[-1]]
+        page = pages[-1]
+        while page.has_previous:
+            page = self.get_page(page.previous_query)
+            backward.append([session.pk for session in page])
+        self.assertEqual(backward[::-1], forward)
+
+    def test_invalid_cursor_starts_from_first_page(self):
+        page = self.get_page(f'psychologist={self.psychologists[0].pk}&per_page=5&after=bozuk')
+        self.assertEqual([session.pk for session in page], self.expected[:5])
+        self.assertFalse(page.has_previous)
+
+
+class CommissionSnapshotTests(TestCase):
+    """Tamamlanan seansın kesintisi sonraki oran değişikliklerinden etkilenmemeli"""
+
+    def setUp(self):
+        clear_commission_rate_cache()
+        self.rate = SessionTypeCommission.objects.create(session_type='online', rate=Decimal('5'))
+        self.psychologist = Psychologist.objects.create(
+            user=User.objects.create_user('psikolog'), commission_rate=Decimal('40'),
+        )
+        self.session = Session.objects.create(
+            expert=self.psychologist, client_name='Danışan', date=timezone.now(),
+            price=Decimal('1000'), session_type='online', status='planned',
+        )
+
+    def complete(self):
+        self.session.status = 'done'
+        self.session.save()
+        self.session.refresh_from_db()
+
+    def test_snapshot_taken_when_done(self):
+        self.assertIsNone(self.session.snapshot_commission)
+        self.complete()
+        self.assertEqual(self.session.snapshot_expert_rate, Decimal('40'))
+        self.assertEqual(self.session.snapshot_session_type_rate, Decimal('5'))
+        self.assertEqual(self.session.snapshot_commission, Decimal('450'))
+        self.assertEqual(self.session.snapshot_net, Decimal('550'))
+
+    def test_rate_changes_keep_history(self):
+        self.complete()
+        self.psychologist.commission_rate = Decimal('60')
+        self.psychologist.save()
+        self.rate.rate = Decimal('10')
+        self.rate.save()
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.commission_amount, Decimal('450'))
+        self.assertEqual(MonthlyEarnings.objects.totals()['commission'], Decimal('450'))
+        self.assertEqual(Session.objects.commission_totals()['net'], Decimal('550'))
+
+    def test_price_edit_and_status_change(self):
+        self.complete()
+        self.session.price = Decimal('2000')
+        self.session.save()
+        self.assertEqual(self.session.snapshot_commission, Decimal('900'))
+
+        self.session.status = 'canceled'
+        self.session.save()
+        self.session.refresh_from_db()
+        self.assertIsNone(self.session.snapshot_commission)
+        self.assertEqual(self.session.commission_amount, 0)
+
+    def test_rate_cache_follows_shared_data_version(self):
+        self.assertEqual(get_commission_rates()['session_type']['online'], Decimal('5'))
+        # Başka bir worker'daki değişiklik: bu süreçte sinyal çalışmaz, sadece sürüm artar
+        SessionTypeCommission.objects.filter(pk=self.rate.pk).update(rate=Decimal('7'))
+        self.assertEqual(get_commission_rates()['session_type']['online'], Decimal('5'))
+        bump_data_version()
+        self.assertEqual(get_commission_rates()['session_type']['online'], Decimal('7'))
+
+
+class MonthlyEarningsTests(TestCase):
+    """Özet tablo kaydetme, silme ve ay değişikliğinden sonra seanslarla aynı kalmalı"""
+
+    def setUp(self):
+        clear_commission_rate_cache()
+        self.psychologist = Psychologist.objects.create(
+            user=User.objects.create_user('psikolog'), commission_rate=Decimal('40'),
+        )
+
+    def add_session(self, date, price='1000', status='done'):
+        return Session.objects.create(
+            expert=self.psychologist, client_name='Danışan', date=date, price=Decimal(price), status=status,
+        )
+
+    def assertRollupMatchesSessions(self):
+        fields = ('psychologist_id', 'year', 'month', 'status', 'session_count', 'gross', 'commission', 'net')
+        rollup = set(MonthlyEarnings.objects.values_list(*fields))
+        raw = {
+            (row['expert_id'], row['year'], row['month'], row['status'], row['session_count'],
+             row['gross'] or 0, row['commission'] or 0, row['net'] or 0)
+            for row in grouped_earnings(Session.objects.all())
+        }
+        self.assertEqual(rollup, raw)
+        return rollup
+
+    def test_save_delete_and_month_move(self):
+        first = self.add_session(local(2024, 3, 10, 10))
+        self.add_session(local(2024, 3, 12, 10), price='500', status='planned')
+        self.add_session(local(2024, 4, 2, 10))
+        self.assertEqual(len(self.assertRollupMatchesSessions()), 3)
+
+        first.price = Decimal('2000')
+        first.save()
+        self.assertRollupMatchesSessions()
+
+        # Ay sınırı yerel saate göre: 31 Mart 23:30 İstanbul hâlâ Mart
+        first.date = local(2024, 3, 31, 23, 30)
+        first.save()
+        self.assertEqual(MonthlyEarnings.objects.get(year=2024, month=3, status='done').gross, Decimal('2000'))
+
+        first.date = local(2024, 4, 20, 10)
+        first.save()
+        rollup = self.assertRollupMatchesSessions()
+        self.assertNotIn('done', {row[3] for row in rollup if row[1:3] == (2024, 3)})
+        self.assertEqual(MonthlyEarnings.objects.get(year=2024, month=4, status='done').session_count, 2)
+
+        first.delete()
+        self.assertRollupMatchesSessions()
+        Session.objects.all().delete()
+        self.assertFalse(MonthlyEarnings.objects.exists())
+
+    def test_rebuild_matches_signal_maintained_rows(self):
+        for day in (1, 15, 28):
+            self.add_session(local(2024, 2, day, 9))
+        self.add_session(local(2024, 5, 1, 0, 30), status='canceled')
+        before = self.assertRollupMatchesSessions()
+        self.assertEqual(rebuild_monthly_earnings(), 2)
+        self.assertEqual(self.assertRollupMatchesSessions(), before)
+
+
+class DashboardStatsTests(TestCase):
+    """Dashboard'daki psikolog istatistikleri ham seans toplamlarıyla aynı olmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        SessionTypeCommission.objects.create(session_type='online', rate=Decimal('5'))
+        cls.psychologists = [
+            Psychologist.objects.create(user=User.objects.create_user(f'psikolog{i}'), commission_rate=rate)
+            for i, rate in enumerate((Decimal('40'), Decimal('25'), Decimal('50')))
+        ]
+        clear_commission_rate_cache()
+        statuses = ('done', 'planned', 'canceled', 'done')
+        for i in range(24):
+            Session.objects.create(
+                expert=cls.psychologists[i % 2], client_name=f'Danışan {i}',
+                date=local(2024, 3 + i % 3, 1 + i, 10), price=Decimal(300 + 25 * i),
+                session_type='online' if i % 2 else 'face_to_face', status=statuses[i % 4],
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def raw_stats(self, sessions):
+        done = Q(status='done')
+        totals = sessions.aggregate(
+            count=Count('id'), revenue=Sum('price', filter=done),
+            commission=Sum('snapshot_commission'), net=Sum('snapshot_net'),
+        )
+        return {name: value or 0 for name, value in totals.items()}
+
+    def test_matches_raw_session_aggregates(self):
+        response = self.client.get(reverse('admin_dashboard'), {'month': 4, 'year': 2024})
+        context = response.context
+        start, end = month_range(2024, 4)
+
+        overall = self.raw_stats(Session.objects.all())
+        self.assertEqual(context['total_sessions'], overall['count'])
+        self.assertEqual(context['total_revenue'], overall['revenue'])
+        self.assertEqual(context['total_commission'], overall['commission'])
+        monthly = self.raw_stats(Session.objects.filter(date__gte=start, date__lt=end))
+        self.assertEqual(context['monthly_sessions_count'], monthly['count'])
+        self.assertEqual(context['monthly_revenue'], monthly['revenue'])
+        self.assertEqual(context['monthly_net'], monthly['net'])
+
+        stats = {stat['psychologist'].pk: stat for stat in context['psychologist_stats']}
+        self.assertEqual(set(stats), {p.pk for p in self.psychologists})
+        for psychologist in self.psychologists:
+            sessions = Session.objects.filter(expert=psychologist)
+            overall = self.raw_stats(sessions)
+            monthly = self.raw_stats(sessions.filter(date__gte=start, date__lt=end))
+            stat = stats[psychologist.pk]
+            self.assertEqual(stat['total_sessions'], overall['count'])
+            self.assertEqual(stat['total_earnings'], overall['revenue'])
+            self.assertEqual(stat['commission_amount'], overall['commission'])
+            self.assertEqual(stat['net_earnings'], overall['net'])
+            self.assertEqual(stat['monthly_sessions'], monthly['count'])
+            self.assertEqual(stat['monthly_earnings'], monthly['revenue'])
+            self.assertEqual(stat['monthly_commission'], monthly['commission'])
+            self.assertEqual(stat['monthly_net'], monthly['net'])
+
+
+class ExportTests(TestCase):
+    """CSV dışa aktarımı kesinti kolonlarını hesaplamalı ve liste filtrelerini uygulamalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        SessionTypeCommission.objects.create(session_type='online', rate=Decimal('5'))
+        PaymentMethodCommission.objects.create(payment_method='credit_card', rate=Decimal('2.5'))
+        cls.psychologist = Psychologist.objects.create(
+            user=User.objects.create_user('psikolog', first_name='Ayşe', last_name='Yılmaz'),
+            commission_rate=Decimal('40'),
+        )
+        cls.other = Psychologist.objects.create(user=User.objects.create_user('diger'))
+        clear_commission_rate_cache()
+        cls.done = Session.objects.create(
+            expert=cls.psychologist, client_name='Danışan A', date=local(2024, 3, 5, 14), price=Decimal('1000'),
+            session_type='online', payment_method='credit_card', status='done', extra_commission_rate=Decimal('1'),
+        )
+        cls.planned = Session.objects.create(
+            expert=cls.psychologist, client_name='Danışan B', date=local(2024, 4, 1, 9), price=Decimal('800'),
+        )
+        Session.objects.create(expert=cls.other, client_name='Danışan C', date=local(2024, 3, 6, 9), price=Decimal('500'))
+
+    def setUp(self):
+        clear_commission_rate_cache()
+        self.client.force_login(self.admin)
+
+    def export(self, **params):
+        response = self.client.get(reverse('export_sessions'), params)
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode('utf-8')
+        self.assertTrue(content.startswith('\ufeff'))
+        return list(csv.reader(StringIO(content[1:])))
+
+    def test_columns(self):
+        header, row = self.export(psychologist=self.psychologist.pk, status='done')
+        self.assertEqual(header, EXPORT_HEADER)
+        self.assertEqual(dict(zip(header, row)), {
+            'ID': str(self.done.pk), 'Tarih': '05.03.2024 14:00', 'Danışan': 'Danışan A',
+            'Psikolog': 'Ayşe Yılmaz', 'Süre (dk)': '60', 'Seans Türü': 'Online Seans',
+            'Ödeme Yöntemi': 'Kredi Kartı', 'Durum': 'Yapıldı', 'Ücret': '1000.00',
+            'Psikolog Kesintisi': '400.00', 'Seans Ek Kesintisi': '10.00', 'Seans Türü Kesintisi': '50.00',
+            'Ödeme Yöntemi Kesintisi': '25.00', 'Toplam Kesinti Oranı (%)': '48.50',
+            'Toplam Kesinti': '485.00', 'Net Tutar': '515.00',
+        })
+
+    def test_filters(self):
+        rows = self.export()[1:]
+        self.assertEqual(len(rows), 3)
+        # En yeni seans ilk sırada
+        self.assertEqual(rows[0][0], str(self.planned.pk))
+        rows = self.export(month=3, year=2024)[1:]
+        self.assertEqual({row[2] for row in rows}, {'Danışan A', 'Danışan C'})
+        rows = self.export(psychologist=self.psychologist.pk, status='planned')[1:]
+        self.assertEqual([row[0] for row in rows], [str(self.planned.pk)])
+        planned = dict(zip(EXPORT_HEADER, rows[0]))
+        self.assertEqual((planned['Toplam Kesinti'], planned['Net Tutar']), ('0.00', '0.00'))
+        # Geçersiz ay yok sayılır, yıl filtresi uygulanır
+        self.assertEqual(len(self.export(month=13, year=2024)[1:]), 3)
+        self.assertEqual(self.export(month=13, year=2023)[1:], [])
+
+    def test_formula_cells_escaped(self):
+        user = self.other.user
+        user.first_name = '@SUM(A1)'
+        user.save()
+        for i, name in enumerate(('=HYPERLINK("http://x")', '+1', '-2+3', 'Normal - ad')):
+            Session.objects.create(expert=self.other, client_name=name, date=local(2023, 1, 1 + i, 9), price=Decimal('100'))
+        rows = self.export(year=2023)[1:]
+        self.assertEqual(
+            [row[2] for row in rows],
+            ['Normal - ad', "'-2+3", "'+1", '\'=HYPERLINK("http://x")'],
+        )
+        self.assertEqual({row[3] for row in rows}, {"'@SUM(A1)"})
+
+
+class SessionImportTests(TestCase):
+    """CSV aktarımı hatalı satırları raporlayıp kalanları eklemeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologist = Psychologist.objects.create(
+            user=User.objects.create_user('psikolog'), commission_rate=Decimal('40'),
+        )
+
+    def setUp(self):
+        clear_commission_rate_cache()
+
+    def csv(self, *rows):
+        lines = ['username,client_name,date,price,status,extra_commission_rate', *rows]
+        return StringIO('\n'.join(lines) + '\n')
+
+    def test_error_report(self):
+        result = import_sessions(self.csv(
+            'psikolog,Danışan A,2024-03-05 10:00,1000,done,',
+            'psikolog,Danışan B,2024-03-06 10:00,1e400,planned,',
+            'psikolog,Danışan C,2024-03-07 10:00,12345678901234,planned,',
+            'psikolog,Danışan D,2024-03-08 10:00,100.555,planned,',
+            'psikolog,Danışan E,2024-03-09 10:00,100,planned,1000',
+            'yok,Danışan F,2024-03-10 10:00,100,planned,',
+            'psikolog,Danışan G,05.04.2024 09:30,"250,50",planned,2.5',
+        ))
+        self.assertEqual(result.created, 2)
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5, 6, 7])
+        self.assertIn('ücret', result.errors[0][1])
+        self.assertIn('ek kesinti oranı', result.errors[3][1])
+        self.assertEqual(
+            list(Session.objects.order_by('date').values_list('client_name', 'price', 'extra_commission_rate')),
+            [('Danışan A', Decimal('1000'), Decimal('0')), ('Danışan G', Decimal('250.5'), Decimal('2.5'))],
+        )
+        # Aktarılan aylar listede sorunsuz açılmalı
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('manage_sessions'), {'month': 3, 'year': 2024})
+        self.assertEqual(response.status_code, 200)
+
+    def test_duration_limits(self):
+        stream = StringIO('\n'.join([
+            'username,client_name,date,duration',
+            'psikolog,Danışan A,2024-03-05 10:00,99999999999999999999',
+            'psikolog,Danışan B,2024-03-06 10:00,9999999999',
+            'psikolog,Danışan C,2024-03-07 10:00,1441',
+            'psikolog,Danışan D,2024-03-08 10:00,1440',
+        ]) + '\n')
+        result = import_sessions(stream)
+        self.assertEqual(result.created, 1)
+        self.assertEqual([line for line, _ in result.errors], [2, 3, 4])
+        self.assertIn('Süre', result.errors[0][1])
+        self.assertEqual(list(Session.objects.values_list('duration', flat=True)), [1440])
+
+    def test_dry_run_saves_nothing(self):
+        result = import_sessions(self.csv(
+            'psikolog,Danışan A,2024-03-05 10:00,1000,done,',
+            'psikolog,Danışan B,2024-03-06 10:00,abc,planned,',
+        ), dry_run=True)
+        self.assertEqual(result.created, 1)
+        self.assertEqual(result.errors, [(3, 'Geçersiz ücret formatı!')])
+        self.assertFalse(Session.objects.exists())
+        self.assertFalse(MonthlyEarnings.objects.exists())
+
+    def test_rollup_refreshed(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            import_sessions(self.csv(
+                'psikolog,Danışan A,2024-03-05 10:00,1000,done,',
+                'psikolog,Danışan B,2024-03-31 23:30,500,done,',
+                'psikolog,Danışan C,2024-04-01 10:00,800,planned,',
+            ))
+        self.assertEqual(len(callbacks), 1)
+        rows = {
+            (row.month, row.status): (row.session_count, row.gross, row.commission, row.net)
+            for row in MonthlyEarnings.objects.filter(psychologist=self.psychologist, year=2024)
+        }
+        self.assertEqual(rows, {
+            (3, 'done'): (2, Decimal('1500'), Decimal('600'), Decimal('900')),
+            (4, 'planned'): (1, Decimal('800'), Decimal('0'), Decimal('0')),
+        })
+
+
+class SeedBenchmarkTests(TestCase):
+    """Sentetik veri silinince özet tablo temizlenmeli; kıyaslama tüm adresleri çağırabilmeli"""
+
+    def test_seed_benchmark_and_flush(self):
+        keep = Psychologist.objects.create(user=User.objects.create_user('gercek'))
+        Session.objects.create(expert=keep, client_name='Danışan', date=local(2024, 3, 5, 10), price=Decimal('100'))
+        call_command('seed_data', psychologists=2, sessions=40, stdout=StringIO())
+        done = timezone.localtime(Session.objects.filter(expert__user__username__startswith='seed_').first().date)
+        generate_statements(done.year, done.month)
+
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'report.json')
+            call_command(
+                'benchmark_urls', output=output, repeat=1, routes=['payout_statement', 'edit_session'],
+                stdout=StringIO(), stderr=StringIO(),
+            )
+            with open(output, encoding='utf-8') as report:
+                results = json.load(report)['results']
+        statuses = {(row['role'], row['route']): row['status'] for row in results}
+        self.assertEqual(statuses[('admin', 'payout_statement')], 200)
+        self.assertEqual(statuses[('admin', 'edit_session')], 200)
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            delete_seed_data()
+        self.assertTrue(callbacks)
+        self.assertEqual(list(Session.objects.values_list('expert', flat=True)), [keep.pk])
+        self.assertEqual(set(MonthlyEarnings.objects.values_list('psychologist', flat=True)), {keep.pk})
+        self.assertFalse(User.objects.filter(username__startswith='seed_').exists())
+
+
+class DashboardCacheTests(TestCase):
+    """Dashboard istatistikleri önbellekten gelmeli, yazma sonrası hemen yenilenmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.admin)
+
+    def add_session(self, price):
+        # Sürüm artışı on_commit ile yapıldığı için callback'ler burada çalıştırılır
+        with self.captureOnCommitCallbacks(execute=True):
+            Session.objects.create(
+                expert=self.psychologist, client_name='Danışan', date=timezone.now(),
+                price=Decimal(price), status='done',
+            )
+
+    def test_repeat_load_served_from_cache(self):
+        self.add_session('100')
+        url = reverse('admin_dashboard')
+        with CaptureQueriesContext(connection) as first:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            response = self.client.get(url)
+        self.assertLess(len(second), len(first))
+        self.assertEqual(response.context['total_revenue'], Decimal('100'))
+
+    def test_write_invalidates_cache(self):
+        self.add_session('100')
+        url = reverse('admin_dashboard')
+        self.client.get(url)
+        self.add_session('250')
+        response = self.client.get(url)
+        self.assertEqual(response.context['total_revenue'], Decimal('350'))
+        self.assertEqual(response.context['total_sessions'], 2)
+
+    def test_lost_version_key_does_not_revive_old_entries(self):
+        self.add_session('100')
+        url = reverse('admin_dashboard')
+        self.client.get(url)
+        seen = {get_data_version()}
+        # Dosya önbelleği anahtarı rastgele silebilir; eski sürümlü girdiler kalır
+        for _ in range(3):
+            cache.delete(DATA_VERSION_KEY)
+            seen.add(bump_data_version())
+        self.assertEqual(len(seen), 4)
+        cache.delete(DATA_VERSION_KEY)
+        self.add_session('250')
+        self.assertEqual(self.client.get(url).context['total_revenue'], Decimal('350'))
+
+    def test_key_depends_on_month(self):
+        self.add_session('100')
+        now = timezone.now()
+        response = self.client.get(reverse('admin_dashboard'), {'month': now.month, 'year': now.year - 1})
+        self.assertEqual(response.context['monthly_sessions_count'], 0)
+        response = self.client.get(reverse('admin_dashboard'), {'month': now.month, 'year': now.year})
+        self.assertEqual(response.context['monthly_sessions_count'], 1)
+
+
+class AsyncViewTests(TestCase):
+    """Async görünümler senkron karşılıklarıyla aynı sayfayı üretmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+        now = timezone.now()
+        for i, status in enumerate(['done', 'done', 'planned', 'canceled']):
+            Session.objects.create(
+                expert=cls.psychologist, client_name=f'Danışan {i}', date=now - timedelta(days=i),
+                price=Decimal('400'), status=status,
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def request(self, factory, user, url):
+        request = factory.get(url)
+        request.user = user
+        request.session = {}
+
+        async def auser():
+            return user
+        request.auser = auser
+        return request
+
+    async def assertSameContent(self, name, user):
+        url = reverse(name)
+        sync_response = await sync_to_async(getattr(views, name))(self.request(RequestFactory(), user, url))
+        await cache.aclear()
+        async_response = await getattr(async_views, name)(self.request(AsyncRequestFactory(), user, url))
+        self.assertEqual(async_response.status_code, 200)
+        strip_csrf = partial(re.sub, r'name="csrfmiddlewaretoken" value="[^"]*"', '')
+        self.assertEqual(strip_csrf(async_response.content.decode()), strip_csrf(sync_response.content.decode()))
+
+    async def test_admin_views(self):
+        for name in ('admin_dashboard', 'manage_sessions'):
+            await self.assertSameContent(name, self.admin)
+
+    async def test_psychologist_views(self):
+        for name in ('psychologist_dashboard', 'my_sessions'):
+            await self.assertSameContent(name, self.psychologist.user)
+
+    async def test_assistant_views(self):
+        for name in ('assistant_dashboard', 'assistant_manage_sessions'):
+            await self.assertSameContent(name, self.assistant.user)
+
+    async def test_invalid_period_ignored(self):
+        url = reverse('admin_dashboard') + '?month=abc&year=99999'
+        response = await async_views.admin_dashboard(self.request(AsyncRequestFactory(), self.admin, url))
+        self.assertEqual(response.status_code, 200)
+
+
+class BulkStatusTests(TestCase):
+    """Toplu durum değişikliği seans sayısından bağımsız sorguyla yapılmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        cls.psychologist = Psychologist.objects.create(
+            user=User.objects.create_user('psikolog'), commission_rate=Decimal('40'),
+        )
+        now = timezone.now()
+        Session.objects.bulk_create([
+            Session(expert=cls.psychologist, client_name=f'Danışan {i}', date=now - timedelta(days=i), price=Decimal('500'))
+            for i in range(8)
+        ])
+
+    def setUp(self):
+        clear_commission_rate_cache()
+        rebuild_monthly_earnings()
+
+    def test_mark_done_takes_snapshot_and_refreshes_totals(self):
+        first_two = list(Session.objects.values_list('pk', flat=True)[:2])
+        with CaptureQueriesContext(connection) as few:
+            set_session_status(Session.objects.filter(pk__in=first_two), 'done')
+        with CaptureQueriesContext(connection) as many:
+            set_session_status(Session.objects.all(), 'done')
+        self.assertEqual(len(few), len(many))
+
+        self.assertFalse(Session.objects.filter(snapshot_commission__isnull=True).exists())
+        totals = MonthlyEarnings.objects.totals()
+        self.assertEqual(totals['revenue'], Decimal('4000'))
+        self.assertEqual(totals['commission'], Decimal('1600'))
+
+    def test_cancel_clears_snapshot(self):
+        set_session_status(Session.objects.all(), 'done')
+        self.assertEqual(set_session_status(Session.objects.all(), 'canceled'), 8)
+        self.assertFalse(Session.objects.filter(snapshot_at__isnull=False).exists())
+        self.assertEqual(MonthlyEarnings.objects.totals()['commission'], 0)
+
+    def test_many_months_refreshed(self):
+        psychologists = [
+            Psychologist.objects.create(user=User.objects.create_user(f'psikolog{i}'), commission_rate=Decimal('40'))
+            for i in range(40)
+        ]
+        start = local(2020, 1, 15, 10)
+        Session.objects.bulk_create([
+            Session(
+                expert=psychologist, client_name='Danışan', price=Decimal('100'),
+                date=start.replace(year=2020 + month // 12, month=month % 12 + 1),
+            )
+            for psychologist in psychologists for month in range(30)
+        ])
+        rebuild_monthly_earnings()
+        self.assertEqual(set_session_status(Session.objects.all(), 'done'), 1208)
+        self.assertFalse(MonthlyEarnings.objects.exclude(status='done').exists())
+        self.assertEqual(MonthlyEarnings.objects.filter(psychologist__in=psychologists).count(), 1200)
+        self.assertEqual(MonthlyEarnings.objects.totals()['revenue'], Decimal('124000'))
+
+    def test_assistant_bulk_view(self):
+        self.client.force_login(self.assistant.user)
+        ids = list(Session.objects.values_list('pk', flat=True)[:3])
+        response = self.client.post(reverse('assistant_bulk_session_status'), {
+            'session_ids': ids, 'status': 'done', 'query': 'status=planned',
+        })
+        self.assertRedirects(response, reverse('assistant_manage_sessions') + '?status=planned')
+        self.assertEqual(Session.objects.filter(status='done').count(), 3)
+
+
+class SessionSeriesTests(TestCase):
+    """Tekrarlayan seanslar pencere içinde toplu üretilmeli ve birlikte düzenlenebilmeli"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+
+    def setUp(self):
+        clear_commission_rate_cache()
+        self.client.force_login(self.admin)
+        self.start = timezone.localtime().replace(hour=10, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+    def add_series(self, follow=False, **repeat):
+        return self.client.post(reverse('add_session'), {
+            'client_name': 'Danışan', 'expert': self.psychologist.pk,
+            'date': self.start.strftime('%Y-%m-%dT%H:%M'), 'duration': 50, 'price': '600',
+            'session_type': 'online', 'payment_method': 'cash', 'status': 'planned', 'notes': '',
+            **repeat,
+        }, follow=follow)
+
+    def test_occurrences_created_in_window(self):
+        with self.settings(SESSION_SERIES_WINDOW_DAYS=28):
+            self.add_series(repeat_interval='1')
+        series = SessionSeries.objects.get()
+        dates = list(series.sessions.order_by('date').values_list('date', flat=True))
+        self.assertEqual(len(dates), 4)
+        self.assertEqual(dates[1] - dates[0], timedelta(weeks=1))
+        self.assertEqual(MonthlyEarnings.objects.totals()['count'], 4)
+
+        # Pencere ilerledikçe kalan seanslar üretilir; tekrar sayısı aşılmaz
+        SessionSeries.objects.update(occurrence_count=7)
+        self.assertEqual(extend_series(timezone.now() + timedelta(days=365)), 3)
+        self.assertFalse(SessionSeries.objects.get().is_active)
+
+    def test_edit_this_and_following(self):
+        self.add_series(repeat_interval='2', repeat_count='4')
+        sessions = list(Session.objects.order_by('date'))
+        self.assertEqual(len(sessions), 4)
+        second = sessions[1]
+        new_date = timezone.localtime(second.date) + timedelta(hours=2)
+        response = self.client.post(reverse('edit_session', args=[second.pk]), {
+            'client_name': 'Danışan', 'expert': self.psychologist.pk,
+            'date': new_date.strftime('%Y-%m-%dT%H:%M'), 'duration': 50, 'price': '750',
+            'extra_commission_rate': '0', 'session_type': 'online', 'payment_method': 'cash',
+            'status': 'planned', 'notes': '', 'apply_following': 'on',
+        })
+        self.assertEqual(response.status_code, 302)
+        prices = list(Session.objects.order_by('date').values_list('price', flat=True))
+        self.assertEqual(prices, [Decimal('600'), Decimal('750'), Decimal('750'), Decimal('750')])
+        last = Session.objects.order_by('date').last()
+        self.assertEqual(timezone.localtime(last.date).hour, 12)
+
+    def test_cancel_following_ends_series(self):
+        self.add_series(repeat_interval='1', repeat_count='3')
+        first = Session.objects.order_by('date').first()
+        first.status = 'canceled'
+        previous_date = first.date
+        first.save()
+        self.assertEqual(update_following(first, previous_date, cancel=True), 2)
+        self.assertEqual(Session.objects.filter(status='canceled').count(), 3)
+        self.assertFalse(SessionSeries.objects.get().is_active)
+
+    def test_conflicting_occurrences_skipped(self):
+        Session.objects.create(
+            expert=self.psychologist, client_name='Dolu', date=self.start + timedelta(weeks=2, minutes=30),
+            duration=60, price=Decimal('500'),
+        )
+        with self.settings(SESSION_SERIES_WINDOW_DAYS=28):
+            response = self.add_series(repeat_interval='1', follow=True)
+        self.assertContains(response, 'çakışan tarihler atlandı')
+        series = SessionSeries.objects.get()
+        self.assertEqual(series.generated_count, 4)
+        dates = list(series.sessions.order_by('date').values_list('date', flat=True))
+        self.assertEqual(dates, [self.start + timedelta(weeks=week) for week in (0, 1, 3)])
+        self.assertEqual(list(find_conflicts(Session.objects.all())), [])
+
+        # Pencere ilerlerken de çakışan tekrar atlanır ve raporlanır
+        Session.objects.create(
+            expert=self.psychologist, client_name='Dolu 2', date=self.start + timedelta(weeks=6),
+            duration=30, price=Decimal('500'),
+        )
+        skipped = []
+        self.assertEqual(extend_series(self.start + timedelta(weeks=7), skipped=skipped), 3)
+        self.assertEqual([(date, other.client_name) for _, date, other in skipped], [(self.start + timedelta(weeks=6), 'Dolu 2')])
+
+    def test_shift_into_conflict_rejected(self):
+        self.add_series(repeat_interval='1', repeat_count='3')
+        second, third = list(Session.objects.order_by('date'))[1:]
+        Session.objects.create(
+            expert=self.psychologist, client_name='Dolu', date=third.date + timedelta(hours=2), duration=60,
+            price=Decimal('500'),
+        )
+        new_date = timezone.localtime(second.date) + timedelta(hours=2)
+        response = self.client.post(reverse('edit_session', args=[second.pk]), {
+            'client_name': 'Danışan', 'expert': self.psychologist.pk,
+            'date': new_date.strftime('%Y-%m-%dT%H:%M'), 'duration': 50, 'price': '600',
+            'extra_commission_rate': '0', 'session_type': 'online', 'payment_method': 'cash',
+            'status': 'planned', 'notes': '', 'apply_following': 'on',
+        }, follow=True)
+        self.assertContains(response, 'Sonraki seanslar güncellenmedi')
+        self.assertNotContains(response, 'başarıyla güncellendi')
+        self.assertRedirects(response, reverse('edit_session', args=[second.pk]))
+        edited = Session.objects.get(pk=second.pk)
+        self.assertEqual((edited.date, edited.duration, edited.price), (second.date, second.duration, second.price))
+        third.refresh_from_db()
+        self.assertEqual(timezone.localtime(third.date).hour, 10)
+        self.assertEqual(SessionSeries.objects.get().start, self.start)
+
+    def test_invalid_repeat_options_rejected(self):
+        for repeat in (
+            {'repeat_interval': '0'}, {'repeat_interval': '-1'}, {'repeat_interval': '5'}, {'repeat_interval': 'x'},
+            {'repeat_interval': '1', 'repeat_count': '0'}, {'repeat_interval': '1', 'repeat_count': '-2'},
+            {'repeat_interval': '1', 'repeat_until': '2024-13-45'},
+        ):
+            response = self.add_series(**repeat)
+            self.assertEqual(response.status_code, 200, repeat)
+            self.assertFalse(Session.objects.exists(), repeat)
+        self.assertFalse(SessionSeries.objects.exists())
+        with self.assertRaises(ValueError):
+            start_series(Session(expert=self.psychologist, date=self.start), 0)
+
+    def test_series_failure_rolls_back_first_session(self):
+        with mock.patch('sari_seans.views.start_series', side_effect=RuntimeError('hata')):
+            response = self.add_series(repeat_interval='1')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Session.objects.exists())
+
+
+class ConflictTests(TestCase):
+    """Aynı psikoloğun üst üste binen seansları engellenmeli ve raporlanmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+        cls.start = timezone.localtime().replace(hour=10, minute=0, second=0, microsecond=0)
+        cls.session = Session.objects.create(
+            expert=cls.psychologist, client_name='Mevcut', date=cls.start, duration=60, price=Decimal('500'),
+        )
+
+    def setUp(self):
+        clear_commission_rate_cache()
+
+    def test_ends_at_maintained(self):
+        self.assertEqual(self.session.ends_at, self.start + timedelta(minutes=60))
+        self.session.duration = 90
+        self.session.save(update_fields=['duration'])
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.ends_at, self.start + timedelta(minutes=90))
+
+    def test_write_time_check_uses_single_query(self):
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(conflict_message(self.psychologist.pk, self.start + timedelta(minutes=30), 60))
+        # Bitişik seanslar çakışmaz; düzenlenen seans kendisiyle karşılaştırılmaz
+        self.assertIsNone(conflict_message(self.psychologist.pk, self.start + timedelta(minutes=60), 60))
+        self.assertIsNone(conflict_message(self.psychologist.pk, self.start, 60, exclude_pk=self.session.pk))
+        plan = overlapping_sessions(self.psychologist.pk, self.start, self.start + timedelta(hours=1)).explain()
+        self.assertIn('session_interval_idx', plan)
+
+    def test_add_session_rejects_overlap(self):
+        self.client.force_login(self.admin)
+        self.client.post(reverse('add_session'), {
+            'client_name': 'Yeni', 'expert': self.psychologist.pk,
+            'date': (self.start + timedelta(minutes=15)).strftime('%Y-%m-%dT%H:%M'), 'duration': 50,
+            'price': '500', 'session_type': 'online', 'payment_method': 'cash', 'status': 'planned', 'notes': '',
+        })
+        self.assertEqual(Session.objects.count(), 1)
+
+    def test_find_conflicts(self):
+        Session.objects.bulk_create([
+            Session(expert=self.psychologist, client_name='Uzun', date=self.start - timedelta(hours=1), duration=180),
+            Session(expert=self.psychologist, client_name='Sonra', date=self.start + timedelta(hours=3), duration=60),
+            Session(expert=self.psychologist, client_name='İptal', date=self.start, duration=60, status='canceled'),
+        ])
+        pairs = [(first.client_name, second.client_name) for first, second in find_conflicts(Session.objects.all())]
+        self.assertEqual(pairs, [('Uzun', 'Mevcut')])
+
+    def test_find_conflicts_inside_longer_session(self):
+        base = self.start + timedelta(days=1)
+        Session.objects.bulk_create([
+            Session(expert=self.psychologist, client_name=name, date=base + timedelta(minutes=start), duration=duration)
+            for name, start, duration in (('A', 0, 100), ('B', 10, 80), ('C', 20, 10), ('D', 100, 30))
+        ])
+        pairs = [
+            (first.client_name, second.client_name)
+            for first, second in find_conflicts(Session.objects.filter(date__gte=base))
+        ]
+        self.assertEqual(pairs, [('A', 'B'), ('A', 'C'), ('B', 'C')])
+
+
+class FreeSlotTests(TestCase):
+    """Boş aralıklar çalışma saatlerinden dolu seanslar çıkarılarak bulunmalı"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        cls.first = Psychologist.objects.create(user=User.objects.create_user('psikolog1'))
+        cls.second = Psychologist.objects.create(user=User.objects.create_user('psikolog2'))
+        # Gelecek haftanın pazartesi günü
+        today = timezone.localdate()
+        cls.monday = today + timedelta(days=7 - today.weekday())
+        WorkingHours.objects.create(psychologist=cls.first, weekday=0, start_time=time(9), end_time=time(12))
+        WorkingHours.objects.create(psychologist=cls.second, weekday=0, start_time=time(10), end_time=time(12), session_type='online')
+        Session.objects.create(expert=cls.first, client_name='Dolu', date=cls.at(9), duration=90)
+        Session.objects.create(expert=cls.first, client_name='İptal', date=cls.at(11), duration=60, status='canceled')
+
+    @classmethod
+    def at(cls, hour, minute=0):
+        return timezone.make_aware(datetime.combine(cls.monday, time(hour, minute)))
+
+    def slots(self, **kwargs):
+        start = self.at(0)
+        with self.assertNumQueries(2):
+            slots = free_slots([self.first.pk, self.second.pk], start, start + timedelta(days=1), timedelta(minutes=60), **kwargs)
+        return [(psychologist_id, timezone.localtime(slot_start).strftime('%H:%M')) for slot_start, psychologist_id, _ in slots]
+
+    def test_busy_sessions_removed_and_merged_by_time(self):
+        self.assertEqual(self.slots(), [
+            (self.second.pk, '10:00'), (self.first.pk, '10:30'), (self.second.pk, '11:00'),
+        ])
+
+    def test_session_type_and_limit(self):
+        self.assertEqual(self.slots(session_type='face_to_face'), [(self.first.pk, '10:30')])
+        self.assertEqual(self.slots(limit=1), [(self.second.pk, '10:00')])
+
+    def test_api(self):
+        self.client.force_login(self.assistant.user)
+        response = self.client.get(reverse('api_free_slots'), {
+            'start': self.monday.isoformat(), 'duration': 30, 'step': 30, 'psychologist': self.first.pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+        for params in (
+            {'duration': 'x'}, {'duration': '99999999999999'}, {'step': str(24 * 60 + 1)},
+            {'limit': '-1'}, {'limit': '0'}, {'limit': 'abc'},
+            {'psychologist': '9' * 30}, {'psychologist': '0'}, {'start': '9999-12-30'},
+        ):
+            response = self.client.get(reverse('api_free_slots'), params)
+            self.assertEqual(response.status_code, 400, params)
+
+
+class RoleTests(TestCase):
+    """Rol oturumda saklanır; psikolog/asistan kaydı eklenince yeniden çözülür"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('asistan')
+        Assistant.objects.create(user=self.user)
+        self.client.force_login(self.user)
+
+    def role_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        tables = ('sari_seans_assistant', 'sari_seans_psychologist')
+        lookups = [f'WHERE "{table}"."user_id" = {self.user.pk}' for table in tables]
+        return response, [q['sql'] for q in queries if any(lookup in q['sql'] for lookup in lookups)]
+
+    def test_role_cached_in_session(self):
+        url = reverse('assistant_dashboard')
+        response, queries = self.role_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(queries), 2)
+        response, queries = self.role_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(queries, [])
+        self.assertTrue(response.context['is_assistant'])
+        self.assertFalse(response.context['is_psychologist'])
+
+    def test_wrong_role_redirects(self):
+        response = self.client.get(reverse('my_sessions'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+    def test_new_psychologist_record_invalidates_role(self):
+        self.client.get(reverse('assistant_dashboard'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Psychologist.objects.create(user=self.user)
+        response, queries = self.role_queries(reverse('dashboard'))
+        self.assertEqual(len(queries), 2)
+        self.assertRedirects(response, reverse('psychologist_dashboard'), fetch_redirect_response=False)
+
+    def test_revoked_role_not_restored_after_cache_clear(self):
+        psychologist = Psychologist.objects.create(user=self.user)
+        self.client.get(reverse('dashboard'))
+        self.assertEqual(self.client.get(reverse('my_sessions')).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            psychologist.delete()
+        # Önbellek temizlendiğinde (ya da yeniden başlatıldığında) sürüm baştan üretilir
+        cache.clear()
+        response = self.client.get(reverse('my_sessions'))
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+
+
+class ApiTests(TestCase):
+    """JSON API alan seçimi, rol kısıtları ve koşullu istekler"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+        other = Psychologist.objects.create(user=User.objects.create_user('psikolog2'))
+        now = timezone.now()
+        Session.objects.bulk_create([
+            Session(
+                expert=cls.psychologist if i % 2 else other, client_name=f'Danışan {i}',
+                date=now - timedelta(days=i), price=Decimal('400'), status='planned',
+            )
+            for i in range(6)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_field_selection_and_pagination(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('api_sessions'), {'fields': 'id,price', 'per_page': 4})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['results']), 4)
+        self.assertEqual(set(data['results'][0]), {'id', 'price'})
+        rest = self.client.get(data['next']).json()
+        self.assertEqual(len(rest['results']), 2)
+
+    def test_role_restrictions(self):
+        self.assertEqual(self.client.get(reverse('api_sessions')).status_code, 401)
+        self.client.force_login(self.assistant.user)
+        response = self.client.get(reverse('api_sessions'), {'fields': 'id,commission'})
+        self.assertEqual(response.status_code, 400)
+        self.client.force_login(self.psychologist.user)
+        ids = {row['psychologist_id'] for row in self.client.get(reverse('api_sessions')).json()['results']}
+        self.assertEqual(ids, {self.psychologist.pk})
+
+    def test_invalid_filters_rejected(self):
+        self.client.force_login(self.admin)
+        for name, params in (
+            ('api_sessions', {'month': 'abc'}),
+            ('api_sessions', {'month': '13', 'year': '2025'}),
+            ('api_sessions', {'psychologist': 'x'}),
+            ('api_earnings', {'year': '0'}),
+            ('api_monthly_summaries', {'psychologist': 'x'}),
+            ('api_monthly_summaries', {'year': 'abc'}),
+        ):
+            response = self.client.get(reverse(name), params)
+            self.assertEqual(response.status_code, 400, (name, params))
+            self.assertIn('detail', response.json())
+        rebuild_monthly_earnings()
+        response = self.client.get(reverse('api_monthly_summaries'), {'psychologist': self.psychologist.pk})
+        self.assertEqual(sum(row['session_count'] for row in response.json()['results']), 3)
+
+    def test_conditional_requests(self):
+        self.client.force_login(self.admin)
+        url = reverse('api_earnings')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Session.objects.filter(expert=self.psychologist).first().delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class MetricsTests(TestCase):
+    """İstek ölçümleri /metrics/ adresinde Prometheus biçiminde okunur"""
+
+    def setUp(self):
+        reset_metrics()
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        self.client.force_login(self.admin)
+
+    def test_request_histograms(self):
+        self.client.get(reverse('manage_sessions'))
+        self.client.get(reverse('admin:index'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        labels = 'view="manage_sessions",role="admin"'
+        self.assertIn(f'sari_seans_request_duration_seconds_count{{{labels}}} 1', body)
+        self.assertIn(f'sari_seans_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', body)
+        queries = re.search(rf'sari_seans_sql_queries_sum{{{labels}}} (\d+)', body)
+        self.assertGreater(int(queries.group(1)), 0)
+        template_time = re.search(rf'sari_seans_template_render_seconds_sum{{{labels}}} ([\d.e-]+)', body)
+        self.assertGreater(float(template_time.group(1)), 0)
+        # Sadece sari_seans görünümleri ölçülür
+        self.assertNotIn('view="admin:index"', body)
+
+    @override_settings(METRICS_TOKEN='gizli')
+    def test_admin_or_token_only(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer gizli')
+        self.assertEqual(response.status_code, 200)
+
+    def test_slow_request_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slow.log')
+            with override_settings(METRICS_SLOW_REQUEST_MS=0, METRICS_SLOW_REQUEST_LOG=path):
+                self.client.get(reverse('manage_sessions'), {'status': 'done'})
+            with open(path, encoding='utf-8') as log:
+                entries = [json.loads(line) for line in log]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['view'], 'manage_sessions')
+        self.assertEqual(entries[0]['path'], reverse('manage_sessions') + '?status=done')
+        self.assertGreater(entries[0]['queries'], 0)
+
+
+class SlowQueryLogTests(TestCase):
+    """Eşiği aşan sorgular planlarıyla kaydedilir ve komutla özetlenir"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        self.client.force_login(self.admin)
+
+    def test_log_and_summary(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'slow.log')
+            middleware = [*settings.MIDDLEWARE, 'sari_seans.slow_queries.SlowQueryMiddleware']
+            with override_settings(MIDDLEWARE=middleware, SLOW_QUERY_MS=0, SLOW_QUERY_LOG=path):
+                # Yıl verilmeden ay filtresi date__month ile tablo taramasına düşer
+                self.client.get(reverse('manage_sessions'), {'month': '5'})
+            with open(path, encoding='utf-8') as log:
+                entries = [json.loads(line) for line in log]
+            scans = [entry for entry in entries if entry['view'] == 'manage_sessions' and entry['plan']
+                     and any(line.startswith('SCAN sari_seans_session') for line in entry['plan'])]
+            self.assertTrue(scans)
+            self.assertIsNotNone(scans[0]['params'])
+
+            out = StringIO()
+            call_command('slow_queries', log=path, view='manage_sessions', limit=3, stdout=out)
+        output = out.getvalue()
+        self.assertIn('#1  toplam', output)
+        self.assertIn('görünümler: manage_sessions', output)
+
+
+class TrendTests(TestCase):
+    """Eğilimler tek gruplu sorguyla hesaplanır, boş dönemler sıfırla doldurulur"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.assistant = Assistant.objects.create(user=User.objects.create_user('asistan'))
+        cls.psychologist = Psychologist.objects.create(user=User.objects.create_user('psikolog'))
+        cls.other = Psychologist.objects.create(user=User.objects.create_user('psikolog2'))
+        tz = timezone.get_current_timezone()
+        for expert, day, status in [
+            (cls.psychologist, datetime(2025, 1, 6, 10, tzinfo=tz), 'done'),
+            (cls.psychologist, datetime(2025, 1, 8, 10, tzinfo=tz), 'canceled'),
+            (cls.other, datetime(2025, 1, 31, 23, 30, tzinfo=tz), 'done'),
+            (cls.psychologist, datetime(2025, 3, 3, 10, tzinfo=tz), 'done'),
+        ]:
+            Session.objects.create(expert=expert, client_name='Danışan', date=day, price=Decimal('1000'), status=status)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_monthly_buckets(self):
+        with self.assertNumQueries(1):
+            rows = session_trends(datetime(2025, 1, 1).date(), datetime(2025, 3, 31).date(), 'month')
+        self.assertEqual([row['period'].month for row in rows], [1, 2, 3])
+        january, february, march = rows
+        # Yerel saatle 31 Ocak 23:30 Ocak'a sayılır
+        self.assertEqual((january['session_count'], january['done_count'], january['canceled_count']), (3, 2, 1))
+        self.assertEqual(january['revenue'], Decimal('2000'))
+        self.assertEqual(february['session_count'], 0)
+        self.assertEqual(february['revenue'], Decimal('0'))
+        self.assertEqual(march['net'], Session.objects.get(date__month=3).snapshot_net)
+
+    def test_weekly_buckets_and_psychologist_subset(self):
+        rows = session_trends(
+            datetime(2025, 1, 1).date(), datetime(2025, 1, 31).date(), 'week', [self.psychologist.pk],
+        )
+        self.assertEqual(rows[0]['period'], datetime(2024, 12, 30).date())
+        self.assertEqual([row['session_count'] for row in rows], [0, 2, 0, 0, 0])
+
+    def test_cached_per_range_until_data_changes(self):
+        start, end = datetime(2025, 1, 1).date(), datetime(2025, 3, 31).date()
+        cached_session_trends(start, end)
+        with self.assertNumQueries(0):
+            cached_session_trends(start, end)
+        with self.captureOnCommitCallbacks(execute=True):
+            Session.objects.filter(status='canceled').delete()
+        self.assertEqual(cached_session_trends(start, end)[0]['session_count'], 2)
+
+    def test_api_roles_and_validation(self):
+        url = reverse('api_trends')
+        params = {'start': '2025-01-01', 'end': '2025-03-31'}
+        self.client.force_login(self.psychologist.user)
+        rows = self.client.get(url, params).json()['results']
+        self.assertEqual([row['session_count'] for row in rows], [2, 0, 1])
+
+        self.client.force_login(self.assistant.user)
+        rows = self.client.get(url, params).json()['results']
+        self.assertNotIn('revenue', rows[0])
+        self.assertEqual(rows[0]['session_count'], 3)
+
+        for invalid in (
+            {'start': '2020-01-01', 'end': '2025-01-01', 'bucket': 'day'},
+            {'start': '9999-12-01', 'end': '9999-12-31'},
+            {'start': '9999-12-31', 'end': '9999-12-31', 'bucket': 'week'},
+            {'psychologist': '9' * 30},
+        ):
+            response = self.client.get(url, invalid)
+            self.assertEqual(response.status_code, 400, invalid)
+
+    def test_page(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('trends'), {
+            'start': '2025-01-01', 'end': '2025-03-31', 'psychologist': self.other.pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_sessions'], 1)
+        response = self.client.get(reverse('trends'), {
+            'start': '9999-12-01', 'end': '9999-12-31', 'psychologist': '9' * 30,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['selected_psychologists'], [])
+        self.client.force_login(self.assistant.user)
+        self.assertEqual(self.client.get(reverse('trends')).status_code, 302)
+
+
+class PayoutStatementTests(TestCase):
+    """Aylık ödeme dökümleri toplu veriden üretilir; değişmeyenler atlanır"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'x')
+        cls.psychologists = [
+            Psychologist.objects.create(
+                user=User.objects.create_user(f'psikolog{i}', first_name=f'Psikolog {i}'), commission_rate=Decimal('40'),
+            )
+            for i in range(3)
+        ]
+        SessionTypeCommission.objects.create(session_type='online', rate=Decimal('5'))
+        tz = timezone.get_current_timezone()
+        for i, psychologist in enumerate(cls.psychologists):
+            for day in range(1, 4):
+                Session.objects.create(
+                    expert=psychologist, client_name=f'Danışan {day}', date=datetime(2025, 4, day, 10, tzinfo=tz),
+                    price=Decimal('1000'), session_type='online', status='done' if day < 3 else 'planned',
+                )
+
+    def test_generate_and_skip_unchanged(self):
+        with self.assertNumQueries(4):
+            self.assertEqual(generate_statements(2025, 4, workers=1), (3, 0))
+        statement = PayoutStatement.objects.get(psychologist=self.psychologists[0])
+        self.assertEqual(statement.session_count, 2)
+        self.assertEqual(statement.gross, Decimal('2000'))
+        self.assertEqual(statement.commission, Decimal('900'))
+        self.assertIn('Psikolog 0', statement.html)
+        self.assertIn('₺1100,00', statement.html)
+
+        self.assertEqual(generate_statements(2025, 4, workers=1), (0, 3))
+        session = Session.objects.filter(expert=self.psychologists[1], status='planned').get()
+        session.status = 'done'
+        session.save()
+        self.assertEqual(generate_statements(2025, 4, workers=1), (1, 2))
+        self.assertEqual(PayoutStatement.objects.get(psychologist=self.psychologists[1]).session_count, 3)
+        self.assertEqual(generate_statements(2025, 4, workers=1, force=True), (3, 0))
+
+    def test_process_pool_renders_same_html(self):
+        contexts = list(statement_contexts(2025, 4).values())
+        self.assertEqual(render_statements(contexts, workers=2, pool_threshold=0), render_statements(contexts, workers=1))
+
+    def test_statement_view_access(self):
+        generate_statements(2025, 4, workers=1)
+        own, other = (PayoutStatement.objects.get(psychologist=p) for p in self.psychologists[:2])
+        self.client.force_login(self.psychologists[0].user)
+        self.assertContains(self.client.get(reverse('payout_statement', args=[own.pk])), 'Ödeme Dökümü')
+        self.assertEqual(self.client.get(reverse('payout_statement', args=[other.pk])).status_code, 404)
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(reverse('payout_statement', args=[other.pk])).status_code, 200)
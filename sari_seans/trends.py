@@ -0,0 +1,149 @@
+"""Seçilen tarih aralığında gün, hafta ya da ay bazında seans ve tutar eğilimleri
+
+Tüm aralık tek gruplu sorguyla (TruncDay/TruncWeek/TruncMonth, yerel saat
+dilimi) hesaplanır; seansı olmayan dönemler sıfırla doldurulur. Sonuç aralık,
+kova ve psikolog seçimine göre veri sürümüne bağlı önbellekte saklanır.
+"""
+import hashlib
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, DateField, Q, Sum
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .caching import get_data_version
+from .filters import MAX_YEAR, MIN_YEAR
+from .models import Session
+
+BUCKETS = {'day': TruncDay, 'week': TruncWeek, 'month': TruncMonth}
+BUCKET_CHOICES = [('day', 'Gün'), ('week', 'Hafta'), ('month', 'Ay')]
+
+# Tek istekte döndürülebilecek en fazla dönem sayısı (ör. 400 gün, ~7 yıl hafta)
+MAX_PERIODS = 400
+
+AMOUNT_FIELDS = ('revenue', 'commission', 'net')
+
+
+class TrendRangeError(ValueError):
+    pass
+
+
+def default_range(today=None):
+    """Bu ay dahil son 12 ay"""
+    today = today or timezone.localdate()
+    start_month = today.month - 11
+    start = date(today.year + (start_month - 1) // 12, (start_month - 1) % 12 + 1, 1)
+    return start, today
+
+
+def period_start(day, bucket):
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_period(day, bucket):
+    if bucket == 'week':
+        return day + timedelta(weeks=1)
+    if bucket == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+
+def periods(start, end, bucket):
+    """start ve end (dahil) günlerini kapsayan dönemlerin başlangıç günleri"""
+    day = period_start(start, bucket)
+    while day <= end:
+        yield day
+        day = next_period(day, bucket)
+
+
+def parse_trend_params(params, today=None):
+    """?start, ?end (YYYY-MM-DD, dahil) ve ?bucket parametrelerini doğrula"""
+    default_start, default_end = default_range(today)
+    bucket = params.get('bucket') or 'month'
+    if bucket not in BUCKETS:
+        raise TrendRangeError(f"bucket şunlardan biri olmalıdır: {', '.join(BUCKETS)}.")
+    values = []
+    for name, default in (('start', default_start), ('end', default_end)):
+        value = params.get(name)
+        parsed = parse_date(value) if value else default
+        if parsed is None:
+            raise TrendRangeError(f'{name} YYYY-AA-GG biçiminde bir tarih olmalıdır.')
+        # Dönem ve aralık sonu hesapları datetime sınırını aşmasın
+        if not MIN_YEAR <= parsed.year <= MAX_YEAR:
+            raise TrendRangeError(f'{name} {MIN_YEAR} ile {MAX_YEAR} yılları arasında olmalıdır.')
+        values.append(parsed)
+    start, end = values
+    if start > end:
+        raise TrendRangeError('start, end\'den sonra olamaz.')
+    count = sum(1 for _ in periods(start, end, bucket))
+    if count > MAX_PERIODS:
+        raise TrendRangeError(f'Seçilen aralık {count} dönem içeriyor; en fazla {MAX_PERIODS} dönem seçilebilir.')
+    return start, end, bucket
+
+
+def session_trends(start, end, bucket='month', psychologist_ids=None):
+    """[start, end] günleri arasındaki seansları dönem bazında topla; her dönem için bir satır döndür"""
+    tz = timezone.get_current_timezone()
+    sessions = Session.objects.filter(
+        date__gte=datetime.combine(start, time.min, tzinfo=tz),
+        date__lt=datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+    )
+    if psychologist_ids is not None:
+        sessions = sessions.filter(expert_id__in=psychologist_ids)
+
+    done = Q(status='done')
+    rows = (
+        sessions
+        .annotate(period=BUCKETS[bucket]('date', output_field=DateField()))
+        .values('period')
+        .annotate(
+            session_count=Count('id'),
+            done_count=Count('id', filter=done),
+            canceled_count=Count('id', filter=Q(status='canceled')),
+            revenue=Sum('price', filter=done),
+            commission=Sum('snapshot_commission'),
+            net=Sum('snapshot_net'),
+        )
+        .order_by('period')
+    )
+    by_period = {row['period']: row for row in rows}
+
+    results = []
+    for period in periods(start, end, bucket):
+        row = by_period.get(period, {})
+        results.append({
+            'period': period,
+            'session_count': row.get('session_count', 0),
+            'done_count': row.get('done_count', 0),
+            'canceled_count': row.get('canceled_count', 0),
+            **{name: row.get(name) or Decimal('0') for name in AMOUNT_FIELDS},
+        })
+    return results
+
+
+def trends_cache_key(start, end, bucket, psychologist_ids):
+    if psychologist_ids is None:
+        selection = 'all'
+    else:
+        # Uzun psikolog listeleri anahtarı şişirmesin
+        joined = ','.join(str(pk) for pk in sorted(set(psychologist_ids)))
+        selection = hashlib.sha1(joined.encode()).hexdigest()[:16]
+    return f'sari_seans:trends:{bucket}:{start}:{end}:{selection}:v{get_data_version()}'
+
+
+def cached_session_trends(start, end, bucket='month', psychologist_ids=None):
+    """session_trends() sonucunu veri sürümüne bağlı önbellekten döndür"""
+    key = trends_cache_key(start, end, bucket, psychologist_ids)
+    results = cache.get(key)
+    if results is None:
+        results = session_trends(start, end, bucket, psychologist_ids)
+        cache.set(key, results, settings.DASHBOARD_CACHE_TIMEOUT)
+    return results
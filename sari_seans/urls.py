@@ -1,17 +1,27 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import api, async_views, metrics, views
+
+# SEANS_ASYNC_VIEWS açıkken salt okunur dashboard ve liste ekranları async sürümleriyle sunulur
+read_views = async_views if settings.SEANS_ASYNC_VIEWS else views
 
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
-    path('admin-dashboard/', views.admin_dashboard, name='admin_dashboard'),
-    path('psychologist-dashboard/', views.psychologist_dashboard, name='psychologist_dashboard'),
-    path('assistant-dashboard/', views.assistant_dashboard, name='assistant_dashboard'),
+    path('admin-dashboard/', read_views.admin_dashboard, name='admin_dashboard'),
+    path('psychologist-dashboard/', read_views.psychologist_dashboard, name='psychologist_dashboard'),
+    path('assistant-dashboard/', read_views.assistant_dashboard, name='assistant_dashboard'),
     path('manage-psychologists/', views.manage_psychologists, name='manage_psychologists'),
     path('manage-extra-commission/', views.manage_extra_commission, name='manage_extra_commission'),
-    path('my-sessions/', views.my_sessions, name='my_sessions'),
+    path('my-sessions/', read_views.my_sessions, name='my_sessions'),
+    path('trends/', views.trends, name='trends'),
+    path('statements/<int:statement_id>/', views.payout_statement, name='payout_statement'),
     path('change-password/', views.change_password, name='change_password'),
-    path('manage-sessions/', views.manage_sessions, name='manage_sessions'),
-    path('assistant-manage-sessions/', views.assistant_manage_sessions, name='assistant_manage_sessions'),
+    path('manage-sessions/', read_views.manage_sessions, name='manage_sessions'),
+    path('manage-sessions/status/', views.bulk_session_status, name='bulk_session_status'),
+    path('export-sessions/', views.export_sessions, name='export_sessions'),
+    path('upload-sessions/', views.upload_sessions, name='upload_sessions'),
+    path('assistant-manage-sessions/', read_views.assistant_manage_sessions, name='assistant_manage_sessions'),
+    path('assistant-manage-sessions/status/', views.assistant_bulk_session_status, name='assistant_bulk_session_status'),
     path('add-session/', views.add_session, name='add_session'),
     path('assistant-add-session/', views.assistant_add_session, name='assistant_add_session'),
     path('edit-session/<int:session_id>/', views.edit_session, name='edit_session'),
@@ -21,4 +31,10 @@ urlpatterns = [
     path('add-assistant/', views.add_assistant, name='add_assistant'),
     path('add-psychologist/', views.add_psychologist, name='add_psychologist'),
     path('edit-psychologist/<int:psychologist_id>/', views.edit_psychologist, name='edit_psychologist'),
+    path('api/sessions/', api.sessions, name='api_sessions'),
+    path('api/earnings/', api.earnings, name='api_earnings'),
+    path('api/monthly-summaries/', api.monthly_summaries, name='api_monthly_summaries'),
+    path('api/trends/', api.trends, name='api_trends'),
+    path('api/free-slots/', api.free_slots, name='api_free_slots'),
+    path('metrics/', metrics.metrics, name='metrics'),
 ]
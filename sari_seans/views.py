@@ -1,118 +1,167 @@
 # sari_seans/views.py
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.decorators import login_required, user_passes_test
+from django.http import HttpResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_POST
+from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.contrib.auth import update_session_auth_hash
 from django.contrib.auth.forms import PasswordChangeForm
-from django.db.models import Sum, Count
+from django.db import transaction
+from django.db.models import Sum, Count, Q
 from django.utils import timezone
 from datetime import datetime, timedelta
 from decimal import Decimal, InvalidOperation
-from .models import Session, Psychologist, SessionTypeCommission, PaymentMethodCommission, Assistant
+import io
+from .models import Session, SessionSeries, Psychologist, SessionTypeCommission, PaymentMethodCommission, Assistant, MonthlyEarnings, PayoutStatement
 from django.contrib.auth.models import User
+from .caching import cached_dashboard_stats
+from .conflicts import conflict_message
+from .earnings import set_session_status, with_earnings_stats
+from .export import csv_stream, session_export_rows
+from .filters import apply_session_filters, parse_id
+from .importer import IMPORT_COLUMNS, import_sessions
+from .pagination import keyset_paginate
+from .recurrence import SeriesConflictError, start_series, update_following
+from .roles import get_role, role_required
+from .trends import BUCKET_CHOICES, TrendRangeError, cached_session_trends, default_range, parse_trend_params
 
-def is_assistant(user):
-    return hasattr(user, 'assistant')
+def update_selected_status(request, list_url):
+    """Listede işaretlenen seansların durumunu toplu güncelle ve listeye (filtrelerle) dön"""
+    session_ids = [pk for pk in request.POST.getlist('session_ids') if pk.isdigit()]
+    status = request.POST.get('status')
+    labels = dict(Session.STATUS_CHOICES)
+    if not session_ids:
+        messages.error(request, 'Lütfen en az bir seans seçin.')
+    elif status not in labels:
+        messages.error(request, 'Geçersiz durum seçimi!')
+    else:
+        count = set_session_status(Session.objects.filter(pk__in=session_ids), status)
+        messages.success(request, f'{count} seansın durumu "{labels[status]}" olarak güncellendi.')
+
+    query = request.POST.get('query', '')
+    return redirect(f'{reverse(list_url)}?{query}' if query else list_url)
+
+def repeat_options(request):
+    """Formdaki tekrar seçeneklerini doğrula; tekrar seçilmediyse None döndür
+
+    Geçersiz değerde formda gösterilecek mesajla ValueError fırlatılır.
+    """
+    interval = request.POST.get('repeat_interval')
+    if not interval:
+        return None
+    if not interval.isdigit() or int(interval) not in dict(SessionSeries.INTERVAL_CHOICES):
+        raise ValueError('Geçersiz tekrar aralığı!')
+    options = {'interval_weeks': int(interval), 'end_date': None, 'occurrence_count': None}
+
+    until = request.POST.get('repeat_until')
+    if until:
+        try:
+            options['end_date'] = parse_date(until)
+        except ValueError:
+            pass
+        if options['end_date'] is None:
+            raise ValueError('Geçersiz tekrar bitiş tarihi!')
+
+    count = request.POST.get('repeat_count')
+    if count:
+        if not count.isdigit() or int(count) < 1:
+            raise ValueError('Tekrar sayısı en az 1 olmalı!')
+        options['occurrence_count'] = int(count)
+    return options
+
+def series_message(client_name, series):
+    skipped = series.skipped
+    message = f'{client_name} için tekrarlayan seans oluşturuldu; {series.generated_count - len(skipped)} seans planlandı.'
+    if skipped:
+        dates = ', '.join(f'{timezone.localtime(date):%d.%m.%Y %H:%M}' for date, _ in skipped)
+        message += f' Psikoloğun başka bir seansıyla çakışan tarihler atlandı: {dates}.'
+    return message
 
-def is_psychologist(user):
-    return hasattr(user, 'psychologist')
+def save_with_following(request, session, previous_date):
+    """Seansı kaydet; işaretlendiyse değişiklikleri serinin sonraki planlanmış seanslarına uygula
 
-def is_admin(user):
-    return user.is_superuser
+    Kayıt ve sonraki seansların güncellenmesi tek transaction içinde yapılır.
+    Sonraki seanslardan biri çakışırsa hiçbir şey kaydedilmez, hata mesajı
+    eklenir ve False döner.
+    """
+    apply_following = session.series_id and request.POST.get('apply_following') == 'on'
+    try:
+        with transaction.atomic():
+            session.save()
+            count = 0
+            if apply_following:
+                count = update_following(session, previous_date, cancel=session.status == 'canceled')
+    except SeriesConflictError as exc:
+        messages.error(request, str(exc))
+        return False
+    if count:
+        messages.info(request, f'Değişiklikler serinin sonraki {count} seansına da uygulandı.')
+    return True
 
 @login_required
 def dashboard(request):
     """Ana dashboard - kullanıcı tipine göre yönlendirme"""
-    if request.user.is_superuser:
+    role = get_role(request)
+    if role.is_admin:
         return redirect('admin_dashboard')
-    elif is_psychologist(request.user):
+    elif role.is_psychologist:
         return redirect('psychologist_dashboard')
-    elif is_assistant(request.user):
+    elif role.is_assistant:
         return redirect('assistant_dashboard')
     else:
         messages.error(request, 'Bu sayfaya erişim yetkiniz yok.')
         return redirect('login')
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def admin_dashboard(request):
     """Admin dashboard - tüm psikologların özeti"""
-    psychologists = Psychologist.objects.filter(is_active=True)
-    assistants = Assistant.objects.filter(is_active=True)
-    
     # Ay filtreleme
     selected_month = int(request.GET.get('month', timezone.now().month))
     selected_year = int(request.GET.get('year', timezone.now().year))
     
-    # Toplam istatistikler (tüm seanslar)
-    total_sessions = Session.objects.count()
-    total_revenue = Session.objects.filter(status='done').aggregate(Sum('price'))['price__sum'] or 0
-    
-    # Toplam kesinti hesaplama
-    total_commission = 0
-    for session in Session.objects.filter(status='done'):
-        total_commission += session.commission_amount
-    
-    # Seçilen ay için istatistikler (tüm seanslar - durumdan bağımsız)
-    monthly_sessions_all = Session.objects.filter(
-        date__month=selected_month,
-        date__year=selected_year
-    )
-    monthly_sessions_count = monthly_sessions_all.count()
-    
-    # Sadece 'done' durumundaki seanslar için gelir ve kesinti hesaplama
-    monthly_sessions_done = monthly_sessions_all.filter(status='done')
-    monthly_revenue = monthly_sessions_done.aggregate(Sum('price'))['price__sum'] or 0
-    
-    # Aylık kesinti hesaplama
-    monthly_commission = 0
-    for session in monthly_sessions_done:
-        monthly_commission += session.commission_amount
-    
-    monthly_net = monthly_revenue - monthly_commission
-    
-    # Psikolog bazında istatistikler
-    psychologist_stats = []
-    for psychologist in psychologists:
-        # Tüm seanslar
-        all_sessions = Session.objects.filter(expert=psychologist)
-        total_sessions_count = all_sessions.count()
-        total_earnings = all_sessions.filter(status='done').aggregate(Sum('price'))['price__sum'] or 0
-        
-        # Aylık seanslar (tüm seanslar - durumdan bağımsız)
-        monthly_psychologist_sessions_all = all_sessions.filter(
-            date__month=selected_month,
-            date__year=selected_year
-        )
-        monthly_psychologist_sessions_count = monthly_psychologist_sessions_all.count()
-        
-        # Sadece 'done' durumundaki seanslar için gelir ve kesinti hesaplama
-        monthly_psychologist_sessions_done = monthly_psychologist_sessions_all.filter(status='done')
-        monthly_earnings = monthly_psychologist_sessions_done.aggregate(Sum('price'))['price__sum'] or 0
-        
-        # Kesinti hesaplama
-        commission_amount = 0
-        for session in all_sessions.filter(status='done'):
-            commission_amount += session.commission_amount
-            
-        monthly_commission_amount = 0
-        for session in monthly_psychologist_sessions_done:
-            monthly_commission_amount += session.commission_amount
-            
-        net_earnings = total_earnings - commission_amount
-        monthly_net_earnings = monthly_earnings - monthly_commission_amount
-        
-        psychologist_stats.append({
-            'psychologist': psychologist,
-            'total_sessions': total_sessions_count,
-            'total_earnings': total_earnings,
-            'commission_amount': commission_amount,
-            'net_earnings': net_earnings,
-            'monthly_sessions': monthly_psychologist_sessions_count,
-            'monthly_earnings': monthly_earnings,
-            'monthly_commission': monthly_commission_amount,
-            'monthly_net': monthly_net_earnings,
-        })
+    def build_stats():
+        psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+        assistants = Assistant.objects.filter(is_active=True).select_related('user')
+        
+        # Toplam istatistikler (MonthlyEarnings özet tablosundan)
+        totals = MonthlyEarnings.objects.totals()
+        
+        # Seçilen ay için istatistikler (sayı tüm seanslar, tutarlar sadece 'done')
+        monthly_totals = MonthlyEarnings.objects.filter(
+            year=selected_year,
+            month=selected_month
+        ).totals()
+        
+        # Psikolog bazında istatistikler (tek gruplu sorgu)
+        psychologist_stats = [
+            {
+                'psychologist': psychologist,
+                'total_sessions': psychologist.stat_total_sessions,
+                'total_earnings': psychologist.stat_total_earnings,
+                'commission_amount': psychologist.stat_commission,
+                'net_earnings': psychologist.stat_net,
+                'monthly_sessions': psychologist.stat_monthly_sessions,
+                'monthly_earnings': psychologist.stat_monthly_earnings,
+                'monthly_commission': psychologist.stat_monthly_commission,
+                'monthly_net': psychologist.stat_monthly_net,
+            }
+            for psychologist in with_earnings_stats(psychologists, selected_year, selected_month)
+        ]
+        
+        return {
+            'psychologists': [stat['psychologist'] for stat in psychologist_stats],
+            'assistants': list(assistants),
+            'psychologist_stats': psychologist_stats,
+            'total_sessions': totals['count'],
+            'total_revenue': totals['revenue'],
+            'total_commission': totals['commission'],
+            'monthly_sessions_count': monthly_totals['count'],
+            'monthly_revenue': monthly_totals['revenue'],
+            'monthly_commission': monthly_totals['commission'],
+            'monthly_net': monthly_totals['net'],
+        }
     
     # Ay seçenekleri
     months = [
@@ -125,26 +174,17 @@ def admin_dashboard(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
-    context = {
-        'psychologists': psychologists,
-        'assistants': assistants,
-        'psychologist_stats': psychologist_stats,
-        'total_sessions': total_sessions,
-        'total_revenue': total_revenue,
-        'total_commission': total_commission,
-        'monthly_sessions_count': monthly_sessions_count,
-        'monthly_revenue': monthly_revenue,
-        'monthly_commission': monthly_commission,
-        'monthly_net': monthly_net,
+    # İstatistikler veri sürümüne bağlı önbellekten gelir
+    context = cached_dashboard_stats('admin', selected_year, selected_month, build_stats)
+    context.update({
         'selected_month': selected_month,
         'selected_year': selected_year,
         'months': months,
         'years': years,
-    }
+    })
     return render(request, 'admin_dashboard.html', context)
 
-@login_required
-@user_passes_test(is_psychologist)
+@role_required('psychologist')
 def psychologist_dashboard(request):
     """Psikolog dashboard - kendi seansları ve kazancı"""
     psychologist = request.user.psychologist
@@ -153,34 +193,31 @@ def psychologist_dashboard(request):
     selected_month = int(request.GET.get('month', timezone.now().month))
     selected_year = int(request.GET.get('year', timezone.now().year))
     
-    # Seanslar
-    sessions = Session.objects.filter(expert=psychologist).order_by('-date')
-    
-    # Toplam istatistikler (tüm seanslar)
-    total_sessions = sessions.count()
-    total_earnings = sessions.filter(status='done').aggregate(Sum('price'))['price__sum'] or 0
-    
-    # Kesinti hesaplama - psikolog bazında
-    commission_amount = 0
-    for session in sessions.filter(status='done'):
-        commission_amount += session.commission_amount
-    
-    net_earnings = total_earnings - commission_amount
-    
-    # Seçilen ay için istatistikler
-    monthly_sessions = sessions.filter(
-        date__month=selected_month,
-        date__year=selected_year
-    )
-    monthly_sessions_count = monthly_sessions.count()
-    monthly_earnings = monthly_sessions.filter(status='done').aggregate(Sum('price'))['price__sum'] or 0
-    
-    # Aylık kesinti hesaplama
-    monthly_commission = 0
-    for session in monthly_sessions.filter(status='done'):
-        monthly_commission += session.commission_amount
-    
-    monthly_net = monthly_earnings - monthly_commission
+    def build_stats():
+        # Son 10 seans
+        sessions = Session.objects.filter(expert=psychologist).select_related('expert').order_by('-date')[:10]
+        
+        # Toplam istatistikler (MonthlyEarnings özet tablosundan)
+        earnings = MonthlyEarnings.objects.filter(psychologist=psychologist)
+        totals = earnings.totals()
+        
+        # Seçilen ay için istatistikler
+        monthly_totals = earnings.filter(
+            year=selected_year,
+            month=selected_month
+        ).totals()
+        
+        return {
+            'sessions': list(sessions),
+            'total_sessions': totals['count'],
+            'total_earnings': totals['revenue'],
+            'commission_amount': totals['commission'],
+            'net_earnings': totals['net'],
+            'monthly_sessions_count': monthly_totals['count'],
+            'monthly_earnings': monthly_totals['revenue'],
+            'monthly_commission': monthly_totals['commission'],
+            'monthly_net': monthly_totals['net'],
+        }
     
     # Ay seçenekleri
     months = [
@@ -193,63 +230,104 @@ def psychologist_dashboard(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
-    context = {
-        'sessions': sessions[:10],  # Son 10 seans
-        'total_sessions': total_sessions,
-        'total_earnings': total_earnings,
-        'commission_amount': commission_amount,
-        'net_earnings': net_earnings,
-        'monthly_sessions_count': monthly_sessions_count,
-        'monthly_earnings': monthly_earnings,
-        'monthly_commission': monthly_commission,
-        'monthly_net': monthly_net,
+    # İstatistikler veri sürümüne bağlı önbellekten gelir
+    context = cached_dashboard_stats(
+        'psychologist', selected_year, selected_month, build_stats, psychologist_id=psychologist.pk,
+    )
+    context.update({
         'selected_month': selected_month,
         'selected_year': selected_year,
         'months': months,
         'years': years,
-    }
+    })
     return render(request, 'psychologist_dashboard.html', context)
 
-@login_required
-@user_passes_test(is_assistant)
+@role_required('admin', 'psychologist')
+def trends(request):
+    """Seçilen tarih aralığında gün/hafta/ay bazında seans ve kazanç eğilimleri"""
+    role = get_role(request)
+    try:
+        start, end, bucket = parse_trend_params(request.GET)
+    except TrendRangeError as exc:
+        messages.error(request, str(exc))
+        (start, end), bucket = default_range(), 'month'
+
+    psychologists = []
+    if role.is_admin:
+        psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+        selected_psychologists = [pk for pk in map(parse_id, request.GET.getlist('psychologist')) if pk]
+        psychologist_ids = selected_psychologists or None
+    else:
+        selected_psychologists = psychologist_ids = [role.psychologist_id]
+
+    rows = cached_session_trends(start, end, bucket, psychologist_ids)
+    # Çubukların genişliği en yüksek gelirli döneme göre
+    max_revenue = max((row['revenue'] for row in rows), default=0)
+    rows = [
+        {**row, 'bar_width': int(row['revenue'] * 100 / max_revenue) if max_revenue else 0}
+        for row in rows
+    ]
+
+    context = {
+        'rows': rows,
+        'start': start,
+        'end': end,
+        'bucket': bucket,
+        'bucket_choices': BUCKET_CHOICES,
+        'psychologists': psychologists,
+        'selected_psychologists': selected_psychologists,
+        'total_sessions': sum(row['session_count'] for row in rows),
+        'total_revenue': sum(row['revenue'] for row in rows),
+        'total_commission': sum(row['commission'] for row in rows),
+        'total_net': sum(row['net'] for row in rows),
+    }
+    return render(request, 'trends.html', context)
+
+@role_required('admin', 'psychologist')
+def payout_statement(request, statement_id):
+    """Üretilmiş ödeme dökümünü yazdırılabilir HTML olarak göster"""
+    role = get_role(request)
+    statements = PayoutStatement.objects.all()
+    if not role.is_admin:
+        # Psikologlar sadece kendi dökümlerini görebilir
+        statements = statements.filter(psychologist_id=role.psychologist_id)
+    statement = get_object_or_404(statements, pk=statement_id)
+    return HttpResponse(statement.html)
+
+@role_required('assistant')
 def assistant_dashboard(request):
     """Asistan dashboard - seans yönetimi odaklı"""
     # Ay filtreleme
     selected_month = int(request.GET.get('month', timezone.now().month))
     selected_year = int(request.GET.get('year', timezone.now().year))
     
-    # Tüm seanslar (kesinti bilgileri olmadan)
-    sessions = Session.objects.all().order_by('-date')
-    
-    # Toplam istatistikler
-    total_sessions = sessions.count()
-    
-    # Seçilen ay için istatistikler
-    monthly_sessions = sessions.filter(
-        date__month=selected_month,
-        date__year=selected_year
-    )
-    monthly_sessions_count = monthly_sessions.count()
-    
-    # Psikolog bazında istatistikler (sadece seans sayısı)
-    psychologists = Psychologist.objects.filter(is_active=True)
-    psychologist_stats = []
-    
-    for psychologist in psychologists:
-        all_sessions = Session.objects.filter(expert=psychologist)
-        total_sessions_count = all_sessions.count()
+    def build_stats():
+        # Toplam istatistikler (MonthlyEarnings özet tablosundan)
+        total_sessions = MonthlyEarnings.objects.totals()['count']
         
-        monthly_psychologist_sessions = all_sessions.filter(
-            date__month=selected_month,
-            date__year=selected_year
-        )
-        monthly_sessions_count = monthly_psychologist_sessions.count()
+        # Seçilen ay için istatistikler
+        monthly_sessions_count = MonthlyEarnings.objects.filter(
+            year=selected_year,
+            month=selected_month
+        ).totals()['count']
         
-        psychologist_stats.append({
-            'psychologist': psychologist,
-            'total_sessions': total_sessions_count,
-            'monthly_sessions': monthly_sessions_count,
-        })
+        # Psikolog bazında istatistikler (sadece seans sayısı)
+        psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+        psychologist_stats = [
+            {
+                'psychologist': psychologist,
+                'total_sessions': psychologist.stat_total_sessions,
+                'monthly_sessions': psychologist.stat_monthly_sessions,
+            }
+            for psychologist in with_earnings_stats(psychologists, selected_year, selected_month)
+        ]
+        
+        return {
+            'psychologists': [stat['psychologist'] for stat in psychologist_stats],
+            'psychologist_stats': psychologist_stats,
+            'total_sessions': total_sessions,
+            'monthly_sessions_count': monthly_sessions_count,
+        }
     
     # Ay seçenekleri
     months = [
@@ -262,42 +340,25 @@ def assistant_dashboard(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
-    context = {
-        'psychologists': psychologists,
-        'psychologist_stats': psychologist_stats,
-        'total_sessions': total_sessions,
-        'monthly_sessions_count': monthly_sessions_count,
+    # Asistan ekranı kişiye özel veri içermediği için tüm asistanlar aynı anahtarı paylaşır
+    context = cached_dashboard_stats('assistant', selected_year, selected_month, build_stats)
+    context.update({
         'selected_month': selected_month,
         'selected_year': selected_year,
         'months': months,
         'years': years,
-    }
+    })
     return render(request, 'assistant_dashboard.html', context)
 
-@login_required
-@user_passes_test(is_assistant)
+@role_required('assistant')
 def assistant_manage_sessions(request):
     """Asistan seans yönetimi - kesinti bilgileri olmadan"""
-    sessions = Session.objects.all().order_by('-date')
+    sessions = Session.objects.select_related('expert__user').order_by('-date')
     
     # Filtreleme
-    status_filter = request.GET.get('status')
-    psychologist_filter = request.GET.get('psychologist')
-    month_filter = request.GET.get('month')
-    year_filter = request.GET.get('year')
+    sessions = apply_session_filters(sessions, request.GET)
     
-    if status_filter:
-        sessions = sessions.filter(status=status_filter)
-    
-    if psychologist_filter:
-        sessions = sessions.filter(expert_id=psychologist_filter)
-    
-    if month_filter:
-        sessions = sessions.filter(date__month=int(month_filter))
-    if year_filter:
-        sessions = sessions.filter(date__year=int(year_filter))
-    
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     
     # Ay seçenekleri
     months = [
@@ -308,16 +369,25 @@ def assistant_manage_sessions(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
+    # Sayfalama (date, id) anahtarlı
+    page = keyset_paginate(sessions, request.GET)
+    
     context = {
-        'sessions': sessions,
+        'sessions': page.items,
+        'page': page,
         'psychologists': psychologists,
         'months': months,
         'years': years,
     }
     return render(request, 'assistant_manage_sessions.html', context)
 
-@login_required
-@user_passes_test(is_assistant)
+@role_required('assistant')
+@require_POST
+def assistant_bulk_session_status(request):
+    """Asistan toplu seans durumu güncelleme"""
+    return update_selected_status(request, 'assistant_manage_sessions')
+
+@role_required('assistant')
 def assistant_add_session(request):
     """Asistan seans ekleme - kesinti alanları olmadan"""
     if request.method == 'POST':
@@ -342,7 +412,7 @@ def assistant_add_session(request):
                     duration = int(duration)
                 except ValueError:
                     messages.error(request, 'Geçersiz süre formatı!')
-                    psychologists = Psychologist.objects.filter(is_active=True)
+                    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                     return render(request, 'assistant_add_session.html', {'psychologists': psychologists})
             
             # Ücret kontrolü
@@ -351,44 +421,65 @@ def assistant_add_session(request):
                     price = Decimal(str(price))
                     if price < 0:
                         messages.error(request, 'Ücret negatif olamaz!')
-                        psychologists = Psychologist.objects.filter(is_active=True)
+                        psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                         return render(request, 'assistant_add_session.html', {'psychologists': psychologists})
                 except (ValueError, InvalidOperation):
                     messages.error(request, 'Geçersiz ücret formatı!')
-                    psychologists = Psychologist.objects.filter(is_active=True)
+                    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                     return render(request, 'assistant_add_session.html', {'psychologists': psychologists})
             
-            session = Session.objects.create(
-                client_name=client_name,
-                expert=expert,
-                date=date,
-                duration=duration,
-                price=price,
-                session_type=session_type,
-                payment_method=payment_method,
-                status=status,
-                notes=notes,
-                extra_commission_rate=Decimal('0')  # Asistan kesinti belirleyemez
-            )
-            messages.success(request, f'{client_name} için seans başarıyla eklendi.')
+            # Aynı psikoloğun üst üste binen seansı olamaz
+            conflict = conflict_message(expert.pk, date, duration) if status != 'canceled' else None
+            if conflict:
+                messages.error(request, conflict)
+                psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+                return render(request, 'assistant_add_session.html', {'psychologists': psychologists})
+            
+            # Tekrar seçenekleri seans kaydedilmeden önce doğrulanır
+            try:
+                repeat = repeat_options(request)
+            except ValueError as exc:
+                messages.error(request, str(exc))
+                psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+                return render(request, 'assistant_add_session.html', {'psychologists': psychologists})
+            
+            # Seri oluşturulamazsa ilk seans da kaydedilmesin
+            with transaction.atomic():
+                session = Session.objects.create(
+                    client_name=client_name,
+                    expert=expert,
+                    date=date,
+                    duration=duration,
+                    price=price,
+                    session_type=session_type,
+                    payment_method=payment_method,
+                    status=status,
+                    notes=notes,
+                    extra_commission_rate=Decimal('0')  # Asistan kesinti belirleyemez
+                )
+                series = start_series(session, **repeat) if repeat else None
+            if series:
+                messages.success(request, series_message(client_name, series))
+            else:
+                messages.success(request, f'{client_name} için seans başarıyla eklendi.')
             return redirect('assistant_manage_sessions')
         except Exception as e:
             messages.error(request, f'Seans eklenirken hata oluştu: {str(e)}')
     
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     context = {
         'psychologists': psychologists,
     }
     return render(request, 'assistant_add_session.html', context)
 
-@login_required
-@user_passes_test(is_assistant)
+@role_required('assistant')
 def assistant_edit_session(request, session_id):
     """Asistan seans düzenleme - kesinti alanları olmadan"""
     session = get_object_or_404(Session, id=session_id)
     
     if request.method == 'POST':
         # Seans düzenleme formu işleme (kesinti alanları hariç)
+        previous_date = session.date
         session.client_name = request.POST.get('client_name')
         session.expert_id = request.POST.get('expert')
         session.date = request.POST.get('date')
@@ -419,12 +510,18 @@ def assistant_edit_session(request, session_id):
         session.status = request.POST.get('status')
         session.notes = request.POST.get('notes')
         # extra_commission_rate değiştirilmez
-        session.save()
+        if session.status != 'canceled':
+            conflict = conflict_message(session.expert_id, session.date, session.duration, exclude_pk=session.pk)
+            if conflict:
+                messages.error(request, conflict)
+                return redirect('assistant_edit_session', session_id=session_id)
+        if not save_with_following(request, session, previous_date):
+            return redirect('assistant_edit_session', session_id=session_id)
         
         messages.success(request, f'{session.client_name} için seans başarıyla güncellendi.')
         return redirect('assistant_manage_sessions')
     
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     # Decimal değerini string'e çevir
     session_price_str = str(session.price) if session.price else "0"
     context = {
@@ -434,8 +531,7 @@ def assistant_edit_session(request, session_id):
     }
     return render(request, 'assistant_edit_session.html', context)
 
-@login_required
-@user_passes_test(is_assistant)
+@role_required('assistant')
 def assistant_delete_session(request, session_id):
     """Asistan seans silme"""
     session = get_object_or_404(Session, id=session_id)
@@ -451,12 +547,11 @@ def assistant_delete_session(request, session_id):
     }
     return render(request, 'assistant_delete_session.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def manage_psychologists(request):
     """Psikolog yönetimi"""
     # Admin'i psikolog listesinden çıkar
-    psychologists = Psychologist.objects.all().order_by('-created_at')
+    psychologists = Psychologist.objects.select_related('user').order_by('-created_at')
     
     # İstatistikler için ayrı queryset'ler
     total_psychologists = psychologists.count()
@@ -498,8 +593,7 @@ def manage_psychologists(request):
     }
     return render(request, 'manage_psychologists.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def manage_extra_commission(request):
     """Ek kesinti oranları yönetimi"""
     session_type_commissions = SessionTypeCommission.objects.all().order_by('session_type')
@@ -550,23 +644,14 @@ def manage_extra_commission(request):
     }
     return render(request, 'manage_extra_commission.html', context)
 
-@login_required
-@user_passes_test(is_psychologist)
+@role_required('psychologist')
 def my_sessions(request):
     """Psikolog kendi seanslarını görüntüleme"""
     psychologist = request.user.psychologist
-    sessions = Session.objects.filter(expert=psychologist).order_by('-date')
+    sessions = Session.objects.filter(expert=psychologist).select_related('expert').order_by('-date')
     
     # Filtreleme
-    status_filter = request.GET.get('status')
-    month_filter = request.GET.get('month')
-    year_filter = request.GET.get('year')
-    if status_filter:
-        sessions = sessions.filter(status=status_filter)
-    if month_filter:
-        sessions = sessions.filter(date__month=int(month_filter))
-    if year_filter:
-        sessions = sessions.filter(date__year=int(year_filter))
+    sessions = apply_session_filters(sessions, request.GET, by_psychologist=False)
     
     # Ay seçenekleri
     months = [
@@ -577,15 +662,27 @@ def my_sessions(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
+    # Durum bazında sayılar (filtrelenmiş seanslar üzerinden tek sorgu)
+    status_counts = sessions.aggregate(
+        total=Count('id'),
+        done=Count('id', filter=Q(status='done')),
+        planned=Count('id', filter=Q(status='planned')),
+        canceled=Count('id', filter=Q(status='canceled')),
+    )
+    
+    # Sayfalama (date, id) anahtarlı
+    page = keyset_paginate(sessions, request.GET)
+    
     context = {
-        'sessions': sessions,
+        'sessions': page.items,
+        'page': page,
+        'status_counts': status_counts,
         'months': months,
         'years': years,
     }
     return render(request, 'my_sessions.html', context)
 
-@login_required
-@user_passes_test(is_psychologist)
+@role_required('psychologist')
 def change_password(request):
     """Psikolog şifre değiştirme"""
     if request.method == 'POST':
@@ -605,30 +702,15 @@ def change_password(request):
     }
     return render(request, 'change_password.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def manage_sessions(request):
     """Admin seans yönetimi"""
-    sessions = Session.objects.all().order_by('-date')
+    sessions = Session.objects.select_related('expert__user').order_by('-date')
     
     # Filtreleme
-    status_filter = request.GET.get('status')
-    psychologist_filter = request.GET.get('psychologist')
-    month_filter = request.GET.get('month')
-    year_filter = request.GET.get('year')
-    
-    if status_filter:
-        sessions = sessions.filter(status=status_filter)
-    
-    if psychologist_filter:
-        sessions = sessions.filter(expert_id=psychologist_filter)
-    
-    if month_filter:
-        sessions = sessions.filter(date__month=int(month_filter))
-    if year_filter:
-        sessions = sessions.filter(date__year=int(year_filter))
+    sessions = apply_session_filters(sessions, request.GET)
     
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     
     # Ay seçenekleri
     months = [
@@ -639,16 +721,64 @@ def manage_sessions(request):
     current_year = timezone.now().year
     years = range(current_year - 2, current_year + 1)
     
+    # Sayfalama (date, id) anahtarlı
+    page = keyset_paginate(sessions, request.GET)
+    
     context = {
-        'sessions': sessions,
+        'sessions': page.items,
+        'page': page,
         'psychologists': psychologists,
         'months': months,
         'years': years,
     }
     return render(request, 'manage_sessions.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
+@require_POST
+def bulk_session_status(request):
+    """Admin toplu seans durumu güncelleme"""
+    return update_selected_status(request, 'manage_sessions')
+
+@role_required('admin')
+def export_sessions(request):
+    """Filtrelenmiş seansları kesinti kolonlarıyla CSV olarak akış halinde indir"""
+    sessions = apply_session_filters(Session.objects.all(), request.GET)
+    
+    response = StreamingHttpResponse(
+        csv_stream(session_export_rows(sessions)),
+        content_type='text/csv; charset=utf-8',
+    )
+    filename = f"seanslar_{timezone.localtime():%Y%m%d_%H%M}.csv"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+@role_required('admin')
+def upload_sessions(request):
+    """Admin CSV dosyasından toplu seans aktarımı"""
+    result = None
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if not upload:
+            messages.error(request, 'Lütfen bir CSV dosyası seçin.')
+        else:
+            stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+            try:
+                result = import_sessions(stream, dry_run=request.POST.get('dry_run') == 'on')
+            except UnicodeDecodeError:
+                messages.error(request, 'Dosya UTF-8 formatında olmalı.')
+            else:
+                if result.error_count:
+                    messages.warning(request, f'{result.created} seans işlendi, {result.error_count} satır hatalı.')
+                else:
+                    messages.success(request, f'{result.created} seans başarıyla işlendi.')
+    
+    context = {
+        'result': result,
+        'columns': IMPORT_COLUMNS,
+    }
+    return render(request, 'upload_sessions.html', context)
+
+@role_required('admin')
 def add_session(request):
     """Admin seans ekleme"""
     if request.method == 'POST':
@@ -674,7 +804,7 @@ def add_session(request):
                     duration = int(duration)
                 except ValueError:
                     messages.error(request, 'Geçersiz süre formatı!')
-                    psychologists = Psychologist.objects.filter(is_active=True)
+                    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                     return render(request, 'add_session.html', {'psychologists': psychologists})
             
             # Ücret kontrolü
@@ -683,13 +813,28 @@ def add_session(request):
                     price = Decimal(str(price))
                     if price < 0:
                         messages.error(request, 'Ücret negatif olamaz!')
-                        psychologists = Psychologist.objects.filter(is_active=True)
+                        psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                         return render(request, 'add_session.html', {'psychologists': psychologists})
                 except (ValueError, InvalidOperation):
                     messages.error(request, 'Geçersiz ücret formatı!')
-                    psychologists = Psychologist.objects.filter(is_active=True)
+                    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
                     return render(request, 'add_session.html', {'psychologists': psychologists})
             
+            # Aynı psikoloğun üst üste binen seansı olamaz
+            conflict = conflict_message(expert.pk, date, duration) if status != 'canceled' else None
+            if conflict:
+                messages.error(request, conflict)
+                psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+                return render(request, 'add_session.html', {'psychologists': psychologists})
+            
+            # Tekrar seçenekleri seans kaydedilmeden önce doğrulanır
+            try:
+                repeat = repeat_options(request)
+            except ValueError as exc:
+                messages.error(request, str(exc))
+                psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
+                return render(request, 'add_session.html', {'psychologists': psychologists})
+            
             # Ek kesinti oranı kontrolü
             if extra_commission_rate == '' or extra_commission_rate is None:
                 extra_commission_rate = '0'
@@ -698,37 +843,43 @@ def add_session(request):
             except (ValueError, InvalidOperation):
                 extra_commission_rate = Decimal('0')
             
-            session = Session.objects.create(
-                client_name=client_name,
-                expert=expert,
-                date=date,
-                duration=duration,
-                price=price,
-                extra_commission_rate=extra_commission_rate,
-                session_type=session_type,
-                payment_method=payment_method,
-                status=status,
-                notes=notes
-            )
-            messages.success(request, f'{client_name} için seans başarıyla eklendi.')
+            # Seri oluşturulamazsa ilk seans da kaydedilmesin
+            with transaction.atomic():
+                session = Session.objects.create(
+                    client_name=client_name,
+                    expert=expert,
+                    date=date,
+                    duration=duration,
+                    price=price,
+                    extra_commission_rate=extra_commission_rate,
+                    session_type=session_type,
+                    payment_method=payment_method,
+                    status=status,
+                    notes=notes
+                )
+                series = start_series(session, **repeat) if repeat else None
+            if series:
+                messages.success(request, series_message(client_name, series))
+            else:
+                messages.success(request, f'{client_name} için seans başarıyla eklendi.')
             return redirect('manage_sessions')
         except Exception as e:
             messages.error(request, f'Seans eklenirken hata oluştu: {str(e)}')
     
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     context = {
         'psychologists': psychologists,
     }
     return render(request, 'add_session.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def edit_session(request, session_id):
     """Admin seans düzenleme"""
     session = get_object_or_404(Session, id=session_id)
     
     if request.method == 'POST':
         # Seans düzenleme formu işleme
+        previous_date = session.date
         session.client_name = request.POST.get('client_name')
         session.expert_id = request.POST.get('expert')
         session.date = request.POST.get('date')
@@ -766,12 +917,18 @@ def edit_session(request, session_id):
         session.payment_method = request.POST.get('payment_method')
         session.status = request.POST.get('status')
         session.notes = request.POST.get('notes')
-        session.save()
+        if session.status != 'canceled':
+            conflict = conflict_message(session.expert_id, session.date, session.duration, exclude_pk=session.pk)
+            if conflict:
+                messages.error(request, conflict)
+                return redirect('edit_session', session_id=session_id)
+        if not save_with_following(request, session, previous_date):
+            return redirect('edit_session', session_id=session_id)
         
         messages.success(request, f'{session.client_name} için seans başarıyla güncellendi.')
         return redirect('manage_sessions')
     
-    psychologists = Psychologist.objects.filter(is_active=True)
+    psychologists = Psychologist.objects.filter(is_active=True).select_related('user')
     # Decimal değerini string'e çevir
     session_price_str = str(session.price) if session.price else "0"
     context = {
@@ -781,8 +938,7 @@ def edit_session(request, session_id):
     }
     return render(request, 'edit_session.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def delete_session(request, session_id):
     """Admin seans silme"""
     session = get_object_or_404(Session, id=session_id)
@@ -798,8 +954,7 @@ def delete_session(request, session_id):
     }
     return render(request, 'delete_session.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def add_psychologist(request):
     """Admin psikolog ekleme"""
     if request.method == 'POST':
@@ -856,8 +1011,7 @@ def add_psychologist(request):
     
     return redirect('manage_psychologists')
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def edit_psychologist(request, psychologist_id):
     """Admin psikolog düzenleme"""
     psychologist = get_object_or_404(Psychologist, id=psychologist_id)
@@ -902,8 +1056,7 @@ def edit_psychologist(request, psychologist_id):
     }
     return render(request, 'edit_psychologist.html', context)
 
-@login_required
-@user_passes_test(is_admin)
+@role_required('admin')
 def add_assistant(request):
     """Admin asistan ekleme"""
     if request.method == 'POST':
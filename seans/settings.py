@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,10 +43,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'sari_seans.metrics.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'sari_seans.roles.RoleMiddleware',
+    'sari_seans.caching.DataVersionMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -54,7 +58,8 @@ ROOT_URLCONF = 'seans.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # Şablon işleme süresi istek ölçümlerine eklenir (sari_seans/metrics.py)
+        'BACKEND': 'sari_seans.metrics.TimedDjangoTemplates',
         'DIRS': [],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -81,6 +86,30 @@ DATABASES = {
     }
 }
 
+# SQLite üretim profili (SEANS_DB_PROFILE=production ile açılır): WAL günlüğü,
+# synchronous=NORMAL, bekleme süresi, mmap ve önbellek ayarları her yeni
+# bağlantıda uygulanır (sari_seans/signals.py), bağlantılar istekler arasında
+# yeniden kullanılır. Yazma transaction'ları IMMEDIATE başlar; böylece okuma
+# kilidinden yazmaya geçerken "database is locked" hatası yerine busy_timeout
+# kadar beklenir.
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,               # milisaniye
+    'mmap_size': 256 * 1024 * 1024,     # bayt
+    'cache_size': -64 * 1024,           # negatif değer KiB cinsinden (64 MB)
+    'temp_store': 'MEMORY',
+}
+SQLITE_PRAGMAS = {}
+
+if os.environ.get('SEANS_DB_PROFILE') == 'production':
+    SQLITE_PRAGMAS = SQLITE_PRODUCTION_PRAGMAS
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': int(os.environ.get('SEANS_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -119,6 +148,20 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Üretim modu (python main.py --production): DEBUG kapalı; static dosyalar
+# WhiteNoise ile sıkıştırılmış (gzip/brotli) ve içerik özetli adlarla sunulur.
+# Özetli dosyalar değişmediği için uzun süreli (immutable) önbellek başlığı alır.
+SEANS_PRODUCTION = os.environ.get('SEANS_PRODUCTION', '').lower() in ('1', 'true', 'yes')
+
+if SEANS_PRODUCTION:
+    DEBUG = False
+    MIDDLEWARE.insert(MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+                      'whitenoise.middleware.WhiteNoiseMiddleware')
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -126,3 +169,54 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = '/login/'
 LOGIN_REDIRECT_URL = '/'
+
+# Seans listelerinde sayfa başına satır sayısı (?per_page ile en fazla SESSION_MAX_PAGE_SIZE)
+SESSION_PAGE_SIZE = 50
+SESSION_MAX_PAGE_SIZE = 200
+
+# Tekrarlayan seans serilerinin kaç gün ilerisine kadar seans üretileceği
+SESSION_SERIES_WINDOW_DAYS = 56
+
+# Dashboard istatistik önbelleği (sari_seans/caching.py). Varsayılan süreç içi
+# bellektir; birden fazla süreçle çalışırken veri sürümünün tüm süreçlerce
+# görülmesi için SEANS_CACHE_DIR ile dosya tabanlı önbellek seçilmelidir.
+if os.environ.get('SEANS_CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['SEANS_CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'seans',
+        }
+    }
+
+# Dashboard ve liste ekranlarının async sürümleri (sari_seans/async_views.py);
+# ASGI sunucusuyla (python main.py --asgi) çalışırken açılması önerilir.
+SEANS_ASYNC_VIEWS = os.environ.get('SEANS_ASYNC_VIEWS', '').lower() in ('1', 'true', 'yes')
+
+# Dashboard önbelleğinin saniye cinsinden ömrü (veri değişince zaten geçersiz olur)
+DASHBOARD_CACHE_TIMEOUT = 15 * 60
+
+# İstek ölçümleri (sari_seans/metrics.py). /metrics/ admin oturumuyla ya da
+# "Authorization: Bearer <SEANS_METRICS_TOKEN>" başlığıyla okunur. Süresi
+# SEANS_SLOW_REQUEST_MS milisaniyeyi aşan istekler JSON satırı olarak yazılır.
+METRICS_TOKEN = os.environ.get('SEANS_METRICS_TOKEN', '')
+METRICS_SLOW_REQUEST_MS = int(os.environ['SEANS_SLOW_REQUEST_MS']) if os.environ.get('SEANS_SLOW_REQUEST_MS') else None
+METRICS_SLOW_REQUEST_LOG = os.environ.get('SEANS_SLOW_REQUEST_LOG', BASE_DIR / 'slow_requests.log')
+
+# Yavaş sorgu kaydı (sari_seans/slow_queries.py). SEANS_SLOW_QUERY_MS verilirse
+# bu süreyi aşan sorgular sorgu planıyla birlikte döner dosyaya yazılır;
+# özet için: python manage.py slow_queries
+SLOW_QUERY_MS = int(os.environ['SEANS_SLOW_QUERY_MS']) if os.environ.get('SEANS_SLOW_QUERY_MS') else None
+SLOW_QUERY_LOG = os.environ.get('SEANS_SLOW_QUERY_LOG', BASE_DIR / 'slow_queries.log')
+SLOW_QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 5
+
+if SLOW_QUERY_MS is not None:
+    MIDDLEWARE.insert(MIDDLEWARE.index('sari_seans.metrics.MetricsMiddleware') + 1,
+                      'sari_seans.slow_queries.SlowQueryMiddleware')